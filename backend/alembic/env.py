@@ -11,8 +11,8 @@ from alembic import context
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Import our database configuration and models
-from app.database import DATABASE_URL, Base
-from app.models.db_models import ProductDB, BidDB
+from app.database import DATABASE_URL, Base, engine
+from app.models.db_models import ProductDB, BidDB, IdempotencyKeyDB
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -32,6 +32,21 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Postgres-only objects the migrations create but the models don't declare
+# (expression indexes, the generated search_vector column and its indexes);
+# without this, autogenerate would emit drops for them
+MIGRATION_ONLY_OBJECTS = {
+    ("index", "ix_products_tags_gin"),
+    ("column", "search_vector"),
+    ("index", "ix_products_search_vector"),
+    ("index", "ix_products_title_trgm"),
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave migration-only objects out of autogenerate comparisons"""
+    return not (reflected and compare_to is None and (type_, name) in MIGRATION_ONLY_OBJECTS)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -51,6 +66,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -64,13 +81,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    # Create engine using our DATABASE_URL
-    from sqlalchemy import create_engine
-    connectable = create_engine(DATABASE_URL)
+    # Use the app's engine (DATABASE_URL, plus the WAL pragmas on SQLite)
+    connectable = engine
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can't ALTER most constraints; batch ops rebuild the table instead
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
         )
 
         with context.begin_transaction():
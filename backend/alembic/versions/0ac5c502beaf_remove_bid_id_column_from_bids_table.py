@@ -22,13 +22,16 @@ def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
     op.drop_index(op.f('ix_bids_bid_id'), table_name='bids')
-    op.drop_column('bids', 'bid_id')
+    # Batch mode rebuilds the table on SQLite, which can't drop a column under a UNIQUE constraint
+    with op.batch_alter_table('bids') as batch_op:
+        batch_op.drop_column('bid_id')
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('bids', sa.Column('bid_id', sa.VARCHAR(length=100), autoincrement=False, nullable=False))
+    with op.batch_alter_table('bids') as batch_op:
+        batch_op.add_column(sa.Column('bid_id', sa.VARCHAR(length=100), autoincrement=False, nullable=False))
     op.create_index(op.f('ix_bids_bid_id'), 'bids', ['bid_id'], unique=True)
     # ### end Alembic commands ###
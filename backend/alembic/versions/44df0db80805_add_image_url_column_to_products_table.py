@@ -21,7 +21,9 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(op.f('bids_bid_id_key'), 'bids', type_='unique')
+    if op.get_bind().dialect.name == 'postgresql':
+        # SQLite keeps the unnamed constraint until bid_id is dropped in 0ac5c502beaf
+        op.drop_constraint(op.f('bids_bid_id_key'), 'bids', type_='unique')
     op.drop_index(op.f('ix_bids_bid_id'), table_name='bids')
     op.create_index(op.f('ix_bids_bid_id'), 'bids', ['bid_id'], unique=True)
     op.add_column('products', sa.Column('image_url', sa.String(length=500), nullable=True))
@@ -34,5 +36,6 @@ def downgrade() -> None:
     op.drop_column('products', 'image_url')
     op.drop_index(op.f('ix_bids_bid_id'), table_name='bids')
     op.create_index(op.f('ix_bids_bid_id'), 'bids', ['bid_id'], unique=False)
-    op.create_unique_constraint(op.f('bids_bid_id_key'), 'bids', ['bid_id'], postgresql_nulls_not_distinct=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_unique_constraint(op.f('bids_bid_id_key'), 'bids', ['bid_id'], postgresql_nulls_not_distinct=False)
     # ### end Alembic commands ###
@@ -0,0 +1,50 @@
+"""Add bid statistics columns to products table
+
+Revision ID: 5d1e7c3a9b42
+Revises: 0ac5c502beaf
+Create Date: 2026-10-19 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e7c3a9b42'
+down_revision: Union[str, Sequence[str], None] = '0ac5c502beaf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('bid_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('products', sa.Column('highest_bid_id', sa.Integer(), nullable=True))
+    op.add_column('products', sa.Column('last_bid_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill from the existing bids
+    op.execute("""
+        UPDATE products SET
+            bid_count = (
+                SELECT COUNT(*) FROM bids WHERE bids.product_id = products.id
+            ),
+            last_bid_at = (
+                SELECT MAX(bids.timestamp) FROM bids WHERE bids.product_id = products.id
+            ),
+            highest_bid_id = (
+                SELECT bids.id FROM bids
+                WHERE bids.product_id = products.id
+                  AND bids.status IN ('active', 'winning')
+                ORDER BY bids.amount DESC, bids.id ASC
+                LIMIT 1
+            )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'last_bid_at')
+    op.drop_column('products', 'highest_bid_id')
+    op.drop_column('products', 'bid_count')
@@ -0,0 +1,55 @@
+"""Scope idempotency keys per user
+
+Revision ID: c5d2e8f1a7b3
+Revises: f9a2d6b41c83
+Create Date: 2026-10-19 16:21:07.402519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e8f1a7b3'
+down_revision: Union[str, Sequence[str], None] = 'f9a2d6b41c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_table(per_user: bool) -> None:
+    columns = [
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response_body', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+    if per_user:
+        columns.insert(1, sa.Column('user_id', sa.String(length=100), nullable=False))
+        columns.append(sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_id_key'))
+    else:
+        columns.append(sa.UniqueConstraint('key'))
+    op.create_table('idempotency_keys', *columns)
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows can't be attributed to a user, and they only live for the
+    # replay window, so the table is recreated rather than altered (which also
+    # avoids rebuilding the unnamed unique constraint on SQLite)
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    _create_table(per_user=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    _create_table(per_user=False)
@@ -0,0 +1,49 @@
+"""Add product listing filter and keyset pagination indexes
+
+Revision ID: e3c81f6d2a47
+Revises: b7f4a2c91e05
+Create Date: 2026-10-19 11:27:08.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c81f6d2a47'
+down_revision: Union[str, Sequence[str], None] = 'b7f4a2c91e05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_products_condition', 'products', ['condition'], unique=False)
+    op.create_index('ix_products_category_id', 'products', ['category', 'id'], unique=False)
+    op.create_index('ix_products_brand_id', 'products', ['brand', 'id'], unique=False)
+    op.create_index('ix_products_suggested_price_sort', 'products', [sa.text('coalesce(suggested_price, 0.0)'), 'id'], unique=False)
+    op.create_index('ix_products_current_bid_sort', 'products', [sa.text('coalesce(current_bid, 0.0)'), 'id'], unique=False)
+    op.create_index('ix_products_bid_count_id', 'products', ['bid_count', 'id'], unique=False)
+    op.create_index('ix_products_title_id', 'products', ['title', 'id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Tag containment (tags::jsonb @> '[...]')
+        op.create_index(
+            'ix_products_tags_gin', 'products', [sa.text('(tags::jsonb)')],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_products_tags_gin', table_name='products')
+    op.drop_index('ix_products_title_id', table_name='products')
+    op.drop_index('ix_products_bid_count_id', table_name='products')
+    op.drop_index('ix_products_current_bid_sort', table_name='products')
+    op.drop_index('ix_products_suggested_price_sort', table_name='products')
+    op.drop_index('ix_products_brand_id', table_name='products')
+    op.drop_index('ix_products_category_id', table_name='products')
+    op.drop_index('ix_products_condition', table_name='products')
@@ -15,6 +15,8 @@ import google.generativeai as genai
 from google.adk.agents import Agent
 from google.adk.sessions import Session
 from ...models.agent_models import Product
+from ...observability.gemini import generate_content
+from ...observability.tracing import set_span_attributes, start_span, traced
 from ...services.product_service import ProductService
  
 from dotenv import load_dotenv, find_dotenv
@@ -58,6 +60,7 @@ def encode_image_for_gemini(image_path: str) -> str:
         logger.error(f"Error encoding image: {e}")
         raise
 
+@traced("listing.analyze_image")
 def analyze_product_image(image_path: str) -> dict:
     """
     Analyzes a product image using Gemini Vision API to extract product details.
@@ -79,7 +82,7 @@ def analyze_product_image(image_path: str) -> dict:
         
         # Validate image file
         try:
-            with Image.open(image_path) as img:
+            with start_span("listing.verify_image"), Image.open(image_path) as img:
                 img.verify()
         except Exception as img_error:
             return {"status": "error", "error_message": f"Invalid image file: {str(img_error)}"}
@@ -91,6 +94,7 @@ def analyze_product_image(image_path: str) -> dict:
         # Load and prepare the image
         with open(image_path, 'rb') as image_file:
             image_data = image_file.read()
+        set_span_attributes({"image.bytes": len(image_data)})
             
         # Create the image object for Gemini
         image = {
@@ -127,7 +131,7 @@ def analyze_product_image(image_path: str) -> dict:
         """
         
         # Make the API call
-        response = model.generate_content([prompt, image])
+        response = generate_content(model, [prompt, image], tool="analyze_product_image")
         
         # Parse the response
         response_text = response.text.strip()
@@ -147,6 +151,7 @@ def analyze_product_image(image_path: str) -> dict:
         try:
             analysis = json.loads(json_text)
         except json.JSONDecodeError:
+            set_span_attributes({"fallback": True})
             # Fallback: try to extract key information from text response
             analysis = {
                 "product_type": "unknown",
@@ -180,6 +185,7 @@ def analyze_product_image(image_path: str) -> dict:
         logger.error(f"Error analyzing image {image_path}: {e}")
         return {"status": "error", "error_message": f"Analysis failed: {str(e)}"}
 
+@traced("listing.generate_title")
 def generate_listing_title(product_analysis: dict) -> dict:
     """
     Generates an SEO-friendly, compelling title using Gemini API.
@@ -209,7 +215,7 @@ def generate_listing_title(product_analysis: dict) -> dict:
         Return only the title, no additional text.
         """
         
-        response = model.generate_content(prompt)
+        response = generate_content(model, prompt, tool="generate_listing_title")
         title = response.text.strip()
         
         # Ensure title is within length limit
@@ -223,6 +229,7 @@ def generate_listing_title(product_analysis: dict) -> dict:
             title = f"{brand} {product_type}".strip() if brand else product_type
         
         logger.info(f"Generated title: {title}")
+        set_span_attributes({"output.chars": len(title)})
         return {"status": "success", "title": title}
         
     except Exception as e:
@@ -231,8 +238,10 @@ def generate_listing_title(product_analysis: dict) -> dict:
         product_type = product_analysis.get("product_type", "Item")
         brand = product_analysis.get("brand", "")
         fallback_title = f"{brand} {product_type}".strip() if brand else f"Quality {product_type}"
+        set_span_attributes({"fallback": True})
         return {"status": "success", "title": fallback_title}
 
+@traced("listing.generate_description")
 def generate_listing_description(product_analysis: dict) -> dict:
     """
     Generates a detailed, professional product description using Gemini API.
@@ -263,10 +272,11 @@ def generate_listing_description(product_analysis: dict) -> dict:
         Format as a short paragraph with essential details only.
         """
         
-        response = model.generate_content(prompt)
+        response = generate_content(model, prompt, tool="generate_listing_description")
         description = response.text.strip()
         
         logger.info("Generated description successfully")
+        set_span_attributes({"output.chars": len(description)})
         return {"status": "success", "description": description}
         
     except Exception as e:
@@ -275,8 +285,10 @@ def generate_listing_description(product_analysis: dict) -> dict:
         product_type = product_analysis.get("product_type", "item")
         condition = product_analysis.get("condition_assessment", "good")
         fallback_desc = f"Quality {product_type} in {condition} condition. See photos for details. Perfect for collectors and enthusiasts!"
+        set_span_attributes({"fallback": True})
         return {"status": "success", "description": fallback_desc}
 
+@traced("listing.assess_condition")
 def assess_product_condition(product_analysis: dict) -> dict:
     """
     Assesses the product condition based on Gemini's visual analysis.
@@ -338,6 +350,7 @@ def assess_product_condition(product_analysis: dict) -> dict:
             "confidence": 0.5
         }
 
+@traced("listing.suggest_pricing")
 def suggest_pricing(product_analysis: dict, condition: str) -> dict:
     """
     Suggests pricing using Gemini API for market analysis.
@@ -387,7 +400,7 @@ def suggest_pricing(product_analysis: dict, condition: str) -> dict:
         Return only the JSON object.
         """
         
-        response = model.generate_content(prompt)
+        response = generate_content(model, prompt, tool="suggest_pricing")
         response_text = response.text.strip()
         
         # Extract JSON from response
@@ -405,6 +418,7 @@ def suggest_pricing(product_analysis: dict, condition: str) -> dict:
         try:
             pricing = json.loads(json_text)
         except json.JSONDecodeError:
+            set_span_attributes({"fallback": True})
             # Fallback pricing logic
             category = product_analysis.get("category_suggestions", ["General"])[0]
             category_base_prices = {
@@ -447,6 +461,7 @@ def suggest_pricing(product_analysis: dict, condition: str) -> dict:
             "pricing": {}
         }
 
+@traced("listing.create_complete_listing")
 def create_complete_listing(image_path: str, user_preferences: Optional[dict] = None) -> dict:
     """
     Creates a complete product listing from an image using Gemini API.
@@ -456,6 +471,7 @@ def create_complete_listing(image_path: str, user_preferences: Optional[dict] =
             user_preferences = {}
         
         logger.info(f"Creating complete listing for image: {image_path}")
+        set_span_attributes({"image.path": image_path})
         
         # Step 1: Analyze the product image with Gemini
         analysis_result = analyze_product_image(image_path)
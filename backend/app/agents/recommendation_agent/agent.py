@@ -14,6 +14,8 @@ from ...services.product_service import ProductService
 from ...services.bid_service import BidService
 
 from ...models.agent_models import Product, Bid
+from ...observability.gemini import generate_content
+from ...observability.tracing import set_span_attributes, start_span, traced
 from ...enums.enums import AuctionStatus, BidStatus, ProductCondition
 from ...models.converters.converters import product_db_to_pydantic, bid_db_to_pydantic
  
@@ -81,6 +83,7 @@ class RecommendationAgentOrchestrator:
             logger.error(f"Error initializing session: {e}")
             return None
     
+    @traced("recommendation.process_request")
     async def process_recommendation_request(self, query_string: str, ):
         """
         Process a recommendation request based on a natural language query string.
@@ -89,8 +92,11 @@ class RecommendationAgentOrchestrator:
             if not self.session:
                 self.initialize_session()
             
-            products_db = self.product_service.get_all_products()
-            products_list = [product_db_to_pydantic(product) for product in products_db]
+            set_span_attributes({"query.chars": len(query_string)})
+            with start_span("recommendation.load_products") as span:
+                products_db = self.product_service.get_all_products()
+                products_list = [product_db_to_pydantic(product) for product in products_db]
+                span.set_attribute("products.count", len(products_db))
 
             # Convert products to dict format for Gemini
             products_for_gemini = []
@@ -121,18 +127,20 @@ class RecommendationAgentOrchestrator:
             
             Return only a JSON array of the matching products (use the exact product objects from the list above).
             """
-            response = model.generate_content(prompt)
+            response = generate_content(model, prompt, tool="recommend_products")
             response_text = response.text.strip()
             
             # Extract JSON from the response
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
-            
-            recommended_products = json.loads(json_text)
+            with start_span("recommendation.parse_response") as span:
+                if "```json" in response_text:
+                    json_start = response_text.find("```json") + 7
+                    json_end = response_text.find("```", json_start)
+                    json_text = response_text[json_start:json_end].strip()
+                else:
+                    json_text = response_text
+                
+                recommended_products = json.loads(json_text)
+                span.set_attribute("results.count", len(recommended_products))
             
             return {
                 "status": "success",
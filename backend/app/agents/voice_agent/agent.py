@@ -12,6 +12,9 @@ from google.adk.agents import Agent
 from google.adk.sessions import Session
 import google.generativeai as genai
 
+from ...observability.gemini import generate_content
+from ...observability.tracing import set_span_attributes, traced
+
 load_dotenv()
 
 # Configure logging
@@ -46,6 +49,7 @@ class VoiceAgentConfig:
         self.energy_threshold = 300
         self.pause_threshold = 0.8
 
+@traced("voice.speech_to_text")
 def convert_speech_to_text(audio_file_path: str = None, use_microphone: bool = True) -> dict:
     """
     Convert speech to text using Google Speech Recognition API
@@ -86,6 +90,7 @@ def convert_speech_to_text(audio_file_path: str = None, use_microphone: bool = T
             
             with sr.AudioFile(audio_file_path) as source:
                 audio = recognizer.record(source)
+        set_span_attributes({"audio.bytes": len(audio.frame_data)})
         
         # Convert speech to text using Google Speech Recognition
         try:
@@ -118,6 +123,7 @@ def convert_speech_to_text(audio_file_path: str = None, use_microphone: bool = T
             "error_message": f"Speech recognition failed: {str(e)}"
         }
 
+@traced("voice.analyze_intent")
 def analyze_user_intent(text: str) -> dict:
     """
     Analyze user intent to determine which agent to call
@@ -169,7 +175,7 @@ def analyze_user_intent(text: str) -> dict:
         }}
         """
         
-        response = model.generate_content(prompt)
+        response = generate_content(model, prompt, tool="analyze_user_intent")
         response_text = response.text.strip()
         
         # Extract JSON from response
@@ -227,6 +233,7 @@ def analyze_user_intent(text: str) -> dict:
             "error_message": f"Intent analysis failed: {str(e)}"
         }
 
+@traced("voice.route_to_agent")
 def route_to_agent(intent_data: dict) -> dict:
     """
     Route the request to the appropriate agent based on intent analysis
@@ -277,6 +284,7 @@ def route_to_agent(intent_data: dict) -> dict:
             "error_message": f"Agent routing failed: {str(e)}"
         }
 
+@traced("voice.execute_agent_call")
 def execute_agent_call(routing_info: dict) -> dict:
     """
     Execute the call to the target agent
@@ -337,6 +345,7 @@ def execute_agent_call(routing_info: dict) -> dict:
             "error_message": f"Agent execution failed: {str(e)}"
         }
 
+@traced("voice.process_voice_input")
 def process_voice_input(audio_file_path: str = None, use_microphone: bool = True) -> dict:
     """
     Complete voice processing pipeline: Speech-to-Text -> Intent Analysis -> Agent Routing
@@ -358,6 +367,7 @@ def process_voice_input(audio_file_path: str = None, use_microphone: bool = True
         
         text = speech_result["text"]
         logger.info(f"Speech converted to text: {text}")
+        set_span_attributes({"transcript.chars": len(text), "input.source": "file" if audio_file_path else "microphone"})
         
         # Step 2: Analyze user intent
         intent_result = analyze_user_intent(text)
@@ -0,0 +1,22 @@
+"""
+Admin-only access for operational endpoints (profiling).
+
+Admin endpoints are disabled (404) unless ADMIN_TOKEN is set; callers then send
+``Authorization: Bearer <ADMIN_TOKEN>``.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Dependency rejecting requests without the admin bearer token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip(), ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Admin token required", headers={"WWW-Authenticate": "Bearer"})
@@ -1,28 +1,68 @@
 import fastapi
-from fastapi import FastAPI, HTTPException, Depends, Query, File, UploadFile, Form
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Depends, Query, File, UploadFile, Form, Header, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from typing import Optional
+from typing import List, Optional, Tuple
 import os
 import uuid
+import asyncio
 import shutil
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..agents.listing_agent.agent import ListingAgentOrchestrator
 from ..agents.recommendation_agent.agent import RecommendationAgentOrchestrator
 
-from ..services.product_service import ProductService
-from ..services.bid_service import BidService
+from ..services.product_service import AsyncProductService, product_version
+from ..services.bid_service import AsyncBidService
+from ..services.idempotency_service import (
+    AsyncIdempotencyService, IdempotencyService, ReservationLostError, cache_response, get_cached_response
+)
+from ..services.rate_limiter import admit_bid
+from ..services.product_import import ProductImportService, detect_format, open_text
+from ..services.product_export import EXPORT_MEDIA_TYPES, ProductExportService
+from ..services.product_cache import start_product_cache_listener
+from ..services.facets import run_facet_refresher
+from ..observability.http import HTTPMetricsMiddleware
+from ..observability.metrics import render_metrics
+from ..observability.profiler import FORMATS, PROFILER_MAX_SECONDS, ProfilerBusyError, ProfilerMiddleware, run_capture
+from ..observability.sql_profiler import SQLProfilerMiddleware, query_budget
+from ..observability.tracing import start_span, traced
+from .admin import require_admin
+from .conditional import is_not_modified, make_etag, not_modified_response, validator_headers
 
 from ..models.agent_models import Product, Bid
-from ..models.request_models import BidCreateRequest, ProductCreateRequest, RecommendationRequest
+from ..models.request_models import (
+    BidCreateRequest, ProductBatchRequest, ProductCreateRequest, ProductFilters, RecommendationRequest
+)
 from ..models.converters.converters import product_db_to_pydantic, bid_db_to_pydantic
+from ..models.converters.serializers import (
+    bid_db_to_dict, dumps, parse_product_fields, product_db_to_dict, product_row_to_dict
+)
+
+from ..enums.enums import BidStatus, ImportFormat, PriceField, ProductSort, ProfileFormat, ProfilerMode
+from ..database import DatabaseManager, get_async_db, monitor_replica_lag, replica_engines
 
-from ..enums.enums import BidStatus
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Cross-worker product cache invalidation (only when PRODUCT_CACHE_NOTIFY is set on Postgres)
+    listener = await start_product_cache_listener()
+    # Builds the facet index now, then refreshes it to pick up other workers' writes
+    facet_refresher = asyncio.create_task(run_facet_refresher())
+    # Exports replica lag and takes lagging replicas out of read routing
+    lag_monitor = asyncio.create_task(monitor_replica_lag()) if replica_engines else None
+    yield
+    facet_refresher.cancel()
+    if lag_monitor:
+        lag_monitor.cancel()
+    if listener:
+        await listener.stop()
 
-app = FastAPI(title="AgentBay API", description="API for AgentBay auction platform")
+
+app = FastAPI(title="AgentBay API", description="API for AgentBay auction platform", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,14 +70,82 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "Server-Timing", "X-Query-Count", "X-Query-Budget"],
 )
 
-# Dependency injection
-def get_product_service():
-    return ProductService()
+# Marks requests matching the active profile capture's route
+app.add_middleware(ProfilerMiddleware)
+
+# Server-Timing, slow-query log, N+1 and query budget checks
+app.add_middleware(SQLProfilerMiddleware)
+# Outermost, so latency covers every other middleware
+app.add_middleware(HTTPMetricsMiddleware)
+
+# Dependency injection (services in one request share the same async session)
+def get_product_service(session: AsyncSession = Depends(get_async_db)):
+    return AsyncProductService(session)
 
-def get_bid_service():
-    return BidService()
+def get_bid_service(session: AsyncSession = Depends(get_async_db)):
+    return AsyncBidService(session)
+
+def get_idempotency_service(session: AsyncSession = Depends(get_async_db)):
+    return AsyncIdempotencyService(session)
+
+def get_product_import_service(session: AsyncSession = Depends(get_async_db)):
+    return ProductImportService(session)
+
+async def route_reads_by_resource(request: Request):
+    """
+    Key read-replica stickiness by the product and user a request touches (the
+    product_id and user_id path parameters, else the user_id of a JSON body),
+    so once a bid commits, reads of that product and that user's bids come from
+    the primary until the replicas have caught up.
+    """
+    keys = []
+    product_id = request.path_params.get("product_id")
+    if product_id is not None:
+        keys.append(f"product:{product_id}")
+    user_id = request.path_params.get("user_id")
+    if user_id is None and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None  # Reported by the route's own body validation
+        if isinstance(body, dict) and isinstance(body.get("user_id"), str):
+            user_id = body["user_id"]
+    if user_id is not None:
+        keys.append(f"user:{user_id}")
+    with DatabaseManager.route_keys(*keys):
+        yield
+
+def get_product_filters(
+    category: Optional[str] = Query(None, description="Exact category"),
+    brand: Optional[str] = Query(None, description="Exact brand"),
+    condition: Optional[str] = Query(None, description="Exact condition"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price (inclusive)"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price (inclusive)"),
+    price_field: PriceField = Query(PriceField.SUGGESTED_PRICE, description="Price column used by price filters and sorts"),
+    tags: Optional[List[str]] = Query(None, description="Products must have all of these tags")
+) -> ProductFilters:
+    return ProductFilters(
+        category=category,
+        brand=brand,
+        condition=condition,
+        min_price=min_price,
+        max_price=max_price,
+        price_field=price_field,
+        tags=tags or []
+    )
+
+def get_product_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated product fields to return, e.g. id,title,image_url,current_bid"
+    )
+) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_product_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # Helper functions
 async def save_uploaded_file(file: UploadFile) -> str:
@@ -57,6 +165,48 @@ async def save_uploaded_file(file: UploadFile) -> str:
     
     return str(file_path)
 
+# === METRICS ENDPOINT ===
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose Prometheus metrics"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+# === ADMIN ENDPOINTS ===
+@app.post("/api/admin/profile", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, le=PROFILER_MAX_SECONDS, description="Capture duration"),
+    mode: ProfilerMode = Query(ProfilerMode.SAMPLE, description="Stack sampler or deterministic cProfile"),
+    format: Optional[ProfileFormat] = Query(None, description="collapsed (sample), text or pstats (cprofile)"),
+    route: Optional[str] = Query(None, description="Only profile requests to this path or route template"),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Sampling interval"),
+    include_idle: bool = Query(False, description="Keep samples of threads waiting for work"),
+):
+    """
+    Profile this worker process for ``seconds`` while it keeps serving traffic.
+    Each worker profiles itself, so with several workers the capture covers
+    whichever one received this request.
+    """
+    format = format or FORMATS[mode][0]
+    if format not in FORMATS[mode]:
+        raise HTTPException(status_code=400, detail=f"Format '{format.value}' is not available in {mode.value} mode")
+    try:
+        capture = await run_capture(seconds, mode, route, interval_ms / 1000, include_idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    headers = {
+        "X-Profile-Worker": str(os.getpid()),
+        "X-Profile-Matched-Requests": str(capture.matched_requests),
+    }
+    if format == ProfileFormat.PSTATS:
+        headers["Content-Disposition"] = f'attachment; filename="profile-{os.getpid()}.pstats"'
+        return Response(content=capture.pstats_dump(), media_type="application/octet-stream", headers=headers)
+    if format == ProfileFormat.TEXT:
+        return Response(content=capture.pstats_text(), media_type="text/plain", headers=headers)
+    headers["X-Profile-Samples"] = str(capture.sample_count)
+    return Response(content=capture.collapsed(), media_type="text/plain", headers=headers)
+
 # === STATIC FILE ENDPOINTS ===
 @app.get("/uploads/images/{filename}")
 async def get_image(filename: str):
@@ -80,6 +230,7 @@ async def get_image(filename: str):
 
 # === AGENT ENDPOINTS ===
 @app.post("/api/agent/create-listing")
+@traced("agent.create_listing")
 async def create_listing(
     image: UploadFile = File(..., description="Product image file"),
     user_preferences: Optional[str] = Form(None, description="User preferences as JSON string")
@@ -91,7 +242,9 @@ async def create_listing(
             raise HTTPException(status_code=400, detail="File must be an image.")
         
         # Save the uploaded image
-        image_path = await save_uploaded_file(image)
+        with start_span("listing.save_upload") as span:
+            image_path = await save_uploaded_file(image)
+            span.set_attribute("payload.bytes", os.path.getsize(image_path))
         
         # Parse user preferences if provided
         preferences = {}
@@ -146,6 +299,7 @@ async def create_listing(
         raise HTTPException(status_code=500, detail=f"Failed to process listing: {str(e)}")
 
 @app.post("/api/agent/recommendations")
+@traced("agent.recommendations")
 async def get_recommendations(request: RecommendationRequest):
     recommendation_agent = RecommendationAgentOrchestrator()
     result = await recommendation_agent.process_recommendation_request(
@@ -158,29 +312,153 @@ async def get_recommendations(request: RecommendationRequest):
 # === PRODUCT ENDPOINTS ===
 
 @app.get("/api/products")
+@query_budget(1)
 async def get_products(
-    product_service: ProductService = Depends(get_product_service)
+    filters: ProductFilters = Depends(get_product_filters),
+    sort: ProductSort = Query(ProductSort.NEWEST, description="Sort order"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of products to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_product_fields),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
-    """Get all products"""
+    """
+    Get a filtered, sorted page of products; the next page cursor is in the X-Next-Cursor header.
+    With fields=..., only those columns are read and returned.
+    """
     try:
-        products_db = product_service.get_all_products()
-        
-        products = [product_db_to_pydantic(p) for p in products_db]
-        
-        return products
+        rows, next_cursor = await product_service.list_product_rows(filters, sort, limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get products: {str(e)}")
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(
+        content=dumps([product_row_to_dict(row, fields) for row in rows]),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+@app.get("/api/products/export")
+async def export_products(
+    filters: ProductFilters = Depends(get_product_filters),
+    format: ImportFormat = Query(ImportFormat.NDJSON, description="Export format"),
+    after_id: Optional[int] = Query(None, ge=0, description="Resume after the last product id received"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of products to export"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_product_fields)
+):
+    """
+    Stream the catalog (optionally filtered) in id order with constant memory.
+    To resume an interrupted export, pass the last id received as after_id.
+    """
+    stream = ProductExportService().stream(format, filters, fields, after_id, limit)
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format.value}"'}
+    )
+
+async def _batch_products(
+    product_ids: List[int],
+    fields: Optional[Tuple[str, ...]],
+    product_service: AsyncProductService
+) -> Response:
+    """Products in the requested order plus the ids that do not exist"""
+    try:
+        found = await product_service.get_products_by_ids(product_ids)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get products: {str(e)}")
+    
+    product_ids = list(dict.fromkeys(product_ids))
+    return Response(
+        content=dumps({
+            "products": [product_db_to_dict(found[i], fields) for i in product_ids if i in found],
+            "missing": [i for i in product_ids if i not in found]
+        }),
+        media_type="application/json"
+    )
+
+@app.get("/api/products/batch")
+@query_budget(1)
+async def get_products_batch(
+    ids: str = Query(..., description="Comma-separated product ids (up to 100; POST for more)"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_product_fields),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """Get many products by id in one query, in the requested order"""
+    try:
+        product_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not product_ids or len(product_ids) > 100:
+        raise HTTPException(status_code=400, detail="Provide between 1 and 100 ids")
+    return await _batch_products(product_ids, fields, product_service)
 
+@app.post("/api/products/batch")
+@query_budget(1)
+async def post_products_batch(
+    request: ProductBatchRequest,
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """Get up to 1000 products by id in one query, in the requested order"""
+    try:
+        fields = parse_product_fields(request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await _batch_products(request.ids, fields, product_service)
+
+@app.get("/api/products/facets")
+@query_budget(1)
+async def get_product_facets(
+    filters: ProductFilters = Depends(get_product_filters),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """
+    Product counts per category, brand and condition from the in-memory facet index.
+    The category, brand and condition filters narrow the counts; each facet is
+    counted under the other facets' filters. Price and tag filters are ignored.
+    """
+    try:
+        return await product_service.get_facets(filters)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get product facets: {str(e)}")
+
+@app.get("/api/products/search")
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200, description="Search keywords"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_product_fields),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """Ranked keyword search over product title, description, brand and tags"""
+    try:
+        results, match = await product_service.search_products(q, limit)
+        return {
+            "query": q,
+            "match": match,
+            "results": [
+                {
+                    "product": product_db_to_dict(product_db, fields),
+                    "rank": rank,
+                    "highlights": highlights
+                }
+                for product_db, rank, highlights in results
+            ],
+            "total_found": len(results)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search products: {str(e)}")
 
 @app.post("/api/products", response_model=dict)
 async def create_product(
     request: ProductCreateRequest,
-    product_service: ProductService = Depends(get_product_service)
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
     """Create a new product"""
     try:
         product = Product(**request.dict())
-        product_db = product_service.create_product(product)
+        product_db = await product_service.create_product(product)
         return {
             "id": product_db.id,
             "message": "Product created successfully",
@@ -189,58 +467,170 @@ async def create_product(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create product: {str(e)}")
 
-@app.get("/api/products/{product_id}")
+@app.post("/api/products/import")
+async def import_products(
+    file: UploadFile = File(..., description="NDJSON or CSV file of products"),
+    format: Optional[ImportFormat] = Query(None, description="File format (default: from the file extension)"),
+    import_service: ProductImportService = Depends(get_product_import_service)
+):
+    """
+    Bulk import products, validated against ProductCreateRequest and loaded in chunks.
+    Invalid rows are reported by line number and skipped without aborting the import.
+    """
+    try:
+        fmt = detect_format(file.filename, format.value if format else None)
+        return await import_service.import_stream(open_text(file.file), fmt)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to import products: {str(e)}")
+
+@app.get("/api/products/{product_id}", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(2)
 async def get_product(
     product_id: int,
-    product_service: ProductService = Depends(get_product_service)
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(get_product_fields),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
-    """Get a specific product by ID"""
-    product_db = product_service.get_product_by_id(product_id)
+    """Get a specific product by ID; supports fields=... and If-None-Match / If-Modified-Since"""
+    version = await product_service.get_product_version(product_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Product not found")
+    last_modified, row_version = version
+    headers = validator_headers(make_etag(row_version, fields), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+    
+    product_db = await product_service.get_product_by_id(product_id)
     if not product_db:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    return {
-        "product": product_db_to_pydantic(product_db).dict(),
-        "database_info": {
-            "created_at": product_db.created_at,
-            "updated_at": product_db.updated_at
-        }
-    }
+    # The row may have changed since the version lookup; describe what is actually returned
+    last_modified, row_version = product_version(product_db)
+    return Response(
+        content=dumps({
+            "product": product_db_to_dict(product_db, fields),
+            "database_info": {
+                "created_at": product_db.created_at,
+                "updated_at": product_db.updated_at
+            }
+        }),
+        media_type="application/json",
+        headers=validator_headers(make_etag(row_version, fields), last_modified)
+    )
 
-@app.get("/api/products/{product_id}/bids")
+@app.get("/api/products/{product_id}/detail", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(2)
+async def get_product_detail(
+    product_id: int,
+    bid_limit: int = Query(10, ge=1, le=100, description="Number of top bids to include"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_product_fields),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """Product page data in one request: the product, its top bids, its highest bid and the bid count"""
+    try:
+        detail = await product_service.get_product_detail(product_id, bid_limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get product detail: {str(e)}")
+    if not detail:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    product_db, bids_db, highest_bid_db = detail
+    return Response(
+        content=dumps({
+            "product": product_db_to_dict(product_db, fields),
+            "bids": [{"bid_id": b.id, **bid_db_to_dict(b)} for b in bids_db],
+            # The bid holding current_bid, whether or not it made the top bid_limit
+            "highest_bid": {"bid_id": highest_bid_db.id, **bid_db_to_dict(highest_bid_db)} if highest_bid_db else None,
+            "bid_count": product_db.bid_count or 0
+        }),
+        media_type="application/json"
+    )
+
+@app.get("/api/products/{product_id}/bids", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(2)
 async def get_product_bids(
     product_id: int,
+    request: Request,
     limit: int = Query(100, ge=1, le=500, description="Maximum number of bids to return"),
-    bid_service: BidService = Depends(get_bid_service)
+    bid_service: AsyncBidService = Depends(get_bid_service)
 ):
-    """Get all bids for a specific product"""
+    """Get all bids for a specific product; supports If-None-Match / If-Modified-Since"""
     try:
-        bids_db = bid_service.get_bids_by_product(product_id, limit)
-        bids = [bid_db_to_pydantic(b).to_dict() for b in bids_db]
+        headers = None
+        version = await bid_service.get_product_bids_version(product_id)
+        if version:
+            last_modified, bids_version = version
+            headers = validator_headers(make_etag("product-bids", product_id, limit, bids_version), last_modified)
+            if is_not_modified(request, headers["ETag"], last_modified):
+                return not_modified_response(headers)
         
-        return {
-            "product_id": product_id,
-            "bids": bids,
-            "bid_count": len(bids)
-        }
+        bids_db = await bid_service.get_bids_by_product(product_id, limit)
+        bids = [bid_db_to_dict(b) for b in bids_db]
+        
+        return Response(
+            content=dumps({
+                "product_id": product_id,
+                "bids": bids,
+                "bid_count": len(bids)
+            }),
+            media_type="application/json",
+            headers=headers
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get bids: {str(e)}")
 
 # === BID ENDPOINTS ===
 
-@app.post("/api/products/{product_id}/bids")
+def replay_response(stored: dict, request_hash: str) -> JSONResponse:
+    """The stored response of a retried request, if the retry matches the original"""
+    if stored["request_hash"] != request_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    return JSONResponse(
+        status_code=stored["status_code"],
+        content=stored["body"],
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+@app.post("/api/products/{product_id}/bids", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(6)
 async def create_bid(
     product_id: int,
     request: BidCreateRequest,
-    bid_service: BidService = Depends(get_bid_service),
-    product_service: ProductService = Depends(get_product_service)
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    bid_service: AsyncBidService = Depends(get_bid_service),
+    idempotency_service: AsyncIdempotencyService = Depends(get_idempotency_service)
 ):
     """Create a new bid for a product"""
+    request_hash = None
+    if idempotency_key:
+        # Replay recent retries from memory without spending rate-limit tokens
+        request_hash = idempotency_service.hash_request(
+            "POST", f"/api/products/{product_id}/bids", request.model_dump()
+        )
+        stored = get_cached_response(request.user_id, idempotency_key)
+        if stored:
+            return replay_response(stored, request_hash)
+    
+    # Reject floods before any database work
+    allowed, retry_after = admit_bid(request.user_id, product_id)
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many bids, please retry later",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    if idempotency_key:
+        # A taken key is either a completed request to replay or one still in flight
+        if not await idempotency_service.reserve(request.user_id, idempotency_key, request_hash):
+            stored = await idempotency_service.get_response(request.user_id, idempotency_key, check_cache=False)
+            if stored:
+                return replay_response(stored, request_hash)
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is already in progress")
+    
     try:
-        # Verify product exists
-        if not product_service.get_product_by_id(product_id):
-            raise HTTPException(status_code=404, detail="Product not found")
-        
         # Create bid object
         bid = Bid(
             user_id=request.user_id,
@@ -252,61 +642,109 @@ async def create_bid(
             max_auto_bid=request.max_auto_bid
         )
         
-        bid_db = bid_service.create_bid(bid, product_id)
-        if not bid_db:
-            raise HTTPException(status_code=500, detail="Failed to create bid")
+        response = None
         
-        # Check if this is the new highest bid and update statuses
-        highest_bid = bid_service.get_highest_bid_for_product(product_id)
-        if highest_bid and highest_bid.id == bid_db.id:
-            bid_service.process_outbid_updates(product_id, bid_db.id)
+        def store_response(session, bid_db):
+            # Runs inside the bid's transaction, so a retry either finds this
+            # response or finds no bid at all
+            nonlocal response
+            response = {
+                "message": "Bid created successfully",
+                "bid_id": bid_db.id,
+                "bid": bid_db_to_pydantic(bid_db).to_dict()
+            }
+            if idempotency_key:
+                IdempotencyService(session).store_response(request.user_id, idempotency_key, 200, response)
         
-        return {
-            "message": "Bid created successfully",
-            "bid_id": bid_db.id,
-            "bid": bid_db_to_pydantic(bid_db).to_dict()
-        }
+        # Outbids the other bids (or this one) in the same transaction; the
+        # product row it locks doubles as the existence check
+        bid_db = await bid_service.create_bid(bid, product_id, before_commit=store_response)
+        if not bid_db:
+            raise HTTPException(status_code=404, detail="Product not found")
+        
+        if idempotency_key:
+            cache_response(request.user_id, idempotency_key, request_hash, 200, response)
+        return response
+    except ReservationLostError:
+        raise HTTPException(
+            status_code=409, detail="The Idempotency-Key reservation expired before the bid was placed; retry"
+        )
+    except HTTPException:
+        if idempotency_key:
+            await idempotency_service.release(request.user_id, idempotency_key)
+        raise
     except Exception as e:
+        if idempotency_key:
+            await idempotency_service.release(request.user_id, idempotency_key)
         raise HTTPException(status_code=500, detail=f"Failed to create bid: {str(e)}")
 
-@app.get("/api/users/{user_id}/bids")
+@app.get("/api/users/{user_id}/bids", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(2)
 async def get_user_bids(
     user_id: str,
+    request: Request,
     active_only: bool = Query(False, description="Return only active bids"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of bids to return"),
-    bid_service: BidService = Depends(get_bid_service)
+    bid_service: AsyncBidService = Depends(get_bid_service)
 ):
-    """Get all bids for a specific user"""
+    """Get all bids for a specific user; supports If-None-Match / If-Modified-Since"""
     try:
+        headers = None
+        version = await bid_service.get_user_bids_version(user_id)
+        if version:
+            last_modified, bids_version = version
+            headers = validator_headers(
+                make_etag("user-bids", user_id, active_only, limit, bids_version), last_modified
+            )
+            if is_not_modified(request, headers["ETag"], last_modified):
+                return not_modified_response(headers)
+        
         if active_only:
-            bids_db = bid_service.get_active_bids_by_user(user_id)
+            bids_db = await bid_service.get_active_bids_by_user(user_id)
         else:
-            bids_db = bid_service.get_bids_by_user(user_id, limit)
+            bids_db = await bid_service.get_bids_by_user(user_id, limit)
         
-        bids = [bid_db_to_pydantic(b).to_dict() for b in bids_db]
+        bids = [bid_db_to_dict(b) for b in bids_db]
         
-        return {
-            "user_id": user_id,
-            "bids": bids,
-            "bid_count": len(bids)
-        }
+        return Response(
+            content=dumps({
+                "user_id": user_id,
+                "bids": bids,
+                "bid_count": len(bids)
+            }),
+            media_type="application/json",
+            headers=headers
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get user bids: {str(e)}")
 
-@app.get("/api/products/{product_id}/highest-bid")
+@app.get("/api/users/{user_id}/bid-summary", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(2)
+async def get_user_bid_summary(
+    user_id: str,
+    bid_service: AsyncBidService = Depends(get_bid_service)
+):
+    """Get a user's bidding dashboard summary"""
+    try:
+        return await bid_service.get_user_bid_summary(user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get bid summary: {str(e)}")
+
+@app.get("/api/products/{product_id}/highest-bid", dependencies=[Depends(route_reads_by_resource)])
+@query_budget(1)
 async def get_highest_bid(
     product_id: int,
-    bid_service: BidService = Depends(get_bid_service)
+    bid_service: AsyncBidService = Depends(get_bid_service)
 ):
     """Get the highest bid for a specific product"""
     try:
-        bid_db = bid_service.get_highest_bid_for_product(product_id)
+        bid_db = await bid_service.get_highest_bid_for_product(product_id)
         if not bid_db:
             return {"message": "No bids found for this product"}
         
         return {
             "product_id": product_id,
-            "highest_bid": bid_db_to_pydantic(bid_db).to_dict()
+            "highest_bid": bid_db_to_dict(bid_db)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get highest bid: {str(e)}")
@@ -0,0 +1,74 @@
+"""
+Conditional GET support: ETag/Last-Modified validators and 304 responses.
+
+Endpoints look up a cheap row version first (a few columns or one aggregate),
+build validators from it and answer If-None-Match / If-Modified-Since with a
+bodiless 304 before loading or serializing anything.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from a row version plus anything else that shapes the representation"""
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; they are stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp as an HTTP-date"""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """ETag, Last-Modified and a Cache-Control that makes clients revalidate"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match, or If-Modified-Since when no If-None-Match was sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP-dates have one second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Bodiless 304 carrying the current validators"""
+    return Response(status_code=304, headers=headers)
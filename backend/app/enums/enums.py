@@ -20,4 +20,29 @@ class BidStatus(Enum):
     WINNING = "winning"
     OUTBID = "outbid"
     WON = "won"
-    LOST = "lost"
\ No newline at end of file
+    LOST = "lost"
+
+class ProductSort(Enum):
+    NEWEST = "newest"
+    OLDEST = "oldest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    MOST_BIDS = "most_bids"
+    TITLE = "title"
+
+class PriceField(Enum):
+    SUGGESTED_PRICE = "suggested_price"
+    CURRENT_BID = "current_bid"
+
+class ImportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class ProfilerMode(Enum):
+    SAMPLE = "sample"
+    CPROFILE = "cprofile"
+
+class ProfileFormat(Enum):
+    COLLAPSED = "collapsed"
+    TEXT = "text"
+    PSTATS = "pstats"
@@ -16,6 +16,9 @@ class Product(BaseModel):
     model: Optional[str] = None
     confidence_score: float = Field(default=0.7)
     image_url: Optional[str] = None
+    bid_count: int = 0
+    highest_bid_id: Optional[int] = None
+    last_bid_at: Optional[datetime] = None
 
 class Bid(BaseModel):
     user_id: str
@@ -10,8 +10,9 @@ from datetime import datetime
 def product_db_to_pydantic(product_db: ProductDB) -> Product:
     """
     Convert SQLAlchemy ProductDB model to Pydantic Product model.
+    Database rows are trusted, so the model is constructed without validation.
     """
-    return Product(
+    return Product.model_construct(
         id=product_db.id,
         title=product_db.title,
         description=product_db.description,
@@ -23,7 +24,10 @@ def product_db_to_pydantic(product_db: ProductDB) -> Product:
         brand=product_db.brand,
         model=product_db.model,
         confidence_score=product_db.confidence_score,
-        image_url=product_db.image_url
+        image_url=product_db.image_url,
+        bid_count=product_db.bid_count or 0,
+        highest_bid_id=product_db.highest_bid_id,
+        last_bid_at=product_db.last_bid_at
     )
 
 
@@ -49,8 +53,9 @@ def product_pydantic_to_db(product: Product) -> ProductDB:
 def bid_db_to_pydantic(bid_db: BidDB) -> Bid:
     """
     Convert SQLAlchemy BidDB model to Pydantic Bid model.
+    Database rows are trusted, so the model is constructed without validation.
     """
-    return Bid(
+    return Bid.model_construct(
         user_id=bid_db.user_id,
         product_id=str(bid_db.product_id),
         amount=bid_db.amount,
@@ -0,0 +1,92 @@
+"""
+Zero-validation serialization for trusted database rows.
+
+The hot read endpoints project only the columns a response needs and build the
+response dicts straight from the row tuples, then encode them with orjson,
+skipping the ORM -> Pydantic -> dict copies. The output matches what the
+Pydantic path produces for the same rows.
+"""
+from typing import Any, Optional, Sequence, Tuple
+
+import orjson
+
+from ..db_models import ProductDB, BidDB
+
+# Columns of a product response, in Product field order (id first)
+PRODUCT_RESPONSE_COLUMNS = (
+    ProductDB.id,
+    ProductDB.title,
+    ProductDB.description,
+    ProductDB.condition,
+    ProductDB.category,
+    ProductDB.suggested_price,
+    ProductDB.current_bid,
+    ProductDB.tags,
+    ProductDB.brand,
+    ProductDB.model,
+    ProductDB.confidence_score,
+    ProductDB.image_url,
+    ProductDB.bid_count,
+    ProductDB.highest_bid_id,
+    ProductDB.last_bid_at,
+)
+PRODUCT_RESPONSE_FIELDS = tuple(column.key for column in PRODUCT_RESPONSE_COLUMNS)
+PRODUCT_FIELD_COLUMNS = dict(zip(PRODUCT_RESPONSE_FIELDS, PRODUCT_RESPONSE_COLUMNS))
+
+
+def parse_product_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated sparse fieldset into product field names (id always
+    first), or None for the full response. Raises ValueError for unknown fields.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in PRODUCT_FIELD_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown product fields: {', '.join(unknown)}. "
+            f"Available fields: {', '.join(PRODUCT_RESPONSE_FIELDS)}"
+        )
+    return ("id",) + tuple(dict.fromkeys(field for field in requested if field != "id"))
+
+
+def product_columns(fields: Optional[Tuple[str, ...]] = None) -> tuple:
+    """Columns to select for a parsed fieldset (all response columns for None)"""
+    if fields is None:
+        return PRODUCT_RESPONSE_COLUMNS
+    return tuple(PRODUCT_FIELD_COLUMNS[field] for field in fields)
+
+
+def product_row_to_dict(row: Sequence[Any], fields: Optional[Tuple[str, ...]] = None) -> dict:
+    """Build a product response dict from a row of product_columns(fields)"""
+    product = dict(zip(fields or PRODUCT_RESPONSE_FIELDS, row))
+    if "tags" in product and product["tags"] is None:
+        product["tags"] = []
+    if "bid_count" in product and product["bid_count"] is None:
+        product["bid_count"] = 0
+    return product
+
+
+def product_db_to_dict(product_db: ProductDB, fields: Optional[Tuple[str, ...]] = None) -> dict:
+    """Build a product response dict from a loaded ProductDB without validation"""
+    fields = fields or PRODUCT_RESPONSE_FIELDS
+    return product_row_to_dict([getattr(product_db, field) for field in fields], fields)
+
+
+def bid_db_to_dict(bid_db: BidDB) -> dict:
+    """Build the same dict as Bid.to_dict() from a loaded BidDB without validation"""
+    return {
+        "user_id": bid_db.user_id,
+        "product_id": str(bid_db.product_id),
+        "amount": bid_db.amount,
+        "timestamp": bid_db.timestamp.isoformat() if bid_db.timestamp else None,
+        "status": bid_db.status,
+        "is_auto_bid": bid_db.is_auto_bid,
+        "max_auto_bid": bid_db.max_auto_bid,
+    }
+
+
+def dumps(content: Any) -> bytes:
+    """Encode a response body; UTC datetimes end in Z like Pydantic's JSON mode"""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
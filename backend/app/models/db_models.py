@@ -1,7 +1,7 @@
 """
 SQLAlchemy database models for Product and Bid entities.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -26,6 +26,11 @@ class ProductDB(Base):
     confidence_score = Column(Float, default=0.7)
     image_url = Column(String(500), nullable=True)  # Store image URL
     
+    # Bid statistics, maintained in the same transaction as bid writes
+    bid_count = Column(Integer, nullable=False, default=0, server_default="0")
+    highest_bid_id = Column(Integer, nullable=True)  # Bid currently holding current_bid
+    last_bid_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -33,6 +38,19 @@ class ProductDB(Base):
     # Relationships
     bids = relationship("BidDB", back_populates="product", cascade="all, delete-orphan")
     
+    # Keyset pagination indexes: (filter or sort key, id). The Postgres-only GIN index
+    # on (tags::jsonb), the generated search_vector column and its full-text and
+    # trigram indexes are created by migration (and kept out of autogenerate in alembic/env.py).
+    __table_args__ = (
+        Index("ix_products_condition", condition),
+        Index("ix_products_category_id", category, id),
+        Index("ix_products_brand_id", brand, id),
+        Index("ix_products_suggested_price_sort", func.coalesce(suggested_price, 0.0), id),
+        Index("ix_products_current_bid_sort", func.coalesce(current_bid, 0.0), id),
+        Index("ix_products_bid_count_id", bid_count, id),
+        Index("ix_products_title_id", title, id),
+    )
+    
     def __repr__(self):
         return f"<ProductDB(id={self.id}, title='{self.title}', category='{self.category}')>"
 
@@ -60,4 +78,30 @@ class BidDB(Base):
     product = relationship("ProductDB", back_populates="bids")
     
     def __repr__(self):
-        return f"<BidDB(id={self.id}, amount={self.amount}, status='{self.status}')>"
\ No newline at end of file
+        return f"<BidDB(id={self.id}, amount={self.amount}, status='{self.status}')>"
+
+
+class IdempotencyKeyDB(Base):
+    """
+    SQLAlchemy model for stored Idempotency-Key responses.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String(100), nullable=False)  # Keys are scoped per user
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of method, path and body
+    status_code = Column(Integer, nullable=True)  # NULL while the original request is in flight
+    response_body = Column(JSON, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # End of the in-flight lease, then of the replay window once completed
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+    )
+    
+    def __repr__(self):
+        return f"<IdempotencyKeyDB(user_id='{self.user_id}', key='{self.key}', status_code={self.status_code})>"
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+from ..enums.enums import PriceField
 
 class ProductCreateRequest(BaseModel):
     title: str
@@ -13,6 +14,19 @@ class ProductCreateRequest(BaseModel):
     confidence_score: float = 0.7
     image_url: Optional[str] = None
 
+class ProductFilters(BaseModel):
+    category: Optional[str] = None
+    brand: Optional[str] = None
+    condition: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    price_field: PriceField = PriceField.SUGGESTED_PRICE
+    tags: List[str] = []
+
+class ProductBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+    fields: Optional[str] = None
+
 class BidCreateRequest(BaseModel):
     user_id: str
     amount: float
@@ -0,0 +1,75 @@
+"""
+Instrumented Gemini calls.
+
+Agent tools call ``generate_content(model, contents, tool=...)`` instead of
+``model.generate_content(contents)`` so every call is counted, timed and has its
+token usage recorded under the tool that made it, and runs in a
+``gemini.generate_content`` span carrying payload sizes and token counts.
+"""
+import time
+
+from .metrics import GEMINI_CALL_DURATION, GEMINI_CALLS, GEMINI_TOKENS
+from .tracing import start_span
+
+
+def model_label(model) -> str:
+    """'gemini-2.0-flash' from a GenerativeModel ('models/gemini-2.0-flash')."""
+    name = getattr(model, "model_name", None) or "unknown"
+    return name.rsplit("/", 1)[-1]
+
+
+def payload_bytes(contents) -> int:
+    """Approximate request size: text length plus inline image bytes."""
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    size = 0
+    for part in parts:
+        if isinstance(part, dict):
+            size += len(part.get("data") or b"")
+        else:
+            size += len(str(part))
+    return size
+
+
+def record_usage(tool: str, model: str, response, span=None) -> None:
+    """Add a response's prompt and completion token counts, when the API reports them."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+    completion_tokens = getattr(usage, "candidates_token_count", 0) or 0
+    if prompt_tokens:
+        GEMINI_TOKENS.labels(tool, model, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        GEMINI_TOKENS.labels(tool, model, "completion").inc(completion_tokens)
+    if span is not None:
+        span.set_attributes({
+            "gen_ai.usage.input_tokens": prompt_tokens,
+            "gen_ai.usage.output_tokens": completion_tokens,
+        })
+
+
+def generate_content(model, contents, tool: str):
+    """``model.generate_content(contents)``, recorded under the agent tool ``tool``."""
+    label = model_label(model)
+    attributes = {
+        "gen_ai.system": "gemini",
+        "gen_ai.request.model": label,
+        "agentbay.tool": tool,
+        "payload.request_bytes": payload_bytes(contents),
+    }
+    with start_span("gemini.generate_content", attributes) as span:
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(contents)
+        except Exception:
+            GEMINI_CALLS.labels(tool, label, "error").inc()
+            raise
+        finally:
+            GEMINI_CALL_DURATION.labels(tool, label).observe(time.perf_counter() - started)
+        GEMINI_CALLS.labels(tool, label, "success").inc()
+        record_usage(tool, label, response, span)
+        try:
+            span.set_attribute("payload.response_chars", len(response.text))
+        except Exception:
+            pass  # Blocked or empty responses have no text; the caller handles that
+        return response
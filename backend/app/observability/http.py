@@ -0,0 +1,61 @@
+"""
+ASGI middleware recording Prometheus HTTP metrics.
+
+Requests are labelled by route template (``/api/products/{product_id}``) rather
+than raw path so label cardinality stays bounded. The template is read from
+``scope["route"]``, which the router sets on the shared scope once it has
+matched, so labels are only known after the app returns; the in-flight gauge
+is incremented before routing and is therefore labelled by method alone.
+Plain ASGI instead of BaseHTTPMiddleware: no extra task or body buffering per
+request.
+"""
+import time
+
+from .metrics import (
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+from .sql_profiler import profile_queries
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope) -> str:
+    """Path template of the route that handled a request; only set once the router has run."""
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+class HTTPMetricsMiddleware:
+    """Per-route latency, in-flight requests, status codes and SQL statements per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        # Opened here so the SQL profiler reports the same statements this counts
+        with profile_queries() as profile:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_template(scope)
+                HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+                in_progress.dec()
+                HTTP_REQUESTS.labels(method, route, str(status[0])).inc()
+                HTTP_REQUEST_DB_QUERIES.labels(method, route).observe(profile.count)
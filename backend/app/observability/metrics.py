@@ -0,0 +1,173 @@
+"""
+Prometheus metrics shared across the application.
+"""
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# === HTTP ===
+HTTP_REQUESTS = Counter(
+    "agentbay_http_requests_total",
+    "HTTP requests handled, by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "agentbay_http_request_duration_seconds",
+    "HTTP request latency from receipt to the last response byte",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "agentbay_http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "agentbay_http_request_db_queries",
+    "SQL statements executed while handling one HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+
+# === GEMINI ===
+GEMINI_CALLS = Counter(
+    "agentbay_gemini_calls_total",
+    "Gemini generate_content calls, by agent tool and outcome",
+    ["tool", "model", "outcome"],
+)
+GEMINI_CALL_DURATION = Histogram(
+    "agentbay_gemini_call_duration_seconds",
+    "Gemini generate_content latency, by agent tool",
+    ["tool", "model"],
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0),
+)
+GEMINI_TOKENS = Counter(
+    "agentbay_gemini_tokens_total",
+    "Gemini tokens used, by agent tool and kind (prompt or completion)",
+    ["tool", "model", "kind"],
+)
+
+# === RATE LIMITING ===
+RATE_LIMIT_DECISIONS = Counter(
+    "agentbay_rate_limit_decisions_total",
+    "Admission decisions made by a rate limiter",
+    ["limiter", "outcome"],
+)
+RATE_LIMIT_TRACKED_KEYS = Gauge(
+    "agentbay_rate_limit_tracked_keys",
+    "Number of token buckets currently held in memory by a rate limiter",
+    ["limiter"],
+)
+RATE_LIMIT_RATE = Gauge(
+    "agentbay_rate_limit_rate_per_second",
+    "Configured token refill rate of a rate limiter",
+    ["limiter"],
+)
+RATE_LIMIT_BURST = Gauge(
+    "agentbay_rate_limit_burst",
+    "Configured bucket capacity of a rate limiter",
+    ["limiter"],
+)
+
+
+# === DATABASE CONNECTION POOLS ===
+class ConnectionPoolCollector:
+    """
+    Reads SQLAlchemy pool counters at scrape time, so tracking costs nothing per checkout.
+    """
+
+    def __init__(self):
+        self._engines = {}
+
+    def add(self, name: str, engine) -> None:
+        self._engines[name] = engine
+
+    def collect(self):
+        size = GaugeMetricFamily("agentbay_db_pool_size", "Configured persistent connections in the pool", labels=["pool"])
+        checked_out = GaugeMetricFamily("agentbay_db_pool_checked_out", "Connections currently checked out", labels=["pool"])
+        checked_in = GaugeMetricFamily("agentbay_db_pool_checked_in", "Idle connections held by the pool", labels=["pool"])
+        overflow = GaugeMetricFamily("agentbay_db_pool_overflow", "Connections open beyond the pool size", labels=["pool"])
+        saturation = GaugeMetricFamily(
+            "agentbay_db_pool_saturation",
+            "Checked out connections as a fraction of pool size plus max overflow",
+            labels=["pool"],
+        )
+        for name, engine in list(self._engines.items()):
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue  # NullPool/StaticPool keep no counters
+            capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            checked_in.add_metric([name], pool.checkedin())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            saturation.add_metric([name], pool.checkedout() / capacity if capacity else 0.0)
+        yield size
+        yield checked_out
+        yield checked_in
+        yield overflow
+        yield saturation
+
+
+_pool_collector = ConnectionPoolCollector()
+REGISTRY.register(_pool_collector)
+
+
+def track_connection_pool(name: str, engine) -> None:
+    """Export pool saturation gauges for a (sync) SQLAlchemy engine under ``name``."""
+    _pool_collector.add(name, engine)
+
+
+# === CACHES ===
+class CacheCollector:
+    """
+    Reads TTLCache hit/miss counters at scrape time, so lookups pay nothing extra.
+    """
+
+    def __init__(self):
+        self._caches = {}
+
+    def add(self, name: str, cache) -> None:
+        self._caches[name] = cache
+
+    def collect(self):
+        hits = CounterMetricFamily("agentbay_cache_hits", "Cache lookups that found a live entry", labels=["cache"])
+        misses = CounterMetricFamily("agentbay_cache_misses", "Cache lookups that missed or found an expired entry", labels=["cache"])
+        entries = GaugeMetricFamily("agentbay_cache_entries", "Entries currently held by a cache", labels=["cache"])
+        ratio = GaugeMetricFamily("agentbay_cache_hit_ratio", "Hits as a fraction of all lookups since start", labels=["cache"])
+        for name, cache in list(self._caches.items()):
+            lookups = cache.hits + cache.misses
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            entries.add_metric([name], len(cache))
+            ratio.add_metric([name], cache.hits / lookups if lookups else 0.0)
+        yield hits
+        yield misses
+        yield entries
+        yield ratio
+
+
+_cache_collector = CacheCollector()
+REGISTRY.register(_cache_collector)
+
+
+def track_cache(name: str, cache) -> None:
+    """Export hit/miss counters and the hit ratio of a TTLCache under ``name``."""
+    _cache_collector.add(name, cache)
+
+
+# === READ REPLICAS ===
+DB_ROUTED_STATEMENTS = Counter(
+    "agentbay_db_routed_statements_total",
+    "Statements routed to the primary or a read replica",
+    ["target"],
+)
+DB_REPLICA_LAG = Gauge(
+    "agentbay_db_replica_lag_seconds",
+    "Replication lag of a read replica (0 once it has replayed all WAL it received)",
+    ["replica"],
+)
+
+
+def render_metrics() -> tuple:
+    """Return the exposition payload and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
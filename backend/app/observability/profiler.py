@@ -0,0 +1,225 @@
+"""
+On-demand CPU profiling of a live worker.
+
+Two profilers, one capture at a time per worker:
+
+    sample    a background thread snapshots every thread's stack with
+              ``sys._current_frames()`` each ``interval`` seconds; overhead is a
+              few percent and independent of how much code runs. Output is
+              collapsed stacks (``frame;frame;frame count``, one line per
+              unique stack) for flamegraph.pl, speedscope or inferno.
+    cprofile  deterministic ``cProfile`` over the capture window; exact call
+              counts but several times slower code while it runs. Output is a
+              pstats text report or the binary pstats dump.
+
+Passing ``route`` limits the capture to requests whose path or route template
+matches (``/api/agent/create-listing``, ``/api/products/{product_id}``):
+``ProfilerMiddleware`` registers each matching request's coroutine frame, and
+the sampler keeps only stacks running inside one of them. cProfile cannot
+separate interleaved tasks, so in that mode it is switched on while at least
+one matching request is in flight. Work a request hands to the threadpool runs
+outside its frame and is not attributed to it.
+"""
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from starlette.routing import compile_path
+
+from ..enums.enums import ProfileFormat, ProfilerMode
+
+logger = logging.getLogger(__name__)
+
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "120"))
+PROFILER_MIN_INTERVAL = 0.001
+PROFILER_MAX_DEPTH = 128
+STDLIB_DIR = sysconfig.get_paths()["stdlib"] + os.sep
+
+FORMATS = {
+    ProfilerMode.SAMPLE: (ProfileFormat.COLLAPSED,),
+    ProfilerMode.CPROFILE: (ProfileFormat.TEXT, ProfileFormat.PSTATS),
+}
+
+# Leaf frames of threads parked waiting for work (event loop poll, idle executors)
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a capture is requested while another one is running"""
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    marker = filename.rfind("site-packages" + os.sep)
+    if marker != -1:
+        filename = filename[marker + len("site-packages") + 1:]
+    elif filename.startswith(STDLIB_DIR):
+        filename = filename[len(STDLIB_DIR):]
+    elif filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+class Capture:
+    """One profiling run: its settings, the requests it matched and what it collected"""
+
+    def __init__(self, mode: ProfilerMode, route: Optional[str] = None, interval: float = 0.005, include_idle: bool = False):
+        self.mode = mode
+        self.route = route
+        # Matches the request path itself, so requests are picked out before the router has run
+        self._route_regex = compile_path(route)[0] if route is not None else None
+        self.interval = max(interval, PROFILER_MIN_INTERVAL)
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.matched_requests = 0
+        self.profile = cProfile.Profile() if mode == ProfilerMode.CPROFILE else None
+        # id() of the coroutine frames of matching requests in flight
+        self._frames = set()
+        self._stopped = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def matches(self, scope) -> bool:
+        return self._route_regex is None or self._route_regex.match(scope["path"]) is not None
+
+    def request_started(self, frame) -> None:
+        if self._stopped:
+            return
+        self.matched_requests += 1
+        self._frames.add(id(frame))
+        if self.profile is not None and self.route is not None and len(self._frames) == 1:
+            self.profile.enable()
+
+    def request_finished(self, frame) -> None:
+        if id(frame) not in self._frames:
+            return
+        self._frames.discard(id(frame))
+        if self.profile is not None and self.route is not None and not self._frames and not self._stopped:
+            self.profile.disable()
+
+    def start(self) -> None:
+        if self.mode == ProfilerMode.SAMPLE:
+            self._thread = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._thread.start()
+        elif self.route is None:
+            self.profile.enable()
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        elif self.profile is not None and (self.route is None or self._frames):
+            self.profile.disable()
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._sample(names.get(ident, str(ident)), frame)
+            self.sample_count += 1
+
+    def _sample(self, thread_name: str, frame) -> None:
+        if not self.include_idle and _is_idle(frame):
+            return
+        stack = []
+        inside_request = self.route is None
+        while frame is not None and len(stack) < PROFILER_MAX_DEPTH:
+            if not inside_request and id(frame) in self._frames:
+                inside_request = True
+            stack.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        if inside_request:
+            stack.append(thread_name)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def pstats_text(self, sort: str = "cumulative", limit: int = 100) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def pstats_dump(self) -> bytes:
+        """Same bytes as ``Stats.dump_stats``; load with ``pstats.Stats(path)`` or snakeviz"""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+_active: Optional[Capture] = None
+_lock = asyncio.Lock()
+
+
+async def run_capture(
+    seconds: float,
+    mode: ProfilerMode = ProfilerMode.SAMPLE,
+    route: Optional[str] = None,
+    interval: float = 0.005,
+    include_idle: bool = False,
+) -> Capture:
+    """Profile this worker for ``seconds`` and return the finished capture."""
+    global _active
+    if _lock.locked():
+        raise ProfilerBusyError("A profile is already being captured on this worker")
+    async with _lock:
+        capture = Capture(mode, route, interval, include_idle)
+        capture.start()
+        _active = capture
+        started = time.perf_counter()
+        logger.info(f"Profiling worker {os.getpid()} for {seconds}s (mode={mode.value}, route={route})")
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            _active = None
+            capture.stop()
+        logger.info(
+            f"Profile finished after {time.perf_counter() - started:.1f}s: "
+            f"{capture.matched_requests} matching requests, {capture.sample_count} samples"
+        )
+        return capture
+
+
+class ProfilerMiddleware:
+    """Plain ASGI middleware marking requests that match the active capture's route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        capture = _active
+        if capture is None or scope["type"] != "http" or not capture.matches(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # This coroutine's frame sits below all of the request's code on the stack
+        frame = sys._getframe()
+        capture.request_started(frame)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            capture.request_finished(frame)
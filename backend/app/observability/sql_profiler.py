@@ -0,0 +1,183 @@
+"""
+Per-request SQL profiler and N+1 detector.
+
+Engine events time every statement into the profile of the request that issued
+it; the same profile feeds the per-route statement histogram of
+HTTPMetricsMiddleware, so each statement is counted by one listener pair.
+Statements slower than SQL_SLOW_QUERY_MS are always logged; their bound
+parameters can hold user data, so they are only included with SQL_LOG_PARAMS on.
+
+SQL_PROFILER (off by default: the headers expose internals to every client)
+turns on, for each HTTP request:
+
+- a ``Server-Timing`` header (``db`` time and statement count, ``app`` total)
+  plus ``X-Query-Count`` and, for routes with a budget, ``X-Query-Budget``;
+- flags for statements repeated SQL_N_PLUS_ONE_THRESHOLD or more times (identical
+  SQL with different parameters, usually a lazy load or a query in a loop);
+- a warning when a route runs more statements than its ``@query_budget``.
+
+Tests assert budgets with ``assert_query_budget(response)`` or wrap service code
+in ``profile_queries()``.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+SQL_PROFILER = os.getenv("SQL_PROFILER", "false").strip().lower() in ("1", "true", "yes", "on")
+SQL_LOG_PARAMS = os.getenv("SQL_LOG_PARAMS", "false").strip().lower() in ("1", "true", "yes", "on")
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+# Bound parameters are truncated in logs, and replaced by this unless SQL_LOG_PARAMS is on
+SQL_LOG_PARAMS_CHARS = 500
+REDACTED_PARAMS = "<redacted>"
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_BUDGET_HEADER = "X-Query-Budget"
+
+
+class QueryProfile:
+    """Statements executed within one request (or one profile_queries() block)"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Counter = Counter()
+        self.slow: List[Tuple[float, str, str]] = []
+
+    def record(self, statement: str, parameters, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        if seconds * 1000 >= SQL_SLOW_QUERY_MS:
+            params = repr(parameters) if SQL_LOG_PARAMS else REDACTED_PARAMS
+            if len(params) > SQL_LOG_PARAMS_CHARS:
+                params = params[:SQL_LOG_PARAMS_CHARS] + "..."
+            self.slow.append((seconds, statement, params))
+            slow_query_logger.warning(f"Slow query ({seconds * 1000:.1f} ms): {statement} params={params}")
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statements run at least ``threshold`` times, most repeated first"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries", '
+            f'app;dur={total_seconds * 1000:.1f}'
+        )
+
+
+# Bound per request; shared (not copied) by threadpool and greenlet work
+_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _profile.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _profile.get()
+    started = conn.info.get("query_started")
+    if profile is None or not started:
+        return
+    profile.record(statement, parameters, time.perf_counter() - started.pop())
+
+
+def profile_engine(engine) -> None:
+    """Time the statements a (sync) SQLAlchemy engine executes into the active profile."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Collect the statements run inside the block (per request, and for tests, scripts and benchmarks)"""
+    profile = QueryProfile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+def query_budget(max_queries: int):
+    """
+    Route decorator declaring the most statements one request may run.
+    Place it below the ``@app.get(...)`` line.
+    """
+    def decorator(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+
+def assert_query_budget(response, max_queries: Optional[int] = None) -> int:
+    """
+    Assert a test client response stayed within its route's budget (or
+    ``max_queries``) and return its statement count.
+    """
+    count = int(response.headers[QUERY_COUNT_HEADER])
+    budget = max_queries if max_queries is not None else response.headers.get(QUERY_BUDGET_HEADER)
+    assert budget is not None, "route has no @query_budget and no max_queries was given"
+    assert count <= int(budget), f"{count} queries exceed the budget of {budget}"
+    return count
+
+
+class SQLProfilerMiddleware:
+    """
+    Plain ASGI middleware reporting each HTTP request's QueryProfile; it uses the
+    profile HTTPMetricsMiddleware opened, or its own when mounted without it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_PROFILER:
+            await self.app(scope, receive, send)
+            return
+
+        profile = _profile.get()
+        token = None
+        if profile is None:
+            profile = QueryProfile()
+            token = _profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing(time.perf_counter() - started))
+                headers[QUERY_COUNT_HEADER] = str(profile.count)
+                budget = getattr(scope.get("endpoint"), "__query_budget__", None)
+                if budget is not None:
+                    headers[QUERY_BUDGET_HEADER] = str(budget)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if token is not None:
+                _profile.reset(token)
+            self._report(scope, profile)
+
+    @staticmethod
+    def _report(scope, profile: QueryProfile) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        for statement, n in profile.repeated():
+            logger.warning(f"Possible N+1 in {scope['method']} {route}: {n}x {statement}")
+        budget = getattr(scope.get("endpoint"), "__query_budget__", None)
+        if budget is not None and profile.count > budget:
+            logger.warning(
+                f"{scope['method']} {route} ran {profile.count} queries, over its budget of {budget}"
+            )
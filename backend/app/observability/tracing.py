@@ -0,0 +1,285 @@
+"""
+Span-based tracing for the agent pipelines.
+
+A small tracer with the OpenTelemetry data model: spans carry 128-bit trace ids,
+64-bit span ids, parent links, unix-nanosecond timestamps, typed attributes,
+events and an UNSET/OK/ERROR status, and serialise to OTLP/JSON field names so
+exported files load into OTel tooling. The current span lives in a ContextVar,
+so spans nest across ``await``, ``asyncio.to_thread`` and the threadpool.
+
+Cache lookups (``record_cache_lookup``) add a ``cache.lookup`` event to the
+current span and count towards ``cache.hits`` / ``cache.misses`` on it and every
+enclosing span; ``@traced`` stages start both at 0, so each stage reports the
+cache outcome of the work beneath it.
+
+Exporters, chosen with TRACE_EXPORTER:
+    memory  keep the last TRACE_MEMORY_MAX_SPANS spans in ``memory_exporter``
+    file    append one JSON span per line to TRACE_FILE
+    (unset) record nothing
+
+Usage:
+    @traced("listing.generate_title")
+    def generate_listing_title(...): ...
+
+    with start_span("listing.save_upload") as span:
+        span.set_attribute("payload.bytes", size)
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "").strip().lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_MEMORY_MAX_SPANS = int(os.getenv("TRACE_MEMORY_MAX_SPANS", "10000"))
+SERVICE_NAME = "agentbay-backend"
+
+STATUS_UNSET = "STATUS_CODE_UNSET"
+STATUS_OK = "STATUS_CODE_OK"
+STATUS_ERROR = "STATUS_CODE_ERROR"
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent", "parent_span_id", "start_time_unix_nano",
+        "end_time_unix_nano", "attributes", "events", "status_code", "status_message",
+    )
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent = parent
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[dict] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time_unix_nano is None:
+            return None
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({"name": name, "time_unix_nano": time.time_ns(), "attributes": attributes or {}})
+
+    def set_status(self, code: str, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def record_exception(self, error: BaseException) -> None:
+        self.add_event("exception", {"exception.type": type(error).__name__, "exception.message": str(error)})
+        self.set_status(STATUS_ERROR, str(error))
+
+    def end(self) -> None:
+        if self.end_time_unix_nano is None:
+            self.end_time_unix_nano = time.time_ns()
+
+    def to_dict(self) -> dict:
+        """OTLP/JSON representation"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano or self.start_time_unix_nano),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [
+                {"name": e["name"], "timeUnixNano": str(e["time_unix_nano"]), "attributes": _otlp_attributes(e["attributes"])}
+                for e in self.events
+            ],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+    def __repr__(self):
+        return f"<Span(name='{self.name}', duration_ms={self.duration_ms}, status='{self.status_code}')>"
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in memory (tests, benchmarks, ad-hoc debugging)"""
+
+    def __init__(self, max_spans: int = TRACE_MEMORY_MAX_SPANS):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            return [span for span in self._spans if trace_id is None or span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class FileSpanExporter:
+    """Appends each finished span to a JSON-lines file"""
+
+    def __init__(self, path: str = TRACE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps({"resource": {"service.name": SERVICE_NAME}, **span.to_dict()})
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+memory_exporter = InMemorySpanExporter()
+_exporters: List = []
+if TRACE_EXPORTER == "memory":
+    _exporters.append(memory_exporter)
+elif TRACE_EXPORTER == "file":
+    _exporters.append(FileSpanExporter())
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# Cache counters roll up into spans that other threads may be updating too
+_cache_counts_lock = threading.Lock()
+
+
+def add_exporter(exporter) -> None:
+    """Send finished spans to ``exporter`` (anything with ``export(span)``) as well"""
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+def remove_exporter(exporter) -> None:
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_span_attributes(attributes: Dict[str, Any]) -> None:
+    """Set attributes on the current span, if there is one"""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(attributes)
+
+
+def add_span_event(name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Add an event to the current span, if there is one"""
+    span = _current_span.get()
+    if span is not None:
+        span.add_event(name, attributes)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Record a cache lookup on the current span and count it on its enclosing spans"""
+    span = _current_span.get()
+    if span is None:
+        return
+    span.add_event("cache.lookup", {"cache": cache, "hit": hit})
+    key = "cache.hits" if hit else "cache.misses"
+    with _cache_counts_lock:
+        while span is not None:
+            span.attributes[key] = span.attributes.get(key, 0) + 1
+            span = span.parent
+
+
+def _export(span: Span) -> None:
+    for exporter in list(_exporters):
+        try:
+            exporter.export(span)
+        except Exception as e:
+            logger.error(f"Error exporting span {span.name}: {e}")
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+    """Run the block in a child of the current span (or a new trace); errors mark it ERROR"""
+    span = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+        _export(span)
+
+
+# Stages report their cache outcome even when nothing beneath them looked anything up
+STAGE_ATTRIBUTES = {"cache.hits": 0, "cache.misses": 0}
+
+
+def _mark_result(span: Span, result) -> None:
+    # Agent tools report failures as {"status": "error", "error_message": ...} rather than raising
+    if isinstance(result, dict) and result.get("status") == "error":
+        span.set_status(STATUS_ERROR, str(result.get("error_message", "")))
+    elif span.status_code == STATUS_UNSET:
+        span.set_status(STATUS_OK)
+
+
+def traced(name: str):
+    """Decorator running a sync or async function inside ``start_span(name)`` as a pipeline stage"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name, STAGE_ATTRIBUTES) as span:
+                    result = await func(*args, **kwargs)
+                    _mark_result(span, result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name, STAGE_ATTRIBUTES) as span:
+                result = func(*args, **kwargs)
+                _mark_result(span, result)
+                return result
+        return wrapper
+    return decorator
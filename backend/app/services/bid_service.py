@@ -1,94 +1,281 @@
 """
 BidService with PostgreSQL database operations.
 """
+import copy
 import logging
-from typing import List, Optional
+import os
+from typing import Callable, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, func, case, or_, select, update
 
-from ..database import get_db, DatabaseManager
+from ..database import get_db, DatabaseManager, reads_from_primary, route_reads_to_replicas
 from ..models.db_models import BidDB, ProductDB
 from ..models.agent_models import Bid
 from ..models.converters.converters import bid_db_to_pydantic, bid_pydantic_to_db
 from ..enums.enums import BidStatus
+from ..observability.metrics import track_cache
+from ..observability.tracing import record_cache_lookup
+from .cache import TTLCache
+from .product_cache import invalidate_product, notify_product_changed
 
 logger = logging.getLogger(__name__)
 
+# Bids that can still hold or regain the lead on their product, and the ones that currently count
+IN_PLAY_STATUSES = (BidStatus.ACTIVE.value, BidStatus.WINNING.value, BidStatus.OUTBID.value)
+LIVE_STATUSES = (BidStatus.ACTIVE.value, BidStatus.WINNING.value)
 
+# Short-lived per-user dashboard summaries, invalidated on that user's bid writes
+user_bid_summary_cache = TTLCache(
+    maxsize=int(os.getenv("BID_SUMMARY_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("BID_SUMMARY_CACHE_TTL", "5")),
+)
+track_cache("user_bid_summary", user_bid_summary_cache)
+
+
+def get_cached_bid_summary(user_id: str) -> Optional[dict]:
+    """Get a private copy of a user's cached bid summary, or None on a miss"""
+    cached = user_bid_summary_cache.get(user_id)
+    record_cache_lookup("user_bid_summary", cached is not None)
+    if cached is None:
+        return None
+    return copy.deepcopy(cached)
+
+
+@route_reads_to_replicas
 class BidService:
     """Handles bid database operations using PostgreSQL"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         self.db_manager = DatabaseManager()
+        self.session = session
+    
+    def _open_session(self) -> Session:
+        """Use the injected session if there is one, otherwise create a new one"""
+        if self.session is not None:
+            return self.session
+        return self.db_manager.create_session()
+    
+    def _close_session(self, session: Session):
+        """Close the session unless it is owned by the caller"""
+        if session is not self.session:
+            self.db_manager.close_session(session)
+    
+    def _lock_product(self, session: Session, product_id: int, values: Optional[dict] = None):
+        """
+        Lock the product row until commit (applying ``values`` to it, if any) so
+        bid writes on one product take turns, and return its (current_bid,
+        highest_bid_id), or None if the product does not exist.
+        """
+        if values:
+            return session.execute(
+                update(ProductDB).where(ProductDB.id == product_id).values(values).returning(
+                    ProductDB.current_bid, ProductDB.highest_bid_id
+                ).execution_options(synchronize_session=False)
+            ).first()
+        return session.execute(
+            select(ProductDB.current_bid, ProductDB.highest_bid_id).where(ProductDB.id == product_id).with_for_update()
+        ).first()
     
-    def create_bid(self, bid: Bid, product_id: int) -> Optional[BidDB]:
-        """Create a new bid in the database"""
-        session = self.db_manager.create_session()
+    def _settle_bids(self, session: Session, product_id: int, standing) -> List[str]:
+        """
+        Re-rank a product's bids inside the current write transaction, after
+        _lock_product: its highest in-play bid (the earliest on ties) is WINNING,
+        every other ACTIVE/WINNING bid is OUTBID, and current_bid/highest_bid_id
+        point to the winner (NULL when no bid is in play). ``standing`` is what
+        _lock_product returned; the product row is only rewritten if it changed.
+        Returns the users whose bids changed status.
+        """
+        top = session.execute(
+            select(BidDB.id, BidDB.amount).where(
+                BidDB.product_id == product_id,
+                BidDB.status.in_(IN_PLAY_STATUSES)
+            ).order_by(desc(BidDB.amount), BidDB.id).limit(1)
+        ).first()
+        
+        changed_users = []
+        if top is not None:
+            # Loaded bids (e.g. the one just created) pick up their new status
+            changed_users = session.execute(
+                update(BidDB).where(
+                    BidDB.product_id == product_id,
+                    or_(
+                        and_(BidDB.id == top.id, BidDB.status != BidStatus.WINNING.value),
+                        and_(BidDB.id != top.id, BidDB.status.in_(LIVE_STATUSES))
+                    )
+                ).values(
+                    status=case((BidDB.id == top.id, BidStatus.WINNING.value), else_=BidStatus.OUTBID.value)
+                ).returning(BidDB.user_id)
+            ).scalars().all()
+        
+        highest = (top.amount, top.id) if top is not None else (None, None)
+        if tuple(standing) != highest:
+            session.execute(
+                update(ProductDB).where(ProductDB.id == product_id).values(
+                    current_bid=highest[0], highest_bid_id=highest[1]
+                ).execution_options(synchronize_session=False)
+            )
+        return changed_users
+    
+    def _take_lead(self, session: Session, product_id: int, bid_db: BidDB) -> List[str]:
+        """
+        Make a just-inserted WINNING bid the product's standing bid: OUTBID the
+        other ACTIVE/WINNING bids and point current_bid/highest_bid_id at it.
+        Returns the users whose bids changed status.
+        """
+        changed_users = session.execute(
+            update(BidDB).where(
+                BidDB.product_id == product_id,
+                BidDB.id != bid_db.id,
+                BidDB.status.in_(LIVE_STATUSES)
+            ).values(status=BidStatus.OUTBID.value).returning(BidDB.user_id)
+        ).scalars().all()
+        session.execute(
+            update(ProductDB).where(ProductDB.id == product_id).values(
+                current_bid=bid_db.amount, highest_bid_id=bid_db.id
+            ).execution_options(synchronize_session=False)
+        )
+        return changed_users
+    
+    def create_bid(
+        self,
+        bid: Bid,
+        product_id: int,
+        before_commit: Optional[Callable[[Session, BidDB], None]] = None
+    ) -> Optional[BidDB]:
+        """
+        Create a new bid and re-rank the product's bids in the same transaction.
+        ``before_commit(session, bid_db)`` runs last inside that transaction, so
+        whatever it writes (e.g. the idempotent response) commits with the bid.
+        """
+        session = self._open_session()
         try:
-            # Verify product exists
-            product = session.query(ProductDB).filter(ProductDB.id == product_id).first()
-            if not product:
+            # Keep the product's bid statistics in the same transaction; a missing
+            # row doubles as the product existence check
+            standing = self._lock_product(session, product_id, {
+                ProductDB.bid_count: ProductDB.bid_count + 1,
+                ProductDB.last_bid_at: bid.timestamp or func.now()
+            })
+            if standing is None:
+                self.db_manager.rollback_session(session)
                 logger.error(f"Product {product_id} not found for bid creation")
                 return None
             
             bid_db = bid_pydantic_to_db(bid, product_id)
-            session.add(bid_db)
+            changed_users = []
+            if bid_db.status in IN_PLAY_STATUSES:
+                # The other bids are already ranked, so the new one only has to beat
+                # the standing bid; on a tie the earlier bid keeps the lead
+                takes_lead = standing.current_bid is None or bid_db.amount > standing.current_bid
+                bid_db.status = (BidStatus.WINNING if takes_lead else BidStatus.OUTBID).value
+                session.add(bid_db)
+                session.flush()
+                if takes_lead:
+                    changed_users = self._take_lead(session, product_id, bid_db)
+            else:
+                session.add(bid_db)
+                session.flush()
+            if before_commit is not None:
+                before_commit(session, bid_db)
+            
+            notify_product_changed(session, product_id)
             self.db_manager.commit_session(session)
-            session.refresh(bid_db)
-            logger.info(f"Created bid: {bid_db.id} for product {product_id}")
+            invalidate_product(product_id)
+            if session.expire_on_commit:
+                # Async sessions keep the flushed state; only an expired bid needs reloading
+                session.refresh(bid_db)
+            for user_id in {bid_db.user_id, *changed_users}:
+                user_bid_summary_cache.invalidate(user_id)
+            logger.info(f"Created bid: {bid_db.id} for product {product_id} ({bid_db.status})")
             return bid_db
         except Exception as e:
             self.db_manager.rollback_session(session)
             logger.error(f"Error creating bid: {e}")
             raise
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def get_bid_by_id(self, bid_id: int) -> Optional[BidDB]:
         """Get a bid by its database ID"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bid = session.query(BidDB).filter(BidDB.id == bid_id).first()
             return bid
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting bid by ID {bid_id}: {e}")
             return None
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     
     def get_bids_by_product(self, product_id: int, limit: int = 100) -> List[BidDB]:
         """Get all bids for a specific product"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bids = session.query(BidDB).filter(
                 BidDB.product_id == product_id
             ).order_by(desc(BidDB.amount)).limit(limit).all()
             return bids
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting bids for product {product_id}: {e}")
             return []
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def get_bids_by_user(self, user_id: str, limit: int = 100) -> List[BidDB]:
         """Get all bids for a specific user"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bids = session.query(BidDB).filter(
                 BidDB.user_id == user_id
             ).order_by(desc(BidDB.timestamp)).limit(limit).all()
             return bids
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting bids for user {user_id}: {e}")
             return []
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
+    
+    def _bids_version(self, session: Session, condition) -> Tuple[Optional[datetime], str]:
+        """Version of a set of bids from one aggregate: count, newest id and latest change"""
+        count, max_id, last_modified = session.query(
+            func.count(BidDB.id),
+            func.max(BidDB.id),
+            func.max(func.coalesce(BidDB.updated_at, BidDB.created_at))
+        ).filter(condition).one()
+        return last_modified, f"{count}:{max_id}:{last_modified}"
+    
+    def get_product_bids_version(self, product_id: int) -> Optional[Tuple[Optional[datetime], str]]:
+        """Get the version of a product's bids without loading them"""
+        session = self._open_session()
+        try:
+            return self._bids_version(session, BidDB.product_id == product_id)
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error getting bids version for product {product_id}: {e}")
+            return None
+        finally:
+            self._close_session(session)
+    
+    def get_user_bids_version(self, user_id: str) -> Optional[Tuple[Optional[datetime], str]]:
+        """Get the version of a user's bids without loading them"""
+        session = self._open_session()
+        try:
+            return self._bids_version(session, BidDB.user_id == user_id)
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error getting bids version for user {user_id}: {e}")
+            return None
+        finally:
+            self._close_session(session)
     
     def get_highest_bid_for_product(self, product_id: int) -> Optional[BidDB]:
         """Get the highest bid for a specific product"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bid = session.query(BidDB).filter(
                 and_(
@@ -98,14 +285,15 @@ class BidService:
             ).order_by(desc(BidDB.amount)).first()
             return bid
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting highest bid for product {product_id}: {e}")
             return None
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def get_active_bids_by_user(self, user_id: str) -> List[BidDB]:
         """Get all active bids for a user"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bids = session.query(BidDB).filter(
                 and_(
@@ -118,23 +306,35 @@ class BidService:
             ).order_by(desc(BidDB.timestamp)).all()
             return bids
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting active bids for user {user_id}: {e}")
             return []
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def update_bid_status(self, bid_id: int, status: BidStatus) -> Optional[BidDB]:
-        """Update the status of a bid"""
-        session = self.db_manager.create_session()
+        """
+        Update the status of a bid. The product's in-play bids are re-ranked in the
+        same transaction, so an in-play status on a bid follows from its amount;
+        this is for moving bids out of play (WON/LOST).
+        """
+        session = self._open_session()
         try:
             bid = session.query(BidDB).filter(BidDB.id == bid_id).first()
             if not bid:
                 return None
             
+            standing = self._lock_product(session, bid.product_id)
             bid.status = status.value
+            session.flush()
+            changed_users = self._settle_bids(session, bid.product_id, standing)
+            notify_product_changed(session, bid.product_id)
             self.db_manager.commit_session(session)
+            invalidate_product(bid.product_id)
             session.refresh(bid)
-            logger.info(f"Updated bid {bid.id} status to {status.value}")
+            for user_id in {bid.user_id, *changed_users}:
+                user_bid_summary_cache.invalidate(user_id)
+            logger.info(f"Updated bid {bid.id} status to {bid.status}")
             return bid
             
         except Exception as e:
@@ -142,20 +342,28 @@ class BidService:
             logger.error(f"Error updating bid status {bid_id}: {e}")
             return None
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def update_bid_amount(self, bid_id: int, new_amount: float) -> Optional[BidDB]:
         """Update the amount of a bid (for auto-bidding scenarios)"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bid = session.query(BidDB).filter(BidDB.id == bid_id).first()
             if not bid:
                 return None
             
+            timestamp = datetime.now()
+            standing = self._lock_product(session, bid.product_id, {ProductDB.last_bid_at: timestamp})
             bid.amount = new_amount
-            bid.timestamp = datetime.now()
+            bid.timestamp = timestamp
+            session.flush()
+            changed_users = self._settle_bids(session, bid.product_id, standing)
+            notify_product_changed(session, bid.product_id)
             self.db_manager.commit_session(session)
+            invalidate_product(bid.product_id)
             session.refresh(bid)
+            for user_id in {bid.user_id, *changed_users}:
+                user_bid_summary_cache.invalidate(user_id)
             logger.info(f"Updated bid {bid.id} amount to {new_amount}")
             return bid
             
@@ -164,18 +372,28 @@ class BidService:
             logger.error(f"Error updating bid amount {bid_id}: {e}")
             return None
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def delete_bid(self, bid_id: int) -> bool:
         """Delete a bid by ID"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bid = session.query(BidDB).filter(BidDB.id == bid_id).first()
             if not bid:
                 return False
             
+            standing = self._lock_product(session, bid.product_id, {
+                ProductDB.bid_count: case((ProductDB.bid_count > 0, ProductDB.bid_count - 1), else_=0)
+            })
             session.delete(bid)
+            session.flush()
+            # Deleting the winner hands the lead to the next highest bid
+            changed_users = self._settle_bids(session, bid.product_id, standing)
+            notify_product_changed(session, bid.product_id)
             self.db_manager.commit_session(session)
+            invalidate_product(bid.product_id)
+            for user_id in {bid.user_id, *changed_users}:
+                user_bid_summary_cache.invalidate(user_id)
             logger.info(f"Deleted bid: {bid.id}")
             return True
             
@@ -184,49 +402,52 @@ class BidService:
             logger.error(f"Error deleting bid {bid_id}: {e}")
             return False
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def get_bid_history_for_product(self, product_id: int) -> List[BidDB]:
         """Get complete bid history for a product ordered by timestamp"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bids = session.query(BidDB).filter(
                 BidDB.product_id == product_id
             ).order_by(desc(BidDB.timestamp)).all()
             return bids
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting bid history for product {product_id}: {e}")
             return []
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def count_bids_for_product(self, product_id: int) -> int:
         """Count total number of bids for a product"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             count = session.query(BidDB).filter(BidDB.product_id == product_id).count()
             return count
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error counting bids for product {product_id}: {e}")
             return 0
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def count_bids_by_user(self, user_id: str) -> int:
         """Count total number of bids by a user"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             count = session.query(BidDB).filter(BidDB.user_id == user_id).count()
             return count
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error counting bids for user {user_id}: {e}")
             return 0
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def get_auto_bids_by_user(self, user_id: str) -> List[BidDB]:
         """Get all auto bids for a user"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             bids = session.query(BidDB).filter(
                 and_(
@@ -236,50 +457,189 @@ class BidService:
             ).order_by(desc(BidDB.timestamp)).all()
             return bids
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting auto bids for user {user_id}: {e}")
             return []
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
 
-    def get_bid_as_pydantic(self, bid_id: int) -> Optional[Bid]:
-        """Get a bid as a Pydantic model"""
-        bid_db = self.get_bid_by_id(bid_id)
-        if bid_db:
-            return bid_db_to_pydantic(bid_db)
-        return None
-    
-    def process_outbid_updates(self, product_id: int, winning_bid_id: int):
-        """Update all other bids for a product to OUTBID status when there's a new winning bid"""
-        session = self.db_manager.create_session()
+    @reads_from_primary
+    def get_user_bid_summary(self, user_id: str, check_cache: bool = True) -> dict:
+        """
+        Get a user's bidding dashboard: status counts, exposure, auto-bid headroom
+        and active bids with their product title and current bid.
+        check_cache=False skips the cache for callers that have just missed it.
+        """
+        if check_cache:
+            cached = get_cached_bid_summary(user_id)
+            if cached is not None:
+                return cached
+        
+        # Taken before querying, so a bid write committed during the query keeps
+        # this (possibly stale) summary out of the cache
+        generation = user_bid_summary_cache.generation()
+        session = self._open_session()
         try:
-            # Update all other bids for this product to OUTBID
-            session.query(BidDB).filter(
-                and_(
-                    BidDB.product_id == product_id,
-                    BidDB.id != winning_bid_id,
-                    BidDB.status.in_([BidStatus.ACTIVE.value, BidStatus.WINNING.value])
-                )
-            ).update({BidDB.status: BidStatus.OUTBID.value})
-            
-            # Set the winning bid to WINNING status
-            session.query(BidDB).filter(BidDB.id == winning_bid_id).update(
-                {BidDB.status: BidStatus.WINNING.value}
+            live_statuses = [BidStatus.ACTIVE.value, BidStatus.WINNING.value]
+            headroom = case(
+                (
+                    and_(BidDB.is_auto_bid == True, BidDB.max_auto_bid > BidDB.amount),
+                    BidDB.max_auto_bid - BidDB.amount
+                ),
+                else_=0.0
             )
-
-            # Get the winning bid to update the product's current_bid
-            winning_bid = session.query(BidDB).filter(BidDB.id == winning_bid_id).first()
-            if winning_bid:
-                # Update the product's current_bid
-                session.query(ProductDB).filter(ProductDB.id == product_id).update(
-                    {ProductDB.current_bid: winning_bid.amount}
+            rows = session.query(
+                BidDB.status,
+                func.count(BidDB.id),
+                func.coalesce(func.sum(BidDB.amount), 0.0),
+                func.coalesce(func.sum(case((BidDB.is_auto_bid == True, 1), else_=0)), 0),
+                func.coalesce(func.sum(headroom), 0.0)
+            ).filter(BidDB.user_id == user_id).group_by(BidDB.status).all()
+            
+            status_counts = {status.value: 0 for status in BidStatus}
+            total_exposure = 0.0
+            auto_bid_count = 0
+            auto_bid_headroom = 0.0
+            for status, count, amount_sum, auto_count, headroom_sum in rows:
+                status_counts[status] = count
+                if status in live_statuses:
+                    total_exposure += amount_sum
+                    auto_bid_count += auto_count
+                    auto_bid_headroom += headroom_sum
+            
+            active_rows = session.query(
+                BidDB, ProductDB.title, ProductDB.current_bid
+            ).join(ProductDB, ProductDB.id == BidDB.product_id).filter(
+                and_(
+                    BidDB.user_id == user_id,
+                    BidDB.status.in_(live_statuses)
                 )
+            ).order_by(desc(BidDB.timestamp)).all()
             
-            self.db_manager.commit_session(session)
-            logger.info(f"Updated bid statuses and product current_bid for product {product_id}, winning bid: {winning_bid_id}")
+            active_bids = []
+            for bid, product_title, product_current_bid in active_rows:
+                bid_dict = bid_db_to_pydantic(bid).to_dict()
+                bid_dict["bid_id"] = bid.id
+                bid_dict["product_title"] = product_title
+                bid_dict["product_current_bid"] = product_current_bid
+                active_bids.append(bid_dict)
             
+            summary = {
+                "user_id": user_id,
+                "total_bids": sum(status_counts.values()),
+                "status_counts": status_counts,
+                "winning_count": status_counts[BidStatus.WINNING.value],
+                "outbid_count": status_counts[BidStatus.OUTBID.value],
+                "total_exposure": total_exposure,
+                "auto_bid_count": auto_bid_count,
+                "auto_bid_headroom": auto_bid_headroom,
+                "active_bids": active_bids
+            }
+            user_bid_summary_cache.set(user_id, copy.deepcopy(summary), generation=generation)
+            return summary
         except Exception as e:
             self.db_manager.rollback_session(session)
-            logger.error(f"Error processing outbid updates for product {product_id}: {e}")
+            logger.error(f"Error getting bid summary for user {user_id}: {e}")
             raise
         finally:
-            self.db_manager.close_session(session)
\ No newline at end of file
+            self._close_session(session)
+
+    def get_bid_as_pydantic(self, bid_id: int) -> Optional[Bid]:
+        """Get a bid as a Pydantic model"""
+        bid_db = self.get_bid_by_id(bid_id)
+        if bid_db:
+            return bid_db_to_pydantic(bid_db)
+        return None
+
+
+class AsyncBidService:
+    """
+    Non-blocking BidService for the API.
+    Runs the BidService queries on an AsyncSession (asyncpg) via run_sync,
+    so there is a single implementation of each query.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.session.run_sync(
+            lambda sync_session: getattr(BidService(sync_session), method)(*args, **kwargs)
+        )
+    
+    async def create_bid(
+        self,
+        bid: Bid,
+        product_id: int,
+        before_commit: Optional[Callable[[Session, BidDB], None]] = None
+    ) -> Optional[BidDB]:
+        """Create a new bid and re-rank the product's bids in the same transaction"""
+        return await self._run("create_bid", bid, product_id, before_commit)
+    
+    async def get_bid_by_id(self, bid_id: int) -> Optional[BidDB]:
+        """Get a bid by its database ID"""
+        return await self._run("get_bid_by_id", bid_id)
+    
+    async def get_bids_by_product(self, product_id: int, limit: int = 100) -> List[BidDB]:
+        """Get all bids for a specific product"""
+        return await self._run("get_bids_by_product", product_id, limit)
+    
+    async def get_bids_by_user(self, user_id: str, limit: int = 100) -> List[BidDB]:
+        """Get all bids for a specific user"""
+        return await self._run("get_bids_by_user", user_id, limit)
+    
+    async def get_product_bids_version(self, product_id: int) -> Optional[Tuple[Optional[datetime], str]]:
+        """Get the version of a product's bids without loading them"""
+        return await self._run("get_product_bids_version", product_id)
+    
+    async def get_user_bids_version(self, user_id: str) -> Optional[Tuple[Optional[datetime], str]]:
+        """Get the version of a user's bids without loading them"""
+        return await self._run("get_user_bids_version", user_id)
+    
+    async def get_highest_bid_for_product(self, product_id: int) -> Optional[BidDB]:
+        """Get the highest bid for a specific product"""
+        return await self._run("get_highest_bid_for_product", product_id)
+    
+    async def get_active_bids_by_user(self, user_id: str) -> List[BidDB]:
+        """Get all active bids for a user"""
+        return await self._run("get_active_bids_by_user", user_id)
+    
+    async def update_bid_status(self, bid_id: int, status: BidStatus) -> Optional[BidDB]:
+        """Update the status of a bid"""
+        return await self._run("update_bid_status", bid_id, status)
+    
+    async def update_bid_amount(self, bid_id: int, new_amount: float) -> Optional[BidDB]:
+        """Update the amount of a bid (for auto-bidding scenarios)"""
+        return await self._run("update_bid_amount", bid_id, new_amount)
+    
+    async def delete_bid(self, bid_id: int) -> bool:
+        """Delete a bid by ID"""
+        return await self._run("delete_bid", bid_id)
+    
+    async def get_bid_history_for_product(self, product_id: int) -> List[BidDB]:
+        """Get complete bid history for a product ordered by timestamp"""
+        return await self._run("get_bid_history_for_product", product_id)
+    
+    async def count_bids_for_product(self, product_id: int) -> int:
+        """Count total number of bids for a product"""
+        return await self._run("count_bids_for_product", product_id)
+    
+    async def count_bids_by_user(self, user_id: str) -> int:
+        """Count total number of bids by a user"""
+        return await self._run("count_bids_by_user", user_id)
+    
+    async def get_auto_bids_by_user(self, user_id: str) -> List[BidDB]:
+        """Get all auto bids for a user"""
+        return await self._run("get_auto_bids_by_user", user_id)
+    
+    async def get_user_bid_summary(self, user_id: str) -> dict:
+        """Get a user's bidding dashboard summary"""
+        cached = get_cached_bid_summary(user_id)
+        if cached is not None:
+            return cached
+        return await self._run("get_user_bid_summary", user_id, check_cache=False)
+    
+    async def get_bid_as_pydantic(self, bid_id: int) -> Optional[Bid]:
+        """Get a bid as a Pydantic model"""
+        return await self._run("get_bid_as_pydantic", bid_id)
+
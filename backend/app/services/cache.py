@@ -0,0 +1,91 @@
+"""
+In-process LRU cache with per-entry TTL used by the service layer.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Read-through callers take ``generation()`` before loading a value and pass it
+    to ``set()``; the value is then dropped if the key was invalidated while it
+    was being loaded, so a slow read cannot put back data a write just replaced.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Generation of the latest invalidation per key (bounded like the entries);
+        # anything older than _floor may have lost its record and counts as invalidated
+        self._clock = 0
+        self._floor = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        """Token to pass to ``set()`` for a value about to be loaded."""
+        with self._lock:
+            return self._clock
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None) -> bool:
+        """
+        Store ``value`` under ``key``, evicting the least recently used entry if full.
+        With ``generation``, skip the store (and return False) if ``key`` was
+        invalidated after that generation was taken.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and (
+                generation < self._floor or self._invalidated.get(key, -1) > generation
+            ):
+                return False
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop ``key`` from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._clock += 1
+            self._invalidated[key] = self._clock
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.maxsize:
+                _, dropped = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, dropped)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+            self._clock += 1
+            self._floor = self._clock
+            self._invalidated.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
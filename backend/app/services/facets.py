@@ -0,0 +1,153 @@
+"""
+In-memory facet counts for category, brand and condition.
+
+The index holds one product count per distinct (category, brand, condition)
+combination, so its size follows the number of combinations rather than the
+number of products, and counts under any filters are a pass over those groups
+instead of a scan of ``products``. It is built from one GROUP BY with COUNT(*),
+kept current by ProductService creates, updates and deletes, and rebuilt every
+FACET_REFRESH_SECONDS to pick up writes from other workers and bulk imports.
+Rebuilds aggregate in a worker thread and swap the finished counts in at once;
+a write racing a rebuild can leave its group off by one until the next one.
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..database import AsyncSessionLocal
+from ..models.db_models import ProductDB
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ("category", "brand", "condition")
+FACET_REFRESH_SECONDS = float(os.getenv("FACET_REFRESH_SECONDS", "300"))
+
+# (category, brand, condition) of a product
+FacetGroup = Tuple[Optional[str], ...]
+
+FACET_GROUPS_QUERY = select(
+    *(getattr(ProductDB, field) for field in FACET_FIELDS), func.count()
+).group_by(*(getattr(ProductDB, field) for field in FACET_FIELDS))
+
+
+def facet_group(product: ProductDB) -> FacetGroup:
+    """The facet values of a product, as counted by the index"""
+    return tuple(getattr(product, field) for field in FACET_FIELDS)
+
+
+def count_groups(rows: Iterable[tuple]) -> Dict[FacetGroup, int]:
+    """Group counts from (category, brand, condition, count) rows"""
+    counts = {}
+    for *group, count in rows:
+        group = tuple(group)
+        counts[group] = counts.get(group, 0) + count
+    return counts
+
+
+class FacetIndex:
+    """Thread-safe product counts per (category, brand, condition) group"""
+
+    def __init__(self):
+        self.built = False
+        self._counts: Dict[FacetGroup, int] = {}
+        self._lock = threading.Lock()
+
+    def swap(self, counts: Dict[FacetGroup, int]) -> None:
+        """Replace the whole index with freshly built counts"""
+        with self._lock:
+            self._counts = counts
+            self.built = True
+        logger.info(f"Built facet index over {sum(counts.values())} products in {len(counts)} groups")
+
+    def reset(self) -> None:
+        """Forget all counts; the index is rebuilt on the next read"""
+        with self._lock:
+            self._counts = {}
+            self.built = False
+
+    def rebuild(self, session: Session) -> None:
+        """Rebuild from one GROUP BY over the facet columns"""
+        self.swap(count_groups(session.execute(FACET_GROUPS_QUERY).all()))
+
+    def add(self, group: FacetGroup) -> None:
+        """Count a created product"""
+        with self._lock:
+            self._change(group, 1)
+
+    def update(self, old_group: FacetGroup, new_group: FacetGroup) -> None:
+        """Move an updated product between groups"""
+        if old_group == new_group:
+            return
+        with self._lock:
+            self._change(old_group, -1)
+            self._change(new_group, 1)
+
+    def remove(self, group: FacetGroup) -> None:
+        """Uncount a deleted product"""
+        with self._lock:
+            self._change(group, -1)
+
+    def _change(self, group: FacetGroup, delta: int) -> None:
+        count = self._counts.get(group, 0) + delta
+        if count > 0:
+            self._counts[group] = count
+        else:
+            # Also covers a delete the last rebuild already reflected
+            self._counts.pop(group, None)
+
+    def counts(self, filters: Optional[Dict[str, Optional[str]]] = None) -> dict:
+        """
+        Facet counts under the active filters. Each facet is counted with the
+        filters on the other facets only, so a selected category still shows
+        the counts of its sibling categories.
+        """
+        active = [
+            (i, filters[field]) for i, field in enumerate(FACET_FIELDS)
+            if filters and filters.get(field) is not None
+        ]
+        total = 0
+        by_field = [{} for _ in FACET_FIELDS]
+        with self._lock:
+            for group, count in self._counts.items():
+                mismatched = [i for i, value in active if group[i] != value]
+                if not mismatched:
+                    total += count
+                # A group counts towards a facet if it matches the filters on every other facet
+                if len(mismatched) > 1:
+                    continue
+                for i, value in enumerate(group):
+                    if value is not None and (not mismatched or mismatched[0] == i):
+                        by_field[i][value] = by_field[i].get(value, 0) + count
+
+        return {
+            "total": total,
+            "facets": {
+                field: dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+                for field, values in zip(FACET_FIELDS, by_field)
+            }
+        }
+
+
+facet_index = FacetIndex()
+
+
+async def refresh_facet_index() -> None:
+    """Rebuild the facet index on a fresh session, aggregating off the event loop"""
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(FACET_GROUPS_QUERY)).all()
+    facet_index.swap(await asyncio.to_thread(count_groups, rows))
+
+
+async def run_facet_refresher(interval: float = FACET_REFRESH_SECONDS) -> None:
+    """Build the index now and rebuild it every ``interval`` seconds until cancelled"""
+    while True:
+        try:
+            await refresh_facet_index()
+        except Exception as e:
+            logger.error(f"Error building facet index: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,306 @@
+"""
+IdempotencyService for replaying responses of retried write requests.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, null
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import DatabaseManager
+from ..models.db_models import IdempotencyKeyDB
+from ..observability.metrics import track_cache
+from ..observability.tracing import record_cache_lookup
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# How long a completed response is replayed for
+IDEMPOTENCY_KEY_TTL = float(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))
+# How long an in-flight reservation holds its key; should exceed the slowest request.
+# A request that dies without completing or releasing frees its key after this.
+IDEMPOTENCY_LEASE_SECONDS = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+
+# Completed responses by (user_id, key); in-flight reservations always live in the database
+idempotency_cache = TTLCache(
+    maxsize=int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000")),
+    ttl=IDEMPOTENCY_KEY_TTL,
+)
+track_cache("idempotency", idempotency_cache)
+
+# INSERT ... ON CONFLICT DO UPDATE, by dialect name
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class ReservationLostError(RuntimeError):
+    """Raised when a request's reservation ran out and another request took over its key"""
+
+
+def get_cached_response(user_id: str, key: str) -> Optional[dict]:
+    """Get a cached completed response, or None on a miss"""
+    cached = idempotency_cache.get((user_id, key))
+    record_cache_lookup("idempotency", cached is not None)
+    return cached
+
+
+def cache_response(user_id: str, key: str, request_hash: str, status_code: int, body: dict) -> None:
+    """Cache a response once the transaction that stored it has committed"""
+    idempotency_cache.set((user_id, key), {
+        "request_hash": request_hash,
+        "status_code": status_code,
+        "body": body
+    })
+
+
+class IdempotencyService:
+    """
+    Handles Idempotency-Key reservations and stored responses.
+    Keys are scoped per user, so clients can't collide with or replay each other's requests.
+    """
+
+    def __init__(self, session: Optional[Session] = None):
+        self.db_manager = DatabaseManager()
+        self.session = session
+
+    def _open_session(self) -> Session:
+        """Use the injected session if there is one, otherwise create a new one"""
+        if self.session is not None:
+            return self.session
+        return self.db_manager.create_session()
+
+    def _close_session(self, session: Session):
+        """Close the session unless it is owned by the caller"""
+        if session is not self.session:
+            self.db_manager.close_session(session)
+
+    @staticmethod
+    def hash_request(method: str, path: str, body: dict) -> str:
+        """Fingerprint a request so a key reused for a different request can be rejected"""
+        payload = json.dumps({"method": method, "path": path, "body": body}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_response(self, user_id: str, key: str, check_cache: bool = True) -> Optional[dict]:
+        """
+        Get the stored response for a completed request, or None.
+        check_cache=False skips the cache for callers that have just missed it.
+        """
+        if check_cache:
+            cached = get_cached_response(user_id, key)
+            if cached is not None:
+                return cached
+
+        session = self._open_session()
+        try:
+            record = session.query(IdempotencyKeyDB).filter(
+                IdempotencyKeyDB.user_id == user_id,
+                IdempotencyKeyDB.key == key,
+                IdempotencyKeyDB.status_code.isnot(None),
+                IdempotencyKeyDB.expires_at > datetime.now(timezone.utc)
+            ).first()
+            if not record:
+                return None
+
+            stored = {
+                "request_hash": record.request_hash,
+                "status_code": record.status_code,
+                "body": record.response_body
+            }
+            expires_at = record.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+            if remaining > 0:
+                idempotency_cache.set((user_id, key), stored, ttl=min(remaining, IDEMPOTENCY_KEY_TTL))
+            return stored
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error getting idempotency key {key} for user {user_id}: {e}")
+            return None
+        finally:
+            self._close_session(session)
+
+    def reserve(self, user_id: str, key: str, request_hash: str) -> bool:
+        """
+        Claim a key for an in-flight request for IDEMPOTENCY_LEASE_SECONDS.
+        Returns False if another request already holds an unexpired reservation.
+        """
+        session = self._open_session()
+        try:
+            now = datetime.now(timezone.utc)
+            values = {
+                "user_id": user_id,
+                "key": key,
+                "request_hash": request_hash,
+                "expires_at": now + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+            }
+            # An expired record (a replayable response past its TTL, or the lease of a
+            # request that crashed) no longer protects anything; take over the key
+            upsert = UPSERTS.get(session.get_bind().dialect.name)
+            if upsert is not None:
+                # One statement: insert, or overwrite the record only if it has expired
+                statement = upsert(IdempotencyKeyDB).values(**values)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[IdempotencyKeyDB.user_id, IdempotencyKeyDB.key],
+                    set_={
+                        "request_hash": statement.excluded.request_hash,
+                        "status_code": null(),
+                        "response_body": null(),
+                        "created_at": func.now(),
+                        "expires_at": statement.excluded.expires_at
+                    },
+                    where=IdempotencyKeyDB.expires_at <= now
+                )
+                claimed = session.execute(statement.returning(IdempotencyKeyDB.id)).first() is not None
+            else:
+                session.query(IdempotencyKeyDB).filter(
+                    IdempotencyKeyDB.user_id == user_id,
+                    IdempotencyKeyDB.key == key,
+                    IdempotencyKeyDB.expires_at <= now
+                ).delete(synchronize_session=False)
+                session.add(IdempotencyKeyDB(**values))
+                claimed = True
+            self.db_manager.commit_session(session)
+            return claimed
+        except IntegrityError:
+            return False
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error reserving idempotency key {key} for user {user_id}: {e}")
+            raise
+        finally:
+            self._close_session(session)
+
+    def _store_response(self, session: Session, user_id: str, key: str, status_code: int, body: dict) -> bool:
+        stored = session.query(IdempotencyKeyDB).filter(
+            IdempotencyKeyDB.user_id == user_id,
+            IdempotencyKeyDB.key == key,
+            IdempotencyKeyDB.status_code.is_(None)
+        ).update(
+            {
+                IdempotencyKeyDB.status_code: status_code,
+                IdempotencyKeyDB.response_body: body,
+                IdempotencyKeyDB.expires_at: datetime.now(timezone.utc) + timedelta(seconds=IDEMPOTENCY_KEY_TTL)
+            },
+            synchronize_session=False
+        )
+        return bool(stored)
+
+    def store_response(self, user_id: str, key: str, status_code: int, body: dict) -> None:
+        """
+        Write the response onto the reservation inside the caller's open
+        transaction, so it commits together with the request's own writes and a
+        crash can't leave one without the other. Call cache_response() after the
+        commit. Raises ReservationLostError if another request took over the key.
+        """
+        if not self._store_response(self.session, user_id, key, status_code, body):
+            raise ReservationLostError(f"Reservation for idempotency key {key} for user {user_id} was lost")
+
+    def complete(self, user_id: str, key: str, request_hash: str, status_code: int, body: dict) -> bool:
+        """
+        Store the response of a successful request in its own transaction so
+        retries can replay it for IDEMPOTENCY_KEY_TTL. If it can't be stored, the
+        reservation is released rather than left to block retries; returns
+        whether the response was stored.
+        """
+        session = self._open_session()
+        try:
+            stored = self._store_response(session, user_id, key, status_code, body)
+            self.db_manager.commit_session(session)
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error storing response for idempotency key {key} for user {user_id}: {e}")
+            self.release(user_id, key)
+            return False
+        finally:
+            self._close_session(session)
+
+        if not stored:
+            # The lease ran out and another request took over the key
+            logger.warning(f"Reservation for idempotency key {key} for user {user_id} was lost before completing")
+            return False
+        cache_response(user_id, key, request_hash, status_code, body)
+        return True
+
+    def release(self, user_id: str, key: str) -> None:
+        """Drop an in-flight reservation after a failed request so it can be retried"""
+        session = self._open_session()
+        try:
+            session.query(IdempotencyKeyDB).filter(
+                IdempotencyKeyDB.user_id == user_id,
+                IdempotencyKeyDB.key == key,
+                IdempotencyKeyDB.status_code.is_(None)
+            ).delete(synchronize_session=False)
+            self.db_manager.commit_session(session)
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            # The lease still frees the key once it runs out
+            logger.error(f"Error releasing idempotency key {key} for user {user_id}: {e}")
+        finally:
+            self._close_session(session)
+
+    def purge_expired(self) -> int:
+        """Delete expired keys, returning how many were removed"""
+        session = self._open_session()
+        try:
+            deleted = session.query(IdempotencyKeyDB).filter(
+                IdempotencyKeyDB.expires_at <= datetime.now(timezone.utc)
+            ).delete(synchronize_session=False)
+            self.db_manager.commit_session(session)
+            logger.info(f"Purged {deleted} expired idempotency keys")
+            return deleted
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error purging idempotency keys: {e}")
+            return 0
+        finally:
+            self._close_session(session)
+
+
+class AsyncIdempotencyService:
+    """
+    Non-blocking IdempotencyService for the API, running on an AsyncSession via run_sync.
+    """
+
+    hash_request = staticmethod(IdempotencyService.hash_request)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.session.run_sync(
+            lambda sync_session: getattr(IdempotencyService(sync_session), method)(*args, **kwargs)
+        )
+
+    async def get_response(self, user_id: str, key: str, check_cache: bool = True) -> Optional[dict]:
+        """
+        Get the stored response for a completed request, or None.
+        check_cache=False skips the cache for callers that have just missed it.
+        """
+        if check_cache:
+            cached = get_cached_response(user_id, key)
+            if cached is not None:
+                return cached
+        return await self._run("get_response", user_id, key, check_cache=False)
+
+    async def reserve(self, user_id: str, key: str, request_hash: str) -> bool:
+        """Claim a key for an in-flight request"""
+        return await self._run("reserve", user_id, key, request_hash)
+
+    async def complete(self, user_id: str, key: str, request_hash: str, status_code: int, body: dict) -> bool:
+        """Store the response of a successful request so retries can replay it"""
+        return await self._run("complete", user_id, key, request_hash, status_code, body)
+
+    async def release(self, user_id: str, key: str) -> None:
+        """Drop an in-flight reservation after a failed request so it can be retried"""
+        return await self._run("release", user_id, key)
+
+    async def purge_expired(self) -> int:
+        """Delete expired keys, returning how many were removed"""
+        return await self._run("purge_expired")
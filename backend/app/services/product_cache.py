@@ -0,0 +1,122 @@
+"""
+Read-through product cache with precise invalidation.
+
+Products are cached per worker as detached ProductDB snapshots. Every write that
+touches a product row invalidates its entry after commit. With
+PRODUCT_CACHE_NOTIFY enabled on Postgres, writers also pg_notify the product id
+inside their transaction, and each worker LISTENs for the notifications so its
+own cache drops entries changed by other workers.
+"""
+import logging
+import os
+from typing import Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from ..database import ASYNC_DATABASE_URL, env_flag
+from ..models.db_models import ProductDB
+from ..observability.metrics import track_cache
+from ..observability.tracing import record_cache_lookup
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+product_cache = TTLCache(
+    maxsize=int(os.getenv("PRODUCT_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("PRODUCT_CACHE_TTL", "30")),
+)
+track_cache("product", product_cache)
+
+PRODUCT_CACHE_NOTIFY = env_flag("PRODUCT_CACHE_NOTIFY")
+NOTIFY_CHANNEL = "product_cache_invalidation"
+
+_PRODUCT_COLUMNS = [column.key for column in ProductDB.__table__.columns]
+
+
+def _snapshot(product: ProductDB) -> ProductDB:
+    """Copy the column values into a new, session-less ProductDB"""
+    values = {key: getattr(product, key) for key in _PRODUCT_COLUMNS}
+    if values.get("tags") is not None:
+        values["tags"] = list(values["tags"])
+    return ProductDB(**values)
+
+
+def get_cached_product(product_id: int) -> Optional[ProductDB]:
+    """Get a detached copy of a cached product, or None on a miss"""
+    cached = product_cache.get(product_id)
+    record_cache_lookup("product", cached is not None)
+    if cached is None:
+        return None
+    return _snapshot(cached)
+
+
+def cache_product(product: ProductDB, generation: int) -> bool:
+    """
+    Store a snapshot of a product loaded after taking ``product_cache.generation()``.
+    Skipped (returning False) if the product was invalidated since, so a read
+    racing a write can't cache the row the write replaced.
+    """
+    return product_cache.set(product.id, _snapshot(product), generation=generation)
+
+
+def invalidate_product(product_id: int) -> None:
+    """Drop a product from this worker's cache; call after the write has committed"""
+    product_cache.invalidate(product_id)
+
+
+def notify_product_changed(session: Session, product_id: int) -> None:
+    """
+    Tell other workers to drop the product once the current transaction commits.
+    No-op unless PRODUCT_CACHE_NOTIFY is enabled on Postgres.
+    """
+    if not PRODUCT_CACHE_NOTIFY or session.get_bind().dialect.name != "postgresql":
+        return
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": NOTIFY_CHANNEL, "payload": str(product_id)}
+    )
+
+
+class ProductCacheListener:
+    """LISTENs for product invalidations from other workers on a dedicated asyncpg connection"""
+
+    def __init__(self, database_url: str = ASYNC_DATABASE_URL):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.connection = None
+
+    def _on_notification(self, connection, pid, channel, payload):
+        try:
+            invalidate_product(int(payload))
+        except ValueError:
+            logger.warning(f"Ignoring malformed product cache invalidation: {payload!r}")
+
+    async def start(self):
+        self.connection = await asyncpg.connect(self.dsn)
+        await self.connection.add_listener(NOTIFY_CHANNEL, self._on_notification)
+        logger.info(f"Listening for product cache invalidations on '{NOTIFY_CHANNEL}'")
+
+    async def stop(self):
+        if self.connection is not None:
+            try:
+                await self.connection.remove_listener(NOTIFY_CHANNEL, self._on_notification)
+                await self.connection.close()
+            except Exception as e:
+                logger.error(f"Error stopping product cache listener: {e}")
+            self.connection = None
+
+
+async def start_product_cache_listener() -> Optional[ProductCacheListener]:
+    """Start the cross-worker invalidation listener if enabled and on Postgres"""
+    if not PRODUCT_CACHE_NOTIFY or not ASYNC_DATABASE_URL.startswith("postgresql"):
+        return None
+    listener = ProductCacheListener()
+    try:
+        await listener.start()
+        return listener
+    except Exception as e:
+        # Entries still expire by TTL without the listener
+        logger.error(f"Failed to start product cache listener: {e}")
+        return None
@@ -0,0 +1,260 @@
+"""
+Bulk product import from NDJSON or CSV.
+
+Rows are parsed and validated against ProductCreateRequest in chunks and each
+chunk is loaded in one round trip: Postgres COPY (asyncpg
+copy_records_to_table) or an executemany INSERT on other databases. Invalid
+rows are reported with their line number and skipped; a chunk the database
+rejects is retried row by row so only the offending rows fail.
+
+CSV files need a header row naming ProductCreateRequest fields. Empty cells
+use the field default and ``tags`` is either a JSON array or ``|`` separated.
+
+Usage:
+    uv run python -m app.services.product_import products.ndjson
+    uv run python -m app.services.product_import products.csv --chunk-size 10000
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import time
+from typing import IO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..enums.enums import ImportFormat
+from ..models.db_models import ProductDB
+from ..models.request_models import ProductCreateRequest
+from .facets import facet_index, refresh_facet_index
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = int(os.getenv("PRODUCT_IMPORT_CHUNK_SIZE", "5000"))
+# Errors listed in a report; the failed count always covers every row
+IMPORT_MAX_ERRORS = int(os.getenv("PRODUCT_IMPORT_MAX_ERRORS", "1000"))
+
+IMPORT_COLUMNS = tuple(ProductCreateRequest.model_fields)
+
+# (line number, validated row or None, error or None)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """One-line summary of a Pydantic validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()
+    )
+
+
+def _validate(line_no: int, record) -> ParsedRow:
+    if not isinstance(record, dict):
+        return line_no, None, "row must be an object"
+    try:
+        return line_no, ProductCreateRequest(**record).model_dump(), None
+    except ValidationError as e:
+        return line_no, None, format_validation_error(e)
+
+
+def _csv_record(row: dict) -> dict:
+    record = {key: value for key, value in row.items() if key and value not in (None, "")}
+    tags = record.get("tags")
+    if tags is not None:
+        if tags.lstrip().startswith("["):
+            try:
+                record["tags"] = json.loads(tags)
+            except json.JSONDecodeError:
+                pass  # Left as a string so validation reports it
+        else:
+            record["tags"] = [tag.strip() for tag in tags.split("|") if tag.strip()]
+    return record
+
+
+def iter_rows(stream: IO[str], fmt: ImportFormat) -> Iterator[ParsedRow]:
+    """Parse and validate rows of a text stream one at a time"""
+    if fmt == ImportFormat.NDJSON:
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"invalid JSON: {e.msg}"
+                continue
+            yield _validate(line_no, record)
+    else:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, "row has more cells than the header"
+                continue
+            yield _validate(reader.line_num, _csv_record(row))
+
+
+def iter_chunks(rows: Iterator[ParsedRow], chunk_size: int) -> Iterator[List[ParsedRow]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ProductImportService:
+    """
+    Loads validated product rows in bulk.
+    Natively async (rather than run_sync) so Postgres loads can use asyncpg's COPY.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _copy(self, rows: List[dict]) -> None:
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            ProductDB.__tablename__,
+            columns=IMPORT_COLUMNS,
+            records=[
+                tuple(json.dumps(row[c]) if c == "tags" else row[c] for c in IMPORT_COLUMNS)
+                for row in rows
+            ]
+        )
+
+    async def _load(self, rows: List[dict]) -> None:
+        if self.session.get_bind().dialect.name == "postgresql":
+            await self._copy(rows)
+        else:
+            await self.session.execute(insert(ProductDB), rows)
+        await self.session.commit()
+
+    async def load_chunk(self, chunk: List[ParsedRow], report: dict) -> None:
+        """Load the valid rows of a chunk, recording invalid and rejected rows in the report"""
+        valid = []
+        for line_no, row, error in chunk:
+            if error:
+                self._record_error(report, line_no, error)
+            else:
+                valid.append((line_no, row))
+        if not valid:
+            return
+
+        try:
+            await self._load([row for _, row in valid])
+            report["imported"] += len(valid)
+            return
+        except Exception as e:
+            await self.session.rollback()
+            logger.warning(f"Product import chunk rejected, retrying row by row: {e}")
+
+        for line_no, row in valid:
+            try:
+                await self.session.execute(insert(ProductDB), [row])
+                await self.session.commit()
+                report["imported"] += 1
+            except Exception as e:
+                await self.session.rollback()
+                self._record_error(report, line_no, str(getattr(e, "orig", e)))
+
+    @staticmethod
+    def _record_error(report: dict, line_no: int, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line_no, "error": error})
+        else:
+            report["errors_truncated"] = True
+
+    async def import_stream(
+        self,
+        stream: IO[str],
+        fmt: ImportFormat,
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> dict:
+        """
+        Import every row of a text stream. Parsing and validation run in a worker
+        thread so the event loop keeps serving while the next chunk is prepared.
+        """
+        report = {
+            "format": fmt.value,
+            "imported": 0,
+            "failed": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+        started = time.perf_counter()
+        chunks = iter_chunks(iter_rows(stream, fmt), chunk_size)
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            await self.load_chunk(chunk, report)
+
+        if report["imported"] and facet_index.built:
+            # Bulk loads bypass ProductService, so recount this worker's facets
+            await refresh_facet_index()
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["imported"] / elapsed, 1) if elapsed else 0.0
+        logger.info(f"Imported {report['imported']} products ({report['failed']} failed) in {elapsed:.1f}s")
+        return report
+
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> ImportFormat:
+    """Explicit format, otherwise from the file extension (.csv, else NDJSON)"""
+    if fmt:
+        return ImportFormat(fmt)
+    if filename and filename.lower().endswith(".csv"):
+        return ImportFormat.CSV
+    return ImportFormat.NDJSON
+
+
+def open_text(binary: IO[bytes]) -> IO[str]:
+    """Text view of a binary upload; newline='' keeps quoted CSV newlines intact"""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+async def import_file(path: str, fmt: Optional[str] = None, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    with open(path, "rb") as binary:
+        async with AsyncSessionLocal() as session:
+            return await ProductImportService(session).import_stream(
+                open_text(binary), detect_format(path, fmt), chunk_size
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk import products from NDJSON or CSV")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], default=None,
+                        help="File format (default: from the extension, NDJSON unless .csv)")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per COPY/INSERT")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the full report to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(import_file(args.path, args.format, args.chunk_size))
+    print(f"Imported {report['imported']} products, {report['failed']} failed "
+          f"in {report['elapsed_seconds']}s ({report['rows_per_second']} rows/s)")
+    for error in report["errors"][:20]:
+        print(f"  line {error['line']}: {error['error']}")
+    if report["failed"] > 20:
+        print(f"  ... {report['failed'] - 20} more")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,107 @@
 """
 ProductService with PostgreSQL database operations.
 """
+import base64
+import html
+import json
 import logging
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import or_, and_, cast, desc, exists, func, literal, literal_column, select, true, tuple_
 
-from ..database import get_db, DatabaseManager
-from ..models.db_models import ProductDB
+from ..database import get_db, DatabaseManager, reads_from_primary, route_reads_to_replicas
+from ..models.db_models import BidDB, ProductDB
 from ..models.agent_models import Product
+from ..models.request_models import ProductFilters
 from ..models.converters.converters import product_db_to_pydantic, product_pydantic_to_db
+from ..models.converters.serializers import product_columns
+from ..enums.enums import PriceField, ProductSort
+from .text_search import rank_documents, HIGHLIGHT_START, HIGHLIGHT_STOP
+from .product_cache import cache_product, get_cached_product, invalidate_product, notify_product_changed, product_cache
+from .facets import facet_group, facet_index
 
 logger = logging.getLogger(__name__)
 
 
+# ts_headline options producing the same <b>...</b> markup as the Python fallback
+HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+# What html.escape() replaces, ampersand first
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+# Minimum pg_trgm word_similarity for the typo-tolerant fallback
+TRIGRAM_THRESHOLD = 0.3
+
+
+def encode_cursor(sort: ProductSort, key, last_id: int) -> str:
+    """Encode the sort key and id of the last row of a page as an opaque cursor"""
+    payload = json.dumps({"s": sort.value, "k": key, "i": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: ProductSort) -> Tuple[object, int]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if invalid for this sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["s"] != sort.value:
+            raise ValueError("cursor was issued for a different sort order")
+        return payload["k"], int(payload["i"])
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def sql_html_escape(text):
+    """
+    html.escape() in SQL. ts_headline runs on the escaped text, so its <b>
+    markers are the only markup in a headline; the Postgres parser reads the
+    entities as entity tokens, not words, so matching is unaffected.
+    """
+    for char, entity in HTML_ESCAPES:
+        text = func.replace(text, char, entity)
+    return text
+
+
+def product_version(product) -> Tuple[Optional[datetime], str]:
+    """
+    Row version of a product (a ProductDB or a row with the same columns) as
+    (last modified time, opaque version string). The bid statistics are part of
+    the version so two bids within the timestamp resolution still differ.
+    """
+    last_modified = product.updated_at or product.created_at
+    version = f"{product.id}:{last_modified}:{product.bid_count}:{product.current_bid}:{product.highest_bid_id}"
+    return last_modified, version
+
+
+@route_reads_to_replicas
 class ProductService:
     """Handles product database operations using PostgreSQL"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         self.db_manager = DatabaseManager()
+        self.session = session
+    
+    def _open_session(self) -> Session:
+        """Use the injected session if there is one, otherwise create a new one"""
+        if self.session is not None:
+            return self.session
+        return self.db_manager.create_session()
+    
+    def _close_session(self, session: Session):
+        """Close the session unless it is owned by the caller"""
+        if session is not self.session:
+            self.db_manager.close_session(session)
     
     def create_product(self, product: Product) -> ProductDB:
         """Create a new product in the database"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             product_db = product_pydantic_to_db(product)
             session.add(product_db)
             self.db_manager.commit_session(session)
             session.refresh(product_db)
+            facet_index.add(facet_group(product_db))
             logger.info(f"Created product: {product_db.title}")
             return product_db
         except Exception as e:
@@ -35,39 +109,407 @@ class ProductService:
             logger.error(f"Error creating product: {e}")
             raise
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
-    def get_product_by_id(self, product_id: int) -> Optional[ProductDB]:
-        """Get a product by its database ID"""
-        session = self.db_manager.create_session()
+    @reads_from_primary
+    def get_product_by_id(self, product_id: int, check_cache: bool = True) -> Optional[ProductDB]:
+        """
+        Get a product by its database ID (read-through cached).
+        check_cache=False skips the cache for callers that have just missed it.
+        """
+        if check_cache:
+            cached = get_cached_product(product_id)
+            if cached is not None:
+                return cached
+        
+        # Taken before querying, so a write committed during the query keeps this row out of the cache
+        generation = product_cache.generation()
+        session = self._open_session()
         try:
             product = session.query(ProductDB).filter(ProductDB.id == product_id).first()
+            if product:
+                cache_product(product, generation)
             return product
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting product by ID {product_id}: {e}")
             return None
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
+    
+    @reads_from_primary
+    def get_products_by_ids(self, product_ids: Iterable[int], check_cache: bool = True) -> Dict[int, ProductDB]:
+        """
+        Get many products by id, from the cache where possible and one IN query
+        for the rest. Returns {id: product} for the ids that exist.
+        check_cache=False queries every id, for callers that have just missed the cache.
+        """
+        products = {}
+        misses = []
+        for product_id in dict.fromkeys(product_ids):
+            cached = get_cached_product(product_id) if check_cache else None
+            if cached is not None:
+                products[product_id] = cached
+            else:
+                misses.append(product_id)
+        if not misses:
+            return products
+        
+        generation = product_cache.generation()
+        session = self._open_session()
+        try:
+            for product in session.query(ProductDB).filter(ProductDB.id.in_(misses)).all():
+                cache_product(product, generation)
+                products[product.id] = product
+            return products
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error getting products by IDs: {e}")
+            raise
+        finally:
+            self._close_session(session)
+    
+    @reads_from_primary
+    def get_product_detail(
+        self, product_id: int, bid_limit: int = 10
+    ) -> Optional[Tuple[ProductDB, List[BidDB], Optional[BidDB]]]:
+        """
+        Get a product with its top ``bid_limit`` bids by amount and its highest
+        bid (the one highest_bid_id points to) in one round trip: only the bids
+        query when the product is cached, otherwise one LEFT JOIN of the product
+        row with the top bids. The highest bid costs a second query only when it
+        isn't among the top bids (higher bids were closed). Returns None if the
+        product does not exist.
+        """
+        top_bids = select(BidDB).where(BidDB.product_id == product_id).order_by(
+            desc(BidDB.amount), BidDB.id
+        ).limit(bid_limit)
+        cached = get_cached_product(product_id)
+        generation = product_cache.generation()
+        
+        session = self._open_session()
+        try:
+            if cached is not None:
+                product, bids = cached, list(session.scalars(top_bids).all())
+            else:
+                bid = aliased(BidDB, top_bids.subquery())
+                rows = session.query(ProductDB, bid).outerjoin(bid, true()).filter(
+                    ProductDB.id == product_id
+                ).order_by(desc(bid.amount), bid.id).all()
+                if not rows:
+                    return None
+                product = rows[0][0]
+                cache_product(product, generation)
+                bids = [row[1] for row in rows if row[1] is not None]
+            
+            highest_bid = None
+            if product.highest_bid_id is not None:
+                highest_bid = next((b for b in bids if b.id == product.highest_bid_id), None)
+                if highest_bid is None:
+                    highest_bid = session.get(BidDB, product.highest_bid_id)
+            return product, bids, highest_bid
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error getting detail for product {product_id}: {e}")
+            raise
+        finally:
+            self._close_session(session)
+    
+    def get_facets(self, filters: Optional[ProductFilters] = None) -> dict:
+        """
+        Category, brand and condition counts from the in-memory facet index,
+        combined with the category/brand/condition filters.
+        """
+        filters = filters or ProductFilters()
+        if not facet_index.built:
+            session = self._open_session()
+            try:
+                facet_index.rebuild(session)
+            except Exception as e:
+                self.db_manager.rollback_session(session)
+                logger.error(f"Error building facet index: {e}")
+                raise
+            finally:
+                self._close_session(session)
+        return facet_index.counts({
+            "category": filters.category,
+            "brand": filters.brand,
+            "condition": filters.condition
+        })
+    
+    def get_product_version(self, product_id: int, check_cache: bool = True) -> Optional[Tuple[Optional[datetime], str]]:
+        """
+        Get a product's row version without loading the whole row, or None if it does not exist.
+        check_cache=False skips the cache for callers that have just missed it.
+        """
+        if check_cache:
+            cached = get_cached_product(product_id)
+            if cached is not None:
+                return product_version(cached)
+        
+        session = self._open_session()
+        try:
+            row = session.query(
+                ProductDB.id,
+                ProductDB.created_at,
+                ProductDB.updated_at,
+                ProductDB.bid_count,
+                ProductDB.current_bid,
+                ProductDB.highest_bid_id
+            ).filter(ProductDB.id == product_id).first()
+            return product_version(row) if row else None
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error getting version of product {product_id}: {e}")
+            return None
+        finally:
+            self._close_session(session)
     
-    def get_all_products(self, limit: int = 100, offset: int = 0) -> List[ProductDB]:
-        """Get all products with pagination"""
-        session = self.db_manager.create_session()
+    def get_all_products(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductDB]:
+        """
+        Get all products with pagination.
+        With ``fields``, only those columns are loaded; the rest stay deferred.
+        """
+        session = self._open_session()
         try:
-            products = session.query(ProductDB).offset(offset).limit(limit).all()
+            query = session.query(ProductDB)
+            if fields:
+                query = query.options(load_only(*product_columns(fields)))
+            products = query.offset(offset).limit(limit).all()
             return products
         except Exception as e:
+            self.db_manager.rollback_session(session)
             logger.error(f"Error getting all products: {e}")
             return []
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
+    
+    def _filter_conditions(self, session: Session, filters: ProductFilters) -> list:
+        """Build WHERE conditions for product filters"""
+        conditions = []
+        if filters.category:
+            conditions.append(ProductDB.category == filters.category)
+        if filters.brand:
+            conditions.append(ProductDB.brand == filters.brand)
+        if filters.condition:
+            conditions.append(ProductDB.condition == filters.condition)
+        
+        price_column = getattr(ProductDB, filters.price_field.value)
+        if filters.min_price is not None:
+            conditions.append(price_column >= filters.min_price)
+        if filters.max_price is not None:
+            conditions.append(price_column <= filters.max_price)
+        
+        if filters.tags:
+            if session.get_bind().dialect.name == "postgresql":
+                # Served by the GIN index on (tags::jsonb)
+                conditions.append(cast(ProductDB.tags, JSONB).contains(filters.tags))
+            else:
+                for tag in filters.tags:
+                    tag_values = func.json_each(ProductDB.tags).table_valued("value")
+                    conditions.append(exists(select(literal(1)).select_from(tag_values).where(tag_values.c.value == tag)))
+        return conditions
+    
+    def _sort_key(self, sort: ProductSort, price_field: PriceField):
+        """Get the (expression, descending) pair a sort order pages over; id breaks ties"""
+        if sort in (ProductSort.NEWEST, ProductSort.OLDEST):
+            return None, sort == ProductSort.NEWEST
+        if sort in (ProductSort.PRICE_ASC, ProductSort.PRICE_DESC):
+            # Rendered inline so it matches the (coalesce(price, 0.0), id) expression indexes
+            return func.coalesce(getattr(ProductDB, price_field.value), literal_column("0.0")), sort == ProductSort.PRICE_DESC
+        if sort == ProductSort.MOST_BIDS:
+            return ProductDB.bid_count, True
+        return ProductDB.title, False
+    
+    def _list_page(
+        self,
+        session: Session,
+        entities: tuple,
+        filters: Optional[ProductFilters],
+        sort: ProductSort,
+        limit: int,
+        after: Optional[Tuple[object, int]]
+    ) -> Tuple[list, object, bool]:
+        """
+        Run the keyset page query selecting ``entities``, starting after the decoded cursor.
+        Returns (rows, sort key of the last row, whether there is another page).
+        """
+        filters = filters or ProductFilters()
+        key_expr, descending = self._sort_key(sort, filters.price_field)
+        conditions = self._filter_conditions(session, filters)
+        
+        if after is not None:
+            last_key, last_id = after
+            if key_expr is None:
+                conditions.append(ProductDB.id < last_id if descending else ProductDB.id > last_id)
+            else:
+                row, last = tuple_(key_expr, ProductDB.id), tuple_(literal(last_key), literal(last_id))
+                conditions.append(row < last if descending else row > last)
+        
+        order_by = [] if key_expr is None else [key_expr.desc() if descending else key_expr.asc()]
+        order_by.append(ProductDB.id.desc() if descending else ProductDB.id.asc())
+        
+        stmt = select(*entities)
+        if key_expr is not None:
+            stmt = stmt.add_columns(key_expr)
+        rows = session.execute(stmt.where(*conditions).order_by(*order_by).limit(limit + 1)).all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        last_key = rows[-1][len(entities)] if rows and key_expr is not None else None
+        return rows, last_key, has_more
+    
+    def list_products(
+        self,
+        filters: Optional[ProductFilters] = None,
+        sort: ProductSort = ProductSort.NEWEST,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ProductDB], Optional[str]]:
+        """
+        Get a filtered, sorted page of products using keyset pagination.
+        Returns the page and the cursor of the next page (None on the last page).
+        Raises ValueError for an invalid cursor.
+        """
+        after = decode_cursor(cursor, sort) if cursor else None
+        session = self._open_session()
+        try:
+            rows, last_key, has_more = self._list_page(session, (ProductDB,), filters, sort, limit, after)
+            products = [row[0] for row in rows]
+            
+            next_cursor = None
+            if has_more and products:
+                next_cursor = encode_cursor(sort, last_key, products[-1].id)
+            return products, next_cursor
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error listing products: {e}")
+            raise
+        finally:
+            self._close_session(session)
+    
+    def list_product_rows(
+        self,
+        filters: Optional[ProductFilters] = None,
+        sort: ProductSort = ProductSort.NEWEST,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[tuple], Optional[str]]:
+        """
+        Same page as list_products, projected to product_columns(fields) tuples
+        for the zero-validation serializers instead of ORM objects, so unrequested
+        columns (e.g. description, tags) never leave the database.
+        """
+        columns = product_columns(fields)
+        after = decode_cursor(cursor, sort) if cursor else None
+        session = self._open_session()
+        try:
+            rows, last_key, has_more = self._list_page(session, columns, filters, sort, limit, after)
+            rows = [row[:len(columns)] for row in rows]
+            
+            next_cursor = None
+            if has_more and rows:
+                next_cursor = encode_cursor(sort, last_key, rows[-1][0])
+            return rows, next_cursor
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error listing product rows: {e}")
+            raise
+        finally:
+            self._close_session(session)
+    
+    def search_products(self, query: str, limit: int = 20) -> Tuple[List[Tuple[ProductDB, float, dict]], str]:
+        """
+        Keyword search over title, description, brand and tags.
+        Returns ([(product, rank, highlights)], match) where match is "fulltext" or
+        "trigram" on Postgres and "keyword" or "fuzzy" for the pure-Python fallback.
+        """
+        session = self._open_session()
+        try:
+            if session.get_bind().dialect.name == "postgresql":
+                return self._search_postgres(session, query, limit)
+            return self._search_python(session, query, limit)
+        except Exception as e:
+            self.db_manager.rollback_session(session)
+            logger.error(f"Error searching products for '{query}': {e}")
+            raise
+        finally:
+            self._close_session(session)
+    
+    def _search_postgres(self, session: Session, query: str, limit: int):
+        """Ranked tsvector search, falling back to pg_trgm similarity on the title for typos"""
+        tsquery = func.websearch_to_tsquery("english", query)
+        search_vector = literal_column("products.search_vector")
+        rank = func.ts_rank_cd(search_vector, tsquery)
+        
+        # Rank and limit first so ts_headline only runs for the returned page
+        ranked = session.query(
+            ProductDB.id.label("id"), rank.label("rank")
+        ).filter(search_vector.op("@@")(tsquery)).order_by(rank.desc(), ProductDB.id).limit(limit).subquery()
+        
+        rows = session.query(
+            ProductDB,
+            ranked.c.rank,
+            func.ts_headline("english", sql_html_escape(ProductDB.title), tsquery, HEADLINE_OPTIONS),
+            func.ts_headline("english", sql_html_escape(ProductDB.description), tsquery, HEADLINE_OPTIONS)
+        ).join(ranked, ranked.c.id == ProductDB.id).order_by(ranked.c.rank.desc(), ProductDB.id).all()
+        
+        if rows:
+            return [
+                (product, float(score), {"title": title_hl, "description": description_hl})
+                for product, score, title_hl, description_hl in rows
+            ], "fulltext"
+        
+        # Typo-tolerant fallback served by the gin_trgm_ops index on title
+        similarity = func.word_similarity(query, ProductDB.title)
+        rows = session.query(ProductDB, similarity).filter(
+            similarity >= TRIGRAM_THRESHOLD
+        ).order_by(similarity.desc(), ProductDB.id).limit(limit).all()
+        return [
+            (product, float(score), {"title": html.escape(product.title), "description": ""})
+            for product, score in rows
+        ], "trigram"
+    
+    def _search_python(self, session: Session, query: str, limit: int):
+        """Rank in Python over the searchable columns only (SQLite and tests)"""
+        documents = (
+            (product_id, {
+                "title": title,
+                "brand": brand,
+                "tags": " ".join(tags or []),
+                "description": description
+            })
+            for product_id, title, description, brand, tags in session.query(
+                ProductDB.id, ProductDB.title, ProductDB.description, ProductDB.brand, ProductDB.tags
+            ).yield_per(1000)
+        )
+        ranked, match = rank_documents(query, documents, limit, TRIGRAM_THRESHOLD)
+        if not ranked:
+            return [], match
+        
+        products = {
+            p.id: p for p in session.query(ProductDB).filter(ProductDB.id.in_([r[0] for r in ranked])).all()
+        }
+        return [
+            (products[product_id], score, highlights)
+            for product_id, score, highlights in ranked
+            if product_id in products
+        ], match
     
     def update_product(self, product_id: int, updates: dict) -> Optional[ProductDB]:
         """Update a product with given updates"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             product = session.query(ProductDB).filter(ProductDB.id == product_id).first()
             if not product:
                 return None
+            old_group = facet_group(product)
             
             # Update allowed fields
             allowed_fields = [
@@ -79,8 +521,11 @@ class ProductService:
                 if field in allowed_fields and hasattr(product, field):
                     setattr(product, field, value)
             
+            notify_product_changed(session, product_id)
             self.db_manager.commit_session(session)
+            invalidate_product(product_id)
             session.refresh(product)
+            facet_index.update(old_group, facet_group(product))
             logger.info(f"Updated product: {product.title}")
             return product
             
@@ -89,18 +534,22 @@ class ProductService:
             logger.error(f"Error updating product {product_id}: {e}")
             return None
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def delete_product(self, product_id: int) -> bool:
         """Delete a product by ID"""
-        session = self.db_manager.create_session()
+        session = self._open_session()
         try:
             product = session.query(ProductDB).filter(ProductDB.id == product_id).first()
             if not product:
                 return False
             
+            group = facet_group(product)
             session.delete(product)
+            notify_product_changed(session, product_id)
             self.db_manager.commit_session(session)
+            invalidate_product(product_id)
+            facet_index.remove(group)
             logger.info(f"Deleted product: {product.title}")
             return True
             
@@ -109,11 +558,115 @@ class ProductService:
             logger.error(f"Error deleting product {product_id}: {e}")
             return False
         finally:
-            self.db_manager.close_session(session)
+            self._close_session(session)
     
     def get_product_as_pydantic(self, product_id: int) -> Optional[Product]:
         """Get a product as a Pydantic model"""
         product_db = self.get_product_by_id(product_id)
         if product_db:
             return product_db_to_pydantic(product_db)
-        return None
\ No newline at end of file
+        return None
+
+
+class AsyncProductService:
+    """
+    Non-blocking ProductService for the API.
+    Runs the ProductService queries on an AsyncSession (asyncpg) via run_sync,
+    so there is a single implementation of each query.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.session.run_sync(
+            lambda sync_session: getattr(ProductService(sync_session), method)(*args, **kwargs)
+        )
+    
+    async def create_product(self, product: Product) -> ProductDB:
+        """Create a new product in the database"""
+        return await self._run("create_product", product)
+    
+    async def get_product_by_id(self, product_id: int) -> Optional[ProductDB]:
+        """Get a product by its database ID (read-through cached)"""
+        cached = get_cached_product(product_id)
+        if cached is not None:
+            return cached
+        return await self._run("get_product_by_id", product_id, check_cache=False)
+    
+    async def get_products_by_ids(self, product_ids: Iterable[int]) -> Dict[int, ProductDB]:
+        """Get many products by id; only cache misses reach the database"""
+        products = {}
+        misses = []
+        for product_id in dict.fromkeys(product_ids):
+            cached = get_cached_product(product_id)
+            if cached is not None:
+                products[product_id] = cached
+            else:
+                misses.append(product_id)
+        if misses:
+            products.update(await self._run("get_products_by_ids", misses, check_cache=False))
+        return products
+    
+    async def get_product_detail(
+        self, product_id: int, bid_limit: int = 10
+    ) -> Optional[Tuple[ProductDB, List[BidDB], Optional[BidDB]]]:
+        """Get a product with its top bids by amount and its highest bid"""
+        return await self._run("get_product_detail", product_id, bid_limit)
+    
+    async def get_facets(self, filters: Optional[ProductFilters] = None) -> dict:
+        """Category, brand and condition counts from the in-memory facet index"""
+        return await self._run("get_facets", filters)
+    
+    async def get_product_version(self, product_id: int) -> Optional[Tuple[Optional[datetime], str]]:
+        """Get a product's row version without loading the whole row"""
+        cached = get_cached_product(product_id)
+        if cached is not None:
+            return product_version(cached)
+        return await self._run("get_product_version", product_id, check_cache=False)
+    
+    async def get_all_products(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductDB]:
+        """Get all products with pagination, loading only ``fields`` if given"""
+        return await self._run("get_all_products", limit, offset, fields)
+    
+    async def list_products(
+        self,
+        filters: Optional[ProductFilters] = None,
+        sort: ProductSort = ProductSort.NEWEST,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ProductDB], Optional[str]]:
+        """Get a filtered, sorted page of products using keyset pagination"""
+        return await self._run("list_products", filters, sort, limit, cursor)
+    
+    async def list_product_rows(
+        self,
+        filters: Optional[ProductFilters] = None,
+        sort: ProductSort = ProductSort.NEWEST,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[tuple], Optional[str]]:
+        """Same page as list_products, projected to product_columns(fields) tuples"""
+        return await self._run("list_product_rows", filters, sort, limit, cursor, fields)
+    
+    async def search_products(self, query: str, limit: int = 20) -> Tuple[List[Tuple[ProductDB, float, dict]], str]:
+        """Keyword search over title, description, brand and tags"""
+        return await self._run("search_products", query, limit)
+    
+    async def update_product(self, product_id: int, updates: dict) -> Optional[ProductDB]:
+        """Update a product with given updates"""
+        return await self._run("update_product", product_id, updates)
+    
+    async def delete_product(self, product_id: int) -> bool:
+        """Delete a product by ID"""
+        return await self._run("delete_product", product_id)
+    
+    async def get_product_as_pydantic(self, product_id: int) -> Optional[Product]:
+        """Get a product as a Pydantic model"""
+        return await self._run("get_product_as_pydantic", product_id)
@@ -0,0 +1,115 @@
+"""
+In-memory token-bucket rate limiting for admission control on hot write paths.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+from ..observability.metrics import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_DECISIONS,
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_TRACKED_KEYS,
+)
+
+
+class RateLimiter:
+    """
+    Keyed token buckets refilled at ``rate`` tokens per second up to ``burst``.
+    A rate of zero or less disables the limiter.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_keys: int = 100000):
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        RATE_LIMIT_RATE.labels(name).set(rate)
+        RATE_LIMIT_BURST.labels(name).set(self.burst)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def try_acquire(self, key: Hashable, tokens: float = 1.0) -> Tuple[bool, int]:
+        """
+        Take ``tokens`` from the bucket for ``key``.
+        Returns (allowed, retry_after_seconds); retry_after is 0 when allowed.
+        """
+        if not self.enabled:
+            return True, 0
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[key] = bucket
+                # Idle buckets are full anyway, so evicting the least recently used is lossless
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= tokens:
+                bucket[0] -= tokens
+                allowed, retry_after = True, 0
+            else:
+                allowed = False
+                retry_after = max(1, math.ceil((tokens - bucket[0]) / self.rate))
+            tracked = len(self._buckets)
+
+        RATE_LIMIT_DECISIONS.labels(self.name, "allowed" if allowed else "rejected").inc()
+        RATE_LIMIT_TRACKED_KEYS.labels(self.name).set(tracked)
+        return allowed, retry_after
+
+    def refund(self, key: Hashable, tokens: float = 1.0) -> None:
+        """Return tokens taken by a request that was rejected by another limiter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + tokens)
+
+    def reset(self) -> None:
+        """Forget every bucket."""
+        with self._lock:
+            self._buckets.clear()
+        RATE_LIMIT_TRACKED_KEYS.labels(self.name).set(0)
+
+
+# Bid admission control; rates are bids per second, bursts are bucket sizes
+bid_user_limiter = RateLimiter(
+    "bid_user",
+    rate=float(os.getenv("BID_RATE_LIMIT_USER_RATE", "2")),
+    burst=float(os.getenv("BID_RATE_LIMIT_USER_BURST", "10")),
+)
+bid_product_limiter = RateLimiter(
+    "bid_product",
+    rate=float(os.getenv("BID_RATE_LIMIT_PRODUCT_RATE", "50")),
+    burst=float(os.getenv("BID_RATE_LIMIT_PRODUCT_BURST", "100")),
+)
+
+
+def admit_bid(user_id: str, product_id: int) -> Tuple[bool, int]:
+    """
+    Check the per-user and per-product bid limiters.
+    Returns (allowed, retry_after_seconds).
+    """
+    allowed, retry_after = bid_user_limiter.try_acquire(user_id)
+    if not allowed:
+        return False, retry_after
+
+    allowed, retry_after = bid_product_limiter.try_acquire(product_id)
+    if not allowed:
+        bid_user_limiter.refund(user_id)
+        return False, retry_after
+    return True, 0
@@ -0,0 +1,133 @@
+"""
+Pure-Python keyword ranking used when Postgres full-text search is unavailable (e.g. SQLite).
+
+Mirrors the Postgres setup closely enough for tests: weighted fields like
+setweight A/B/C, prefix-aware term matching, a trigram-similarity fallback for
+typos, and <b>...</b> highlights like ts_headline. Highlights are HTML: the
+product text in them is escaped, so only the markers are markup.
+"""
+import html
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Same relative weights as ts_rank's defaults for A (title), B (brand, tags) and C (description)
+FIELD_WEIGHTS = {"title": 1.0, "brand": 0.4, "tags": 0.4, "description": 0.2}
+
+HIGHLIGHT_START = "<b>"
+HIGHLIGHT_STOP = "</b>"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens"""
+    if not text:
+        return []
+    return WORD_RE.findall(text.lower())
+
+
+def trigrams(word: str) -> Set[str]:
+    """pg_trgm style trigrams of a word (padded with two leading and one trailing space)"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Shared trigrams over all trigrams, like pg_trgm similarity()"""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def _term_matches(term: str, token: str) -> bool:
+    # Prefix matching approximates english stemming (e.g. "camera" ~ "cameras")
+    return token == term or (len(term) >= 3 and token.startswith(term))
+
+
+def score_fields(terms: List[str], fields: Dict[str, List[str]]) -> float:
+    """Weighted exact/prefix match score; every term must match some field"""
+    score = 0.0
+    for term in terms:
+        term_score = 0.0
+        for field, tokens in fields.items():
+            hits = sum(1 for token in tokens if _term_matches(term, token))
+            if hits:
+                term_score += FIELD_WEIGHTS.get(field, 0.1) * (1 + 0.1 * (hits - 1))
+        if term_score == 0.0:
+            return 0.0
+        score += term_score
+    return score
+
+
+def fuzzy_score(terms: List[str], fields: Dict[str, List[str]], threshold: float) -> float:
+    """Average best trigram similarity of each term against title, brand and tag tokens"""
+    candidates = fields.get("title", []) + fields.get("brand", []) + fields.get("tags", [])
+    if not candidates:
+        return 0.0
+    total = 0.0
+    for term in terms:
+        best = max(trigram_similarity(term, token) for token in candidates)
+        if best < threshold:
+            return 0.0
+        total += best
+    return total / len(terms)
+
+
+def highlight(text: Optional[str], terms: List[str], max_words: int = 35) -> str:
+    """HTML-escape text and wrap matching words in <b>...</b>, trimming long text around the first match"""
+    if not text:
+        return ""
+    words = []
+    first_hit = None
+    for i, word in enumerate(text.split()):
+        normalized = tokenize(word)
+        escaped = html.escape(word)
+        if normalized and any(_term_matches(term, normalized[0]) for term in terms):
+            escaped = f"{HIGHLIGHT_START}{escaped}{HIGHLIGHT_STOP}"
+            if first_hit is None:
+                first_hit = i
+        words.append(escaped)
+    if len(words) > max_words:
+        start = max(0, (first_hit or 0) - max_words // 3)
+        words = words[start:start + max_words]
+    return " ".join(words)
+
+
+def rank_documents(
+    query: str,
+    documents: Iterable[Tuple[int, Dict[str, Optional[str]]]],
+    limit: int = 20,
+    typo_threshold: float = 0.3
+) -> Tuple[List[Tuple[int, float, Dict[str, str]]], str]:
+    """
+    Rank (id, {field: text}) documents for a query.
+    Returns ([(id, rank, highlights)], match) where match is "keyword" for
+    exact/prefix matches or "fuzzy" when only the trigram fallback matched.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return [], "keyword"
+
+    exact, fuzzy = [], []
+    for doc_id, fields in documents:
+        tokens = {field: tokenize(text) for field, text in fields.items()}
+        score = score_fields(terms, tokens)
+        if score > 0:
+            exact.append((score, doc_id, fields))
+        elif not exact:
+            # Only needed while nothing matched exactly
+            similarity = fuzzy_score(terms, tokens, typo_threshold)
+            if similarity > 0:
+                fuzzy.append((similarity, doc_id, fields))
+
+    matched, match = (exact, "keyword") if exact else (fuzzy, "fuzzy")
+    matched.sort(key=lambda item: (-item[0], item[1]))
+    results = []
+    for score, doc_id, fields in matched[:limit]:
+        highlights = {
+            "title": highlight(fields.get("title"), terms),
+            "description": highlight(fields.get("description"), terms),
+        }
+        results.append((doc_id, round(score, 6), highlights))
+    return results, match
@@ -0,0 +1,328 @@
+"""
+Offline end-to-end benchmark of the agent, product and bid routes.
+
+Gemini is replaced by the fake in ``benchmarks.fake_gemini`` (canned responses,
+configurable latency per prompt type), so runs need no network or API key and
+are repeatable. The FastAPI app runs in-process against ``DATABASE_URL``
+(``sqlite:///./bench.db`` works) and a closed-loop load generator keeps
+``--concurrency`` requests in flight, picking each request from a weighted
+scenario mix:
+
+    create_listing   POST /api/agent/create-listing (generated JPEG)
+    recommendations  POST /api/agent/recommendations
+    list_products    GET  /api/products
+    get_product      GET  /api/products/{id}
+    product_detail   GET  /api/products/{id}/detail
+    create_bid       POST /api/products/{id}/bids
+
+The JSON report (``--json``) holds overall and per-scenario throughput, latency
+percentiles and status counts, Gemini calls per prompt type, the full
+configuration and the git commit, so reports from different commits compare
+directly.
+
+Usage:
+    uv run python -m benchmarks.agent_e2e --concurrency 20 --duration 30 --json e2e.json
+    uv run python -m benchmarks.agent_e2e --latency lognormal:0.8,0.4 --latency image_analysis=lognormal:2.5,0.3
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from PIL import Image
+
+from benchmarks import fake_gemini
+from benchmarks.common import latency_summary
+
+SCENARIOS = ("create_listing", "recommendations", "list_products", "get_product", "product_detail", "create_bid")
+DEFAULT_MIX = "create_listing=1,recommendations=1,list_products=4,get_product=6,product_detail=3,create_bid=3"
+RECOMMENDATION_QUERIES = ("noise cancelling headphones", "vintage camera", "gaming laptop under 800", "running shoes")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """``name=weight,...`` into scenario weights; unknown names are rejected."""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def parse_latency_args(specs: List[str]) -> Dict[str, str]:
+    """``--latency SPEC`` sets the default, ``--latency TYPE=SPEC`` one prompt type."""
+    latency = {}
+    for spec in specs:
+        prompt_type, sep, value = spec.partition("=")
+        if not sep:
+            prompt_type, value = "default", spec
+        if prompt_type != "default" and prompt_type not in fake_gemini.PROMPT_TYPES:
+            raise argparse.ArgumentTypeError(f"Unknown prompt type '{prompt_type}'")
+        fake_gemini.parse_latency(value)
+        latency[prompt_type] = value
+    return latency
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def make_image(size: int) -> bytes:
+    """A noisy JPEG, so upload sizes resemble real photos rather than flat colour"""
+    image = Image.effect_noise((size, size), 64).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def seed_products(run_id: str, count: int) -> List[int]:
+    """Insert ``count`` products for the read and bid scenarios, returning their ids."""
+    from app.database import DatabaseManager
+    from app.models.db_models import ProductDB
+
+    session = DatabaseManager.create_session()
+    try:
+        products = [
+            ProductDB(
+                title=f"bench-{run_id}-{i}",
+                description="Agent end-to-end benchmark product",
+                condition="good",
+                category=f"benchmark-{run_id}",
+                brand=("Sony", "Bose", "Canon", None)[i % 4],
+                suggested_price=float(10 + i % 500),
+                tags=["bench", f"tag-{i % 10}"],
+            )
+            for i in range(count)
+        ]
+        session.add_all(products)
+        session.flush()
+        product_ids = [p.id for p in products]
+        DatabaseManager.commit_session(session)
+        return product_ids
+    finally:
+        DatabaseManager.close_session(session)
+
+
+def cleanup(product_ids: List[int], image_paths: List[str]) -> None:
+    """Delete the seeded products, their bids and the images uploaded by create_listing."""
+    from app.database import DatabaseManager
+    from app.models.db_models import BidDB, ProductDB
+
+    session = DatabaseManager.create_session()
+    try:
+        session.query(BidDB).filter(BidDB.product_id.in_(product_ids)).delete(synchronize_session=False)
+        session.query(ProductDB).filter(ProductDB.id.in_(product_ids)).delete(synchronize_session=False)
+        DatabaseManager.commit_session(session)
+    finally:
+        DatabaseManager.close_session(session)
+    for path in image_paths:
+        Path(path).unlink(missing_ok=True)
+
+
+class LoadGenerator:
+    """Closed-loop workers issuing weighted scenario requests and recording the outcomes."""
+
+    def __init__(self, client: httpx.AsyncClient, product_ids: List[int], image: bytes,
+                 mix: Dict[str, float], seed: int):
+        self.client = client
+        self.product_ids = product_ids
+        self.image = image
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.seed = seed
+        self.latencies: Dict[str, List[float]] = {name: [] for name in self.names}
+        self.statuses: Dict[str, Dict[str, int]] = {name: {} for name in self.names}
+        self.image_paths: List[str] = []
+        self._bid_amounts: Dict[int, float] = {}
+
+    async def _request(self, name: str, worker: int, rng: random.Random) -> httpx.Response:
+        if name == "create_listing":
+            return await self.client.post(
+                "/api/agent/create-listing", files={"image": ("bench.jpg", self.image, "image/jpeg")}
+            )
+        if name == "recommendations":
+            return await self.client.post(
+                "/api/agent/recommendations", json={"query_string": rng.choice(RECOMMENDATION_QUERIES)}
+            )
+        if name == "list_products":
+            return await self.client.get("/api/products", params={"limit": 20})
+        product_id = rng.choice(self.product_ids)
+        if name == "get_product":
+            return await self.client.get(f"/api/products/{product_id}")
+        if name == "product_detail":
+            return await self.client.get(f"/api/products/{product_id}/detail")
+        # Rising amounts, so most bids take the lead and exercise the outbid path
+        amount = self._bid_amounts.get(product_id, 10.0) + rng.uniform(1.0, 5.0)
+        self._bid_amounts[product_id] = amount
+        return await self.client.post(
+            f"/api/products/{product_id}/bids", json={"user_id": f"bench-user-{worker}", "amount": round(amount, 2)}
+        )
+
+    def _record(self, name: str, status: str, seconds: float, response: Optional[httpx.Response]) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] = self.statuses[name].get(status, 0) + 1
+        if name == "create_listing" and response is not None and response.status_code == 200:
+            body = response.json()
+            image_url = (body.get("product") or {}).get("image_url") or body.get("image_url")
+            if image_url:
+                self.image_paths.append(image_url.lstrip("/"))
+
+    async def worker(self, worker: int, deadline: float, remaining: List[int]) -> None:
+        rng = random.Random(f"{self.seed}-{worker}")
+        while time.perf_counter() < deadline and remaining[0] != 0:
+            remaining[0] -= 1
+            name = rng.choices(self.names, self.weights)[0]
+            started = time.perf_counter()
+            response = None
+            try:
+                response = await self._request(name, worker, rng)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            self._record(name, status, time.perf_counter() - started, response)
+
+
+def _is_error(status: str) -> bool:
+    return not status.isdigit() or int(status) >= 500
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    """Install the fake, seed products, drive the load and build the report."""
+    run_id = uuid.uuid4().hex[:8]
+    fake = fake_gemini.install(args.latency, args.seed)
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    # Measure the request path rather than admission control
+    os.environ.setdefault("BID_RATE_LIMIT_USER_RATE", "0")
+    os.environ.setdefault("BID_RATE_LIMIT_PRODUCT_RATE", "0")
+
+    from app.api.api import app
+    from app.database import async_engine, engine, init_db
+
+    engine.echo = False
+    async_engine.echo = False
+    init_db()
+    product_ids = seed_products(run_id, args.products)
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout)
+    generator = LoadGenerator(client, product_ids, make_image(args.image_size), args.mix, args.seed)
+    # -1 never reaches zero: run until the deadline
+    remaining = [args.requests if args.requests else -1]
+    try:
+        async with client:
+            started = time.perf_counter()
+            deadline = started + args.duration if args.duration else float("inf")
+            await asyncio.gather(*[
+                generator.worker(i, deadline, remaining) for i in range(args.concurrency)
+            ])
+            elapsed = time.perf_counter() - started
+    finally:
+        if not args.keep:
+            cleanup(product_ids, generator.image_paths)
+
+    scenarios = {}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for name in generator.names:
+        latencies = generator.latencies[name]
+        statuses = generator.statuses[name]
+        errors = sum(n for status, n in statuses.items() if _is_error(status))
+        total_errors += errors
+        all_latencies.extend(latencies)
+        scenarios[name] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "statuses": statuses,
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": latency_summary(latencies),
+        }
+
+    return {
+        "run_id": run_id,
+        "git_commit": git_commit(),
+        "database": os.getenv("DATABASE_URL", "default"),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "requests": args.requests,
+            "products": args.products,
+            "image_size": args.image_size,
+            "mix": args.mix,
+            "gemini_latency": fake.latency_specs,
+            "seed": args.seed,
+        },
+        "elapsed_seconds": round(elapsed, 4),
+        "requests": len(all_latencies),
+        "errors": total_errors,
+        "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(all_latencies),
+        "scenarios": scenarios,
+        "gemini_calls": fake.calls,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Agent end-to-end benchmark (run {report['run_id']}, commit {report['git_commit']}, "
+          f"{report['config']['concurrency']} workers)")
+    latency = report["latency_ms"]
+    print(f"  overall            {report['requests']:>7} req  {report['throughput_rps']:>9} req/s  "
+          f"p50/p95/p99 {latency['p50']} / {latency['p95']} / {latency['p99']} ms  errors={report['errors']}")
+    for name, scenario in report["scenarios"].items():
+        latency = scenario["latency_ms"]
+        print(f"  {name:<18} {scenario['requests']:>7} req  {scenario['throughput_rps']:>9} req/s  "
+              f"p50/p95/p99 {latency['p50']} / {latency['p95']} / {latency['p99']} ms  {scenario['statuses']}")
+    print(f"  gemini calls: {report['gemini_calls']}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark with a fake Gemini backend")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests kept in flight")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run (0: until --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0: until --duration)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--latency", action="append", default=[],
+                        help="Fake Gemini latency: SPEC for every prompt or TYPE=SPEC for one "
+                             "(none, constant:S, uniform:LO,HI, lognormal:MEDIAN,SIGMA; default none)")
+    parser.add_argument("--products", type=int, default=200, help="Products to seed for the read and bid scenarios")
+    parser.add_argument("--image-size", type=int, default=512, help="Side of the generated listing image in pixels")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible runs")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="Keep seeded products, listings and bids after the run")
+    args = parser.parse_args(argv)
+    if not args.duration and not args.requests:
+        parser.error("set --duration or --requests")
+    try:
+        args.latency = parse_latency_args(args.latency)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+Bid contention load test and correctness benchmark.
+
+Simulates N concurrent bidders placing bids through
+``POST /api/products/{id}/bids`` against one hot product and many cold ones,
+then reports throughput, latency percentiles and database round-trips per bid,
+and checks the bidding invariants on the resulting rows:
+
+- every product with bids has exactly one WINNING bid
+- ``products.current_bid`` equals the maximum ACTIVE/WINNING bid amount
+- the WINNING bid is the highest bid placed (no higher bid was wrongly marked
+  OUTBID) and ``products.highest_bid_id`` points to it
+
+By default the FastAPI app runs in-process (so SQL statements can be counted)
+against the database configured by ``DATABASE_URL``. Pass ``--base-url`` to
+drive an already running server instead; round-trips are then not reported.
+Bid rate limiting is disabled for in-process runs unless the
+``BID_RATE_LIMIT_*`` variables are set explicitly.
+
+Usage:
+    uv run python -m benchmarks.bid_contention --bidders 50 --bids-per-bidder 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import event, func
+
+from app.database import DatabaseManager, async_engine, engine, init_db
+from app.models.db_models import BidDB, ProductDB
+from app.enums.enums import BidStatus
+from benchmarks.common import latency_summary
+
+
+class StatementCounter:
+    """Counts SQL statements sent to the database while enabled."""
+
+    def __init__(self, *target_engines):
+        self.count = 0
+        self.enabled = False
+        for target_engine in target_engines:
+            event.listen(target_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled:
+            self.count += 1
+
+
+def seed_products(run_id: str, cold_products: int) -> List[int]:
+    """Insert one hot and ``cold_products`` cold products, returning their ids (hot first)."""
+    session = DatabaseManager.create_session()
+    try:
+        products = [
+            ProductDB(
+                title=f"bench-{run_id}-{'hot' if i == 0 else f'cold-{i}'}",
+                description="Bid contention benchmark product",
+                condition="good",
+                category=f"benchmark-{run_id}",
+                suggested_price=10.0,
+                tags=[],
+            )
+            for i in range(cold_products + 1)
+        ]
+        session.add_all(products)
+        session.flush()
+        product_ids = [p.id for p in products]
+        DatabaseManager.commit_session(session)
+        return product_ids
+    finally:
+        DatabaseManager.close_session(session)
+
+
+def cleanup_products(product_ids: List[int]) -> None:
+    """Remove the benchmark products and their bids."""
+    session = DatabaseManager.create_session()
+    try:
+        session.query(BidDB).filter(BidDB.product_id.in_(product_ids)).delete(synchronize_session=False)
+        session.query(ProductDB).filter(ProductDB.id.in_(product_ids)).delete(synchronize_session=False)
+        DatabaseManager.commit_session(session)
+    finally:
+        DatabaseManager.close_session(session)
+
+
+def check_invariants(product_ids: List[int]) -> List[str]:
+    """Return a list of human readable invariant violations (empty when all hold)."""
+    violations = []
+    session = DatabaseManager.create_session()
+    try:
+        winning_bids: Dict[int, List[Tuple[int, float]]] = {}
+        for product_id, bid_id, amount in (
+            session.query(BidDB.product_id, BidDB.id, BidDB.amount)
+            .filter(BidDB.product_id.in_(product_ids), BidDB.status == BidStatus.WINNING.value)
+            .all()
+        ):
+            winning_bids.setdefault(product_id, []).append((bid_id, amount))
+        max_active = dict(
+            session.query(BidDB.product_id, func.max(BidDB.amount))
+            .filter(
+                BidDB.product_id.in_(product_ids),
+                BidDB.status.in_([BidStatus.ACTIVE.value, BidStatus.WINNING.value]),
+            )
+            .group_by(BidDB.product_id)
+            .all()
+        )
+        # Withdrawn bids are deleted, so every remaining bid counts; a higher bid
+        # wrongly marked OUTBID still raises this above a lower WINNING bid
+        max_placed = dict(
+            session.query(BidDB.product_id, func.max(BidDB.amount))
+            .filter(
+                BidDB.product_id.in_(product_ids),
+                BidDB.status.in_([BidStatus.ACTIVE.value, BidStatus.WINNING.value, BidStatus.OUTBID.value]),
+            )
+            .group_by(BidDB.product_id)
+            .all()
+        )
+        bid_totals = dict(
+            session.query(BidDB.product_id, func.count(BidDB.id))
+            .filter(BidDB.product_id.in_(product_ids))
+            .group_by(BidDB.product_id)
+            .all()
+        )
+        products = {
+            product_id: (current_bid, highest_bid_id)
+            for product_id, current_bid, highest_bid_id in session.query(
+                ProductDB.id, ProductDB.current_bid, ProductDB.highest_bid_id
+            ).filter(ProductDB.id.in_(product_ids)).all()
+        }
+    finally:
+        DatabaseManager.close_session(session)
+
+    for product_id in product_ids:
+        if not bid_totals.get(product_id):
+            continue
+        winning = winning_bids.get(product_id, [])
+        if len(winning) != 1:
+            violations.append(f"product {product_id}: expected 1 WINNING bid, found {len(winning)}")
+        actual, highest_bid_id = products.get(product_id, (None, None))
+        expected = max_active.get(product_id)
+        if expected is None or actual is None or abs(expected - actual) > 1e-9:
+            violations.append(f"product {product_id}: current_bid={actual} but max active amount={expected}")
+        if len(winning) == 1:
+            winning_id, winning_amount = winning[0]
+            highest_placed = max_placed.get(product_id)
+            if highest_placed is None or winning_amount < highest_placed - 1e-9:
+                violations.append(
+                    f"product {product_id}: WINNING bid {winning_id} is {winning_amount} "
+                    f"but the highest bid placed is {highest_placed}"
+                )
+            if highest_bid_id != winning_id:
+                violations.append(
+                    f"product {product_id}: highest_bid_id={highest_bid_id} but the WINNING bid is {winning_id}"
+                )
+    return violations
+
+
+async def run_bidder(
+    client: httpx.AsyncClient,
+    bidder_index: int,
+    bids: int,
+    product_ids: List[int],
+    hot_ratio: float,
+    rng: random.Random,
+    latencies: List[float],
+    errors: Dict[str, int],
+) -> None:
+    """Place ``bids`` sequential bids as one user and record per-request latency."""
+    user_id = f"bench-user-{bidder_index}"
+    for _ in range(bids):
+        if len(product_ids) == 1 or rng.random() < hot_ratio:
+            product_id = product_ids[0]
+        else:
+            product_id = rng.choice(product_ids[1:])
+        payload = {"user_id": user_id, "amount": round(rng.uniform(10.0, 10_000.0), 2)}
+
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"/api/products/{product_id}/bids", json=payload)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        latencies.append(time.perf_counter() - started)
+        if status != "200":
+            errors[status] = errors.get(status, 0) + 1
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    """Seed products, run the bidders concurrently and collect the report."""
+    run_id = uuid.uuid4().hex[:8]
+    init_db()
+    product_ids = seed_products(run_id, args.cold_products)
+
+    counter: Optional[StatementCounter] = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+    else:
+        # Measure the bid path itself rather than admission control
+        os.environ.setdefault("BID_RATE_LIMIT_USER_RATE", "0")
+        os.environ.setdefault("BID_RATE_LIMIT_PRODUCT_RATE", "0")
+        from app.api.api import app
+        counter = StatementCounter(engine, async_engine.sync_engine)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout
+        )
+
+    rng = random.Random(args.seed)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    try:
+        async with client:
+            if counter:
+                counter.enabled = True
+            started = time.perf_counter()
+            await asyncio.gather(*[
+                run_bidder(
+                    client, i, args.bids_per_bidder, product_ids, args.hot_ratio,
+                    random.Random(rng.random()), latencies, errors,
+                )
+                for i in range(args.bidders)
+            ])
+            elapsed = time.perf_counter() - started
+            if counter:
+                counter.enabled = False
+
+        violations = check_invariants(product_ids)
+    finally:
+        if not args.keep:
+            cleanup_products(product_ids)
+
+    total = len(latencies)
+    succeeded = total - sum(errors.values())
+    return {
+        "run_id": run_id,
+        "target": args.base_url or "in-process",
+        "bidders": args.bidders,
+        "bids_per_bidder": args.bids_per_bidder,
+        "cold_products": args.cold_products,
+        "hot_ratio": args.hot_ratio,
+        "requests": total,
+        "succeeded": succeeded,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_bids_per_second": round(succeeded / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(latencies),
+        "db_round_trips_per_bid": round(counter.count / total, 2) if counter and total else None,
+        "invariant_violations": violations,
+    }
+
+
+def print_report(report: dict) -> None:
+    latency = report["latency_ms"]
+    print(f"Bid contention benchmark ({report['target']}, run {report['run_id']})")
+    print(f"  bidders x bids:        {report['bidders']} x {report['bids_per_bidder']}"
+          f" over 1 hot + {report['cold_products']} cold products (hot ratio {report['hot_ratio']})")
+    print(f"  requests / succeeded:  {report['requests']} / {report['succeeded']}  errors={report['errors']}")
+    print(f"  elapsed:               {report['elapsed_seconds']} s")
+    print(f"  throughput:            {report['throughput_bids_per_second']} bids/s")
+    print(f"  latency p50/p95/p99:   {latency['p50']} / {latency['p95']} / {latency['p99']} ms (max {latency['max']})")
+    print(f"  DB round-trips / bid:  {report['db_round_trips_per_bid']}")
+    if report["invariant_violations"]:
+        print(f"  invariants:            FAILED ({len(report['invariant_violations'])} violations)")
+        for violation in report["invariant_violations"][:20]:
+            print(f"    - {violation}")
+    else:
+        print("  invariants:            OK")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bid contention load test and correctness benchmark")
+    parser.add_argument("--bidders", type=int, default=20, help="Number of concurrent bidders")
+    parser.add_argument("--bids-per-bidder", type=int, default=25, help="Sequential bids placed by each bidder")
+    parser.add_argument("--cold-products", type=int, default=50, help="Number of low-traffic products")
+    parser.add_argument("--hot-ratio", type=float, default=0.8, help="Fraction of bids sent to the hot product")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible runs")
+    parser.add_argument("--base-url", default=None, help="Target a running server instead of the in-process app")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded products and bids after the run")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["invariant_violations"] or report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Concurrent product read throughput: blocking ProductService vs AsyncProductService.
+
+Runs C concurrent readers on one event loop, each issuing ``get_product_by_id``
+calls with a fresh service per call (as the API does per request), once through
+the sync ``ProductService`` (psycopg, blocks the loop) and once through the
+``AsyncProductService`` (asyncpg). Reports throughput, latency percentiles and
+the worst event-loop lag observed by a heartbeat task while each mode ran.
+
+Usage:
+    uv run python -m benchmarks.concurrent_reads --concurrency 50 --reads-per-worker 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from typing import List, Optional
+
+from app.database import AsyncSessionLocal, DatabaseManager, async_engine, engine, init_db
+from app.models.db_models import ProductDB
+from app.services.product_service import AsyncProductService, ProductService
+from benchmarks.common import latency_summary
+
+
+def seed_products(run_id: str, count: int) -> List[int]:
+    """Insert ``count`` products to read, returning their ids."""
+    session = DatabaseManager.create_session()
+    try:
+        products = [
+            ProductDB(
+                title=f"bench-{run_id}-{i}",
+                description="Concurrent read benchmark product",
+                condition="good",
+                category=f"benchmark-{run_id}",
+                suggested_price=10.0,
+                tags=["benchmark"],
+            )
+            for i in range(count)
+        ]
+        session.add_all(products)
+        session.flush()
+        product_ids = [p.id for p in products]
+        DatabaseManager.commit_session(session)
+        return product_ids
+    finally:
+        DatabaseManager.close_session(session)
+
+
+def cleanup_products(product_ids: List[int]) -> None:
+    session = DatabaseManager.create_session()
+    try:
+        session.query(ProductDB).filter(ProductDB.id.in_(product_ids)).delete(synchronize_session=False)
+        DatabaseManager.commit_session(session)
+    finally:
+        DatabaseManager.close_session(session)
+
+
+async def sync_read(product_id: int) -> None:
+    ProductService().get_product_by_id(product_id)
+
+
+async def async_read(product_id: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await AsyncProductService(session).get_product_by_id(product_id)
+
+
+async def heartbeat(interval: float, lags: List[float], stop: asyncio.Event) -> None:
+    """Record how late the loop wakes this task up; blocking calls show up as lag."""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_mode(mode: str, product_ids: List[int], args: argparse.Namespace) -> dict:
+    read = sync_read if mode == "sync" else async_read
+    rng = random.Random(args.seed)
+    latencies: List[float] = []
+    lags: List[float] = []
+
+    async def worker(worker_rng: random.Random) -> None:
+        for _ in range(args.reads_per_worker):
+            started = time.perf_counter()
+            await read(worker_rng.choice(product_ids))
+            latencies.append(time.perf_counter() - started)
+
+    # Warm up connections and statement caches outside the measurement
+    for product_id in product_ids[:5]:
+        await read(product_id)
+
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(0.01, lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(random.Random(rng.random())) for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+
+    return {
+        "mode": mode,
+        "reads": len(latencies),
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_reads_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(latencies),
+        "max_event_loop_lag_ms": round(max(lags, default=0.0) * 1000, 3),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    engine.echo = False
+    async_engine.echo = False
+    init_db()
+    run_id = uuid.uuid4().hex[:8]
+    product_ids = seed_products(run_id, args.products)
+    try:
+        results = [await run_mode(mode, product_ids, args) for mode in args.modes]
+    finally:
+        cleanup_products(product_ids)
+    return {
+        "run_id": run_id,
+        "concurrency": args.concurrency,
+        "reads_per_worker": args.reads_per_worker,
+        "products": args.products,
+        "results": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Concurrent read benchmark (run {report['run_id']}, "
+          f"{report['concurrency']} workers x {report['reads_per_worker']} reads)")
+    for result in report["results"]:
+        latency = result["latency_ms"]
+        print(f"  {result['mode']:<6} {result['throughput_reads_per_second']:>10} reads/s  "
+              f"p50/p95/p99 {latency['p50']} / {latency['p95']} / {latency['p99']} ms  "
+              f"max loop lag {result['max_event_loop_lag_ms']} ms")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Blocking vs async product read throughput")
+    parser.add_argument("--concurrency", type=int, default=50, help="Number of concurrent readers")
+    parser.add_argument("--reads-per-worker", type=int, default=100, help="Reads issued by each reader")
+    parser.add_argument("--products", type=int, default=200, help="Number of products to seed and read")
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible runs")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Offline stand-in for ``google.generativeai``.
+
+``install()`` replaces ``genai.GenerativeModel`` (and makes ``genai.configure`` a
+no-op) with a fake that classifies each prompt by type, sleeps for a latency
+drawn from that type's distribution and returns a canned response with
+plausible ``usage_metadata``. Every prompt the listing, recommendation and
+voice agents send has a canned response, so agent endpoints run end to end
+without network calls or API keys.
+
+The fake blocks with ``time.sleep`` exactly like the real synchronous SDK, so
+benchmarks see the same event-loop behaviour as production.
+
+Latency specs:
+    none                   no delay
+    constant:S             always S seconds
+    uniform:LO,HI          uniform between LO and HI seconds
+    lognormal:MEDIAN,SIGMA log-normal with the given median (seconds) and sigma
+"""
+import json
+import math
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import google.generativeai as genai
+
+PROMPT_TYPES = ("image_analysis", "title", "description", "pricing", "recommendation", "intent")
+
+# Text identifying each agent prompt, checked in order: prompts that embed user
+# text or product data (intent, recommendation) are matched before generic phrases
+PROMPT_MARKERS = (
+    ("Analyze this product image", "image_analysis"),
+    ("which agent should handle it", "intent"),
+    ("JSON array of products", "recommendation"),
+    ("suggest appropriate auction pricing", "pricing"),
+    ("auction listing title", "title"),
+    ("informative product description", "description"),
+)
+
+CANNED_RESPONSES: Dict[str, str] = {
+    "image_analysis": "```json\n" + json.dumps({
+        "product_type": "wireless headphones",
+        "brand": "Sony",
+        "model": "WH-1000XM4",
+        "condition_assessment": "excellent",
+        "key_features": ["noise cancelling", "bluetooth", "over-ear"],
+        "visible_defects": ["light scuff on headband"],
+        "material": "plastic",
+        "color": "black",
+        "estimated_size": "medium",
+        "unique_identifiers": [],
+        "category_suggestions": ["Electronics", "Audio"],
+        "notable_details": "Includes carrying case",
+        "confidence_score": 0.86,
+        "text_visible": "SONY",
+        "packaging_present": False,
+        "accessories_visible": ["carrying case", "USB-C cable"],
+    }, indent=2) + "\n```",
+    "title": "Sony WH-1000XM4 Noise Cancelling Wireless Headphones - Excellent",
+    "description": (
+        "Sony WH-1000XM4 over-ear wireless headphones in excellent condition. Industry-leading noise "
+        "cancelling, Bluetooth with multipoint pairing and up to 30 hours of battery life. Light scuff "
+        "on the headband; otherwise clean. Comes with the carrying case and USB-C cable."
+    ),
+    "pricing": json.dumps({
+        "suggested_starting_price": 120.0,
+        "suggested_buy_now_price": 210.0,
+        "price_range_min": 100.0,
+        "price_range_max": 240.0,
+        "pricing_rationale": "Recent sales of used WH-1000XM4 in excellent condition",
+        "market_factors": ["brand demand", "condition"],
+        "confidence_level": "medium",
+    }),
+    "recommendation": "```json\n" + json.dumps([
+        {"id": 1, "title": "Sony WH-1000XM4 Noise Cancelling Wireless Headphones", "category": "Electronics"},
+        {"id": 2, "title": "Bose QuietComfort 45", "category": "Electronics"},
+    ]) + "\n```",
+    "intent": json.dumps({
+        "agent_type": "listing_agent",
+        "confidence": 0.92,
+        "intent_summary": "User wants to list headphones for auction",
+        "extracted_parameters": {
+            "image_path": None,
+            "product_name": "headphones",
+            "price_range": None,
+            "quantity": None,
+            "additional_info": None,
+        },
+        "suggested_action": "create listing",
+    }),
+}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Build a sampler (rng -> seconds) from a latency spec such as ``lognormal:0.8,0.4``."""
+    kind, _, params = spec.strip().partition(":")
+    values = [float(v) for v in params.split(",")] if params else []
+    if kind == "none":
+        return lambda rng: 0.0
+    if kind == "constant" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency spec '{spec}' (none, constant:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA)")
+
+
+def classify_prompt(contents) -> str:
+    """Prompt type of a generate_content request"""
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    text = " ".join(part for part in parts if isinstance(part, str))
+    for marker, prompt_type in PROMPT_MARKERS:
+        if marker in text:
+            return prompt_type
+    raise ValueError(f"Fake Gemini has no canned response for prompt: {text[:120]!r}")
+
+
+def _tokens(contents) -> int:
+    """Rough token count: four characters per token, 258 tokens per inline image"""
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    return sum(258 if isinstance(part, dict) else max(1, len(str(part)) // 4) for part in parts)
+
+
+class FakeUsageMetadata:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text: str, contents):
+        self.text = text
+        self.usage_metadata = FakeUsageMetadata(_tokens(contents), _tokens(text))
+
+
+class FakeGemini:
+    """Shared state of the fake: latency samplers, RNG and call counts per prompt type"""
+
+    def __init__(self, latency: Optional[Dict[str, str]] = None, seed: int = 42):
+        latency = dict(latency or {})
+        default = latency.pop("default", "none")
+        self.samplers = {t: parse_latency(latency.get(t, default)) for t in PROMPT_TYPES}
+        self.latency_specs = {t: latency.get(t, default) for t in PROMPT_TYPES}
+        self.calls = {t: 0 for t in PROMPT_TYPES}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def respond(self, contents) -> FakeResponse:
+        prompt_type = classify_prompt(contents)
+        with self._lock:
+            self.calls[prompt_type] += 1
+            delay = self.samplers[prompt_type](self._rng)
+        if delay > 0:
+            time.sleep(delay)
+        return FakeResponse(CANNED_RESPONSES[prompt_type], contents)
+
+
+_installed: Optional[FakeGemini] = None
+
+
+class FakeGenerativeModel:
+    """Drop-in for ``genai.GenerativeModel``"""
+
+    def __init__(self, model_name: str = "gemini-2.0-flash", **kwargs):
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+
+    def generate_content(self, contents, **kwargs) -> FakeResponse:
+        return _installed.respond(contents)
+
+
+def install(latency: Optional[Dict[str, str]] = None, seed: int = 42) -> FakeGemini:
+    """
+    Route every ``genai.GenerativeModel`` created from now on to the fake.
+    ``latency`` maps prompt types (and ``default``) to latency specs.
+    """
+    global _installed
+    _installed = FakeGemini(latency, seed)
+    genai.GenerativeModel = FakeGenerativeModel
+    genai.configure = lambda *args, **kwargs: None
+    return _installed
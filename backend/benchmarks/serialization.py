@@ -0,0 +1,240 @@
+"""
+Product listing serialization microbenchmark: validated Pydantic path vs row fast path.
+
+Seeds ``--rows`` products (10k by default) and serializes all of them as one
+``/api/products`` page both ways:
+
+- legacy: ORM entities -> validated ``Product`` -> ``model_dump()`` ->
+  FastAPI's ``jsonable_encoder`` + ``json.dumps``
+- fast: ``PRODUCT_RESPONSE_COLUMNS`` row tuples -> response dicts -> orjson
+
+Reports the median time of each stage (fetch, build, encode) in process, and
+the end-to-end latency of the two handlers served side by side from a small
+in-process ASGI app with the same dependencies as ``app.api.api``. Both paths
+are checked to produce the same JSON document.
+
+Usage:
+    uv run python -m benchmarks.serialization --rows 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy import insert
+
+from app.api.api import get_product_service
+from app.database import DatabaseManager, async_engine, engine, init_db
+from app.models.agent_models import Product
+from app.models.converters.serializers import dumps, product_row_to_dict
+from app.models.db_models import ProductDB
+from app.models.request_models import ProductFilters
+from app.services.product_service import AsyncProductService, ProductService
+
+
+def seed_products(run_id: str, count: int) -> str:
+    """Bulk insert ``count`` products in their own category, returning the category."""
+    category = f"benchmark-{run_id}"
+    session = DatabaseManager.create_session()
+    try:
+        session.execute(insert(ProductDB), [
+            {
+                "title": f"bench-{run_id}-{i}",
+                "description": "Serialization benchmark product with a realistic description length " * 3,
+                "condition": "good",
+                "category": category,
+                "suggested_price": 10.0 + i % 500,
+                "current_bid": None if i % 3 else 12.5,
+                "tags": ["benchmark", f"tag-{i % 20}", "serialization"],
+                "brand": f"brand-{i % 50}",
+                "model": f"model-{i % 7}",
+                "confidence_score": 0.9,
+                "bid_count": i % 11,
+            }
+            for i in range(count)
+        ])
+        DatabaseManager.commit_session(session)
+        return category
+    finally:
+        DatabaseManager.close_session(session)
+
+
+def cleanup_products(category: str) -> None:
+    session = DatabaseManager.create_session()
+    try:
+        session.query(ProductDB).filter(ProductDB.category == category).delete(synchronize_session=False)
+        DatabaseManager.commit_session(session)
+    finally:
+        DatabaseManager.close_session(session)
+
+
+def legacy_body(products: List[ProductDB]) -> List[dict]:
+    """What the listing handlers used to build: a validated Product per row"""
+    return [
+        Product(
+            id=p.id,
+            title=p.title,
+            description=p.description,
+            condition=p.condition,
+            category=p.category,
+            suggested_price=p.suggested_price,
+            current_bid=p.current_bid,
+            tags=p.tags or [],
+            brand=p.brand,
+            model=p.model,
+            confidence_score=p.confidence_score,
+            image_url=p.image_url,
+            bid_count=p.bid_count or 0,
+            highest_bid_id=p.highest_bid_id,
+            last_bid_at=p.last_bid_at
+        ).model_dump()
+        for p in products
+    ]
+
+
+def legacy_encode(body: List[dict]) -> bytes:
+    return json.dumps(jsonable_encoder(body), separators=(",", ":")).encode("utf-8")
+
+
+def time_stages(stages: List[Callable]) -> List[float]:
+    """Run chained stages (each gets the previous result) and return each stage's seconds."""
+    durations, value = [], None
+    for i, stage in enumerate(stages):
+        started = time.perf_counter()
+        value = stage() if i == 0 else stage(value)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def run_stages(filters: ProductFilters, rows: int, repeat: int) -> Dict[str, dict]:
+    """Median per-stage milliseconds of both paths, reading through fresh sessions."""
+    def fetch_entities():
+        session = DatabaseManager.create_session()
+        try:
+            return ProductService(session).list_products(filters, limit=rows)[0]
+        finally:
+            DatabaseManager.close_session(session)
+
+    def fetch_rows():
+        return ProductService().list_product_rows(filters, limit=rows)[0]
+
+    paths = {
+        "legacy": [fetch_entities, legacy_body, legacy_encode],
+        "fast": [fetch_rows, lambda rs: [product_row_to_dict(r) for r in rs], dumps],
+    }
+    results = {}
+    for name, stages in paths.items():
+        time_stages(stages)  # warm up
+        samples = [time_stages(stages) for _ in range(repeat)]
+        medians = [statistics.median(sample[i] for sample in samples) for i in range(len(stages))]
+        results[name] = {
+            "fetch_ms": round(medians[0] * 1000, 3),
+            "build_ms": round(medians[1] * 1000, 3),
+            "encode_ms": round(medians[2] * 1000, 3),
+            "total_ms": round(sum(medians) * 1000, 3),
+        }
+    return results
+
+
+def build_app(rows: int) -> FastAPI:
+    """Both listing handlers side by side, without the API's 500 row page cap."""
+    bench_app = FastAPI()
+
+    @bench_app.get("/legacy")
+    async def legacy(category: str, product_service: AsyncProductService = Depends(get_product_service)):
+        products, _ = await product_service.list_products(ProductFilters(category=category), limit=rows)
+        return legacy_body(products)
+
+    @bench_app.get("/fast")
+    async def fast(category: str, product_service: AsyncProductService = Depends(get_product_service)):
+        page, _ = await product_service.list_product_rows(ProductFilters(category=category), limit=rows)
+        return Response(content=dumps([product_row_to_dict(row) for row in page]), media_type="application/json")
+
+    return bench_app
+
+
+async def run_http(category: str, rows: int, repeat: int) -> Dict[str, dict]:
+    transport = httpx.ASGITransport(app=build_app(rows))
+    results, bodies = {}, {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in ("legacy", "fast"):
+            await client.get(f"/{name}", params={"category": category})  # warm up
+            latencies = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = await client.get(f"/{name}", params={"category": category})
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+            bodies[name] = response.json()
+            results[name] = {
+                "median_ms": round(statistics.median(latencies) * 1000, 3),
+                "bytes": len(response.content),
+            }
+    if bodies["legacy"] != bodies["fast"]:
+        raise AssertionError("legacy and fast paths returned different documents")
+    return results
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    engine.echo = False
+    async_engine.echo = False
+    init_db()
+    run_id = uuid.uuid4().hex[:8]
+    category = seed_products(run_id, args.rows)
+    try:
+        stages = run_stages(ProductFilters(category=category), args.rows, args.repeat)
+        http = asyncio.run(run_http(category, args.rows, args.repeat))
+    finally:
+        cleanup_products(category)
+    return {
+        "run_id": run_id,
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "stages": stages,
+        "http": http,
+        "speedup": {
+            "stages": round(stages["legacy"]["total_ms"] / stages["fast"]["total_ms"], 2),
+            "http": round(http["legacy"]["median_ms"] / http["fast"]["median_ms"], 2),
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Product listing serialization (run {report['run_id']}, {report['rows']} rows, "
+          f"median of {report['repeat']})")
+    for name, stage in report["stages"].items():
+        print(f"  {name:<6} fetch {stage['fetch_ms']:>9} ms  build {stage['build_ms']:>9} ms  "
+              f"encode {stage['encode_ms']:>9} ms  total {stage['total_ms']:>9} ms")
+    for name, http in report["http"].items():
+        print(f"  {name:<6} GET   {http['median_ms']:>9} ms  ({http['bytes']} bytes)")
+    print(f"  speedup: {report['speedup']['stages']}x in process, {report['speedup']['http']}x end to end")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validated vs zero-validation product serialization")
+    parser.add_argument("--rows", type=int, default=10000, help="Number of products to seed and serialize")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per path")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Shared fixtures. Every test runs against a fresh SQLite database (WAL mode, the
+same engine setup as production) with empty caches and rate limiters.
+"""
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway database first
+_db_dir = tempfile.mkdtemp(prefix="agentbay-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+import pytest
+
+from app.database import Base, DatabaseManager, engine
+from app.models.db_models import ProductDB
+from app.services.bid_service import user_bid_summary_cache
+from app.services.facets import facet_index
+from app.services.idempotency_service import idempotency_cache
+from app.services.product_cache import product_cache
+from app.services.rate_limiter import bid_product_limiter, bid_user_limiter
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    for cache in (product_cache, user_bid_summary_cache, idempotency_cache):
+        cache.clear()
+    facet_index.reset()
+    bid_user_limiter.reset()
+    bid_product_limiter.reset()
+    yield
+
+
+@pytest.fixture
+def session():
+    session = DatabaseManager.create_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_product(session):
+    """Insert a product; keyword arguments override the defaults"""
+    def make(**overrides):
+        values = {
+            "title": "Test product",
+            "description": "A product created by a test",
+            "condition": "good",
+            "category": "Electronics",
+            "suggested_price": 10.0,
+            "tags": [],
+        }
+        values.update(overrides)
+        product = ProductDB(**values)
+        session.add(product)
+        session.commit()
+        return product
+    return make
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.api.api import app
+
+    with TestClient(app) as client:
+        yield client
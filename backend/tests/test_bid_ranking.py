@@ -0,0 +1,86 @@
+"""Every bid write re-ranks the product's bids and its current_bid/highest_bid_id in the same transaction."""
+from app.enums.enums import BidStatus
+from app.models.agent_models import Bid
+from app.models.db_models import BidDB, ProductDB
+from app.services.bid_service import BidService
+
+
+def place_bid(product_id: int, user_id: str, amount: float) -> BidDB:
+    bid = Bid(
+        user_id=user_id,
+        product_id=str(product_id),
+        amount=amount,
+        timestamp=None,
+        status=BidStatus.ACTIVE,
+    )
+    return BidService().create_bid(bid, product_id)
+
+
+def standing(session, product_id):
+    session.expire_all()
+    product = session.get(ProductDB, product_id)
+    statuses = dict(session.query(BidDB.id, BidDB.status).filter(BidDB.product_id == product_id).all())
+    return product.current_bid, product.highest_bid_id, statuses
+
+
+def test_new_highest_bid_outbids_the_rest(session, make_product):
+    product = make_product()
+    low = place_bid(product.id, "alice", 10.0)
+    high = place_bid(product.id, "bob", 20.0)
+    lower = place_bid(product.id, "carol", 15.0)
+
+    assert (high.status, lower.status) == ("winning", "outbid")
+    assert standing(session, product.id) == (20.0, high.id, {
+        low.id: "outbid", high.id: "winning", lower.id: "outbid"
+    })
+
+
+def test_equal_bid_does_not_take_the_lead(session, make_product):
+    product = make_product()
+    first = place_bid(product.id, "alice", 10.0)
+    second = place_bid(product.id, "bob", 10.0)
+
+    assert standing(session, product.id) == (10.0, first.id, {first.id: "winning", second.id: "outbid"})
+
+
+def test_deleting_the_top_bid_promotes_the_next_highest(session, make_product):
+    product = make_product()
+    low = place_bid(product.id, "alice", 10.0)
+    middle = place_bid(product.id, "bob", 15.0)
+    top = place_bid(product.id, "carol", 20.0)
+
+    assert BidService().delete_bid(top.id)
+
+    assert standing(session, product.id) == (15.0, middle.id, {low.id: "outbid", middle.id: "winning"})
+    assert session.get(ProductDB, product.id).bid_count == 2
+
+
+def test_deleting_the_last_bid_clears_the_standing(session, make_product):
+    product = make_product()
+    only = place_bid(product.id, "alice", 10.0)
+
+    assert BidService().delete_bid(only.id)
+
+    assert standing(session, product.id) == (None, None, {})
+
+
+def test_amount_change_reranks(session, make_product):
+    product = make_product()
+    low = place_bid(product.id, "alice", 10.0)
+    top = place_bid(product.id, "bob", 20.0)
+
+    BidService().update_bid_amount(low.id, 25.0)
+    assert standing(session, product.id) == (25.0, low.id, {low.id: "winning", top.id: "outbid"})
+
+    BidService().update_bid_amount(low.id, 5.0)
+    assert standing(session, product.id) == (20.0, top.id, {low.id: "outbid", top.id: "winning"})
+
+
+def test_closing_the_winner_hands_the_lead_on(session, make_product):
+    product = make_product()
+    low = place_bid(product.id, "alice", 10.0)
+    top = place_bid(product.id, "bob", 20.0)
+
+    BidService().update_bid_status(top.id, BidStatus.LOST)
+
+    assert standing(session, product.id) == (10.0, low.id, {low.id: "winning", top.id: "lost"})
@@ -0,0 +1,68 @@
+from app.enums.enums import BidStatus
+from app.models.agent_models import Bid
+from app.services.bid_service import BidService, user_bid_summary_cache
+
+
+def place_bid(product_id: int, user_id: str, amount: float):
+    bid = Bid(
+        user_id=user_id,
+        product_id=str(product_id),
+        amount=amount,
+        timestamp=None,
+        status=BidStatus.ACTIVE,
+    )
+    return BidService().create_bid(bid, product_id)
+
+
+def test_summary_counts_bids(make_product):
+    first, second = make_product(), make_product()
+    place_bid(first.id, "alice", 12.0)
+    place_bid(second.id, "alice", 15.0)
+    place_bid(second.id, "bob", 20.0)
+
+    summary = BidService().get_user_bid_summary("alice")
+    assert summary["total_bids"] == 2
+    assert summary["winning_count"] == 1
+    assert summary["outbid_count"] == 1
+    assert summary["total_exposure"] == 12.0
+    assert len(summary["active_bids"]) == 1
+
+
+def test_summary_callers_get_private_copies(make_product):
+    product = make_product()
+    place_bid(product.id, "alice", 12.0)
+    service = BidService()
+
+    first = service.get_user_bid_summary("alice")
+    first["active_bids"].clear()
+    first["status_counts"]["winning"] = 99
+
+    second = service.get_user_bid_summary("alice")
+    assert user_bid_summary_cache.get("alice") is not None
+    assert len(second["active_bids"]) == 1
+    assert second["status_counts"]["winning"] == 1
+
+
+def test_bid_write_invalidates_summary(make_product):
+    product = make_product()
+    place_bid(product.id, "alice", 12.0)
+    service = BidService()
+    assert service.get_user_bid_summary("alice")["total_bids"] == 1
+
+    place_bid(product.id, "alice", 20.0)
+    assert service.get_user_bid_summary("alice")["total_bids"] == 2
+
+
+def test_summary_loaded_before_invalidation_is_not_cached(make_product, monkeypatch):
+    product = make_product()
+    place_bid(product.id, "alice", 12.0)
+    original_set = user_bid_summary_cache.set
+
+    def set_after_concurrent_write(key, value, ttl=None, generation=None):
+        # A bid by the same user commits while this summary is being built
+        user_bid_summary_cache.invalidate(key)
+        return original_set(key, value, ttl=ttl, generation=generation)
+
+    monkeypatch.setattr(user_bid_summary_cache, "set", set_after_concurrent_write)
+    BidService().get_user_bid_summary("alice")
+    assert user_bid_summary_cache.get("alice") is None
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.db_models import ProductDB
+from app.services.cache import TTLCache
+from app.services.product_cache import product_cache
+from app.services.product_service import ProductService
+
+
+def test_set_and_get():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_expired_entries_miss():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=0)
+    assert cache.get("a") is None
+
+
+def test_set_skipped_when_invalidated_during_load():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+    cache.invalidate("a")
+    assert cache.set("a", "stale", generation=generation) is False
+    assert cache.get("a") is None
+
+    # Invalidations of other keys don't block the store
+    generation = cache.generation()
+    cache.invalidate("b")
+    assert cache.set("a", "fresh", generation=generation) is True
+    assert cache.get("a") == "fresh"
+
+
+def test_set_skipped_when_invalidation_record_was_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    generation = cache.generation()
+    for key in ("a", "b", "c"):
+        cache.invalidate(key)
+    # "a"'s record is gone, so any load that started before it is distrusted
+    assert cache.set("a", "stale", generation=generation) is False
+
+
+def test_clear_discards_loads_in_flight():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+    cache.clear()
+    assert cache.set("a", "stale", generation=generation) is False
+
+
+@pytest.mark.parametrize("read", [
+    lambda service, product_id: service.get_product_by_id(product_id),
+    lambda service, product_id: service.get_products_by_ids([product_id])[product_id],
+    lambda service, product_id: service.get_product_detail(product_id)[0],
+], ids=["by_id", "by_ids", "detail"])
+def test_product_read_racing_a_write_is_not_cached(make_product, read):
+    product = make_product(title="Old title")
+    product_cache.clear()
+    raced = []
+
+    def write_after_load(target, context):
+        if not raced:
+            # Another request updates the product once this read has loaded it
+            raced.append(True)
+            ProductService().update_product(product.id, {"title": "New title"})
+
+    event.listen(ProductDB, "load", write_after_load)
+    try:
+        loaded = read(ProductService(), product.id)
+    finally:
+        event.remove(ProductDB, "load", write_after_load)
+
+    assert raced and loaded.title == "Old title"
+    assert product_cache.get(product.id) is None
+    assert ProductService().get_product_by_id(product.id).title == "New title"
@@ -0,0 +1,80 @@
+"""Each read consults a cache once, so hit/miss metrics count lookups rather than code paths."""
+import asyncio
+
+from app.database import AsyncSessionLocal
+from app.observability.metrics import render_metrics
+from app.services.bid_service import AsyncBidService, user_bid_summary_cache
+from app.services.idempotency_service import AsyncIdempotencyService, IdempotencyService, idempotency_cache
+from app.services.product_cache import product_cache
+from app.services.product_service import AsyncProductService
+
+
+def lookups(cache):
+    return cache.hits, cache.misses
+
+
+def run(service_class, method, *args):
+    async def call():
+        async with AsyncSessionLocal() as session:
+            service = service_class(session)
+            first = await getattr(service, method)(*args)
+            second = await getattr(service, method)(*args)
+            return first, second
+    return asyncio.run(call())
+
+
+def test_product_miss_then_hit(make_product):
+    product = make_product()
+    hits, misses = lookups(product_cache)
+
+    first, second = run(AsyncProductService, "get_product_by_id", product.id)
+
+    assert first.id == second.id == product.id
+    assert lookups(product_cache) == (hits + 1, misses + 1)
+
+
+def test_product_version_miss_then_hit(make_product):
+    product = make_product()
+    hits, misses = lookups(product_cache)
+
+    run(AsyncProductService, "get_product_version", product.id)
+
+    # The version query doesn't cache the row, so both calls miss once each
+    assert lookups(product_cache) == (hits, misses + 2)
+
+
+def test_products_by_ids_look_each_id_up_once(make_product):
+    ids = [make_product().id for _ in range(3)]
+    hits, misses = lookups(product_cache)
+
+    first, second = run(AsyncProductService, "get_products_by_ids", ids)
+
+    assert sorted(first) == sorted(second) == ids
+    assert lookups(product_cache) == (hits + 3, misses + 3)
+
+
+def test_bid_summary_miss_then_hit():
+    hits, misses = lookups(user_bid_summary_cache)
+
+    first, second = run(AsyncBidService, "get_user_bid_summary", "alice")
+
+    assert first == second
+    assert lookups(user_bid_summary_cache) == (hits + 1, misses + 1)
+
+
+def test_idempotency_response_miss_then_hit():
+    service = IdempotencyService()
+    service.reserve("alice", "key-1", "hash")
+    service.complete("alice", "key-1", "hash", 200, {"ok": True})
+    idempotency_cache.clear()
+    hits, misses = lookups(idempotency_cache)
+
+    first, second = run(AsyncIdempotencyService, "get_response", "alice", "key-1")
+
+    assert first == second
+    assert lookups(idempotency_cache) == (hits + 1, misses + 1)
+
+
+def test_idempotency_cache_is_exported():
+    payload, _ = render_metrics()
+    assert b'agentbay_cache_hits_total{cache="idempotency"}' in payload
@@ -0,0 +1,100 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api.api import app
+from app.models.agent_models import Product
+from app.services.facets import FacetIndex, facet_index, refresh_facet_index
+from app.services.product_service import ProductService
+
+
+def add_product(category, brand, condition="good"):
+    return ProductService().create_product(Product(
+        title="Test product", description="d", condition=condition, category=category, brand=brand
+    ))
+
+
+def test_counts_each_facet_under_the_other_filters():
+    index = FacetIndex()
+    index.swap({
+        ("Electronics", "Canon", "good"): 3,
+        ("Electronics", "Nikon", "fair"): 2,
+        ("Home", None, "good"): 4,
+        ("Home", "Canon", "fair"): 1,
+    })
+
+    assert index.counts() == {
+        "total": 10,
+        "facets": {
+            "category": {"Electronics": 5, "Home": 5},
+            "brand": {"Canon": 4, "Nikon": 2},
+            "condition": {"good": 7, "fair": 3},
+        },
+    }
+    # A selected category still shows its siblings; brand and condition narrow to it
+    assert index.counts({"category": "Electronics", "brand": None}) == {
+        "total": 5,
+        "facets": {
+            "category": {"Electronics": 5, "Home": 5},
+            "brand": {"Canon": 3, "Nikon": 2},
+            "condition": {"good": 3, "fair": 2},
+        },
+    }
+    assert index.counts({"category": "Home", "condition": "fair"}) == {
+        "total": 1,
+        "facets": {
+            "category": {"Electronics": 2, "Home": 1},
+            "brand": {"Canon": 1},
+            "condition": {"good": 4, "fair": 1},
+        },
+    }
+
+
+def test_writes_keep_the_index_current():
+    camera = add_product("Electronics", "Canon")
+    lamp = add_product("Home", None)
+    service = ProductService()
+
+    service.update_product(camera.id, {"brand": "Nikon", "condition": "fair"})
+    service.delete_product(lamp.id)
+    add_product("Electronics", "Nikon")
+
+    assert facet_index.counts() == {
+        "total": 2,
+        "facets": {
+            "category": {"Electronics": 2},
+            "brand": {"Nikon": 2},
+            "condition": {"fair": 1, "good": 1},
+        },
+    }
+
+
+def test_refresh_rebuilds_from_the_database(make_product):
+    make_product(category="Home", brand="Ikea")
+    make_product(category="Home", brand="Ikea")
+    make_product(category="Sports", brand=None, condition="new")
+    assert facet_index.counts()["total"] == 0  # Inserted behind the service's back
+
+    asyncio.run(refresh_facet_index())
+
+    assert facet_index.counts() == {
+        "total": 3,
+        "facets": {
+            "category": {"Home": 2, "Sports": 1},
+            "brand": {"Ikea": 2},
+            "condition": {"good": 2, "new": 1},
+        },
+    }
+
+
+def test_facets_endpoint(make_product):
+    make_product(category="Home", brand="Ikea")
+    make_product(category="Electronics", brand="Canon")
+    # Started after the inserts, so the startup refresh can't race them
+    with TestClient(app) as client:
+        response = client.get("/api/products/facets", params={"category": "Home"})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    assert response.json()["facets"]["category"] == {"Electronics": 1, "Home": 1}
+    assert response.json()["facets"]["brand"] == {"Ikea": 1}
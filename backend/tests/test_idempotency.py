@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+from app.api import api
+from app.models.db_models import BidDB, IdempotencyKeyDB
+from app.observability import sql_profiler
+from app.services import idempotency_service
+from app.services.idempotency_service import IdempotencyService
+from app.services.rate_limiter import bid_user_limiter
+
+
+def post_bid(client, product_id, user_id="alice", amount=20.0, key="key-1"):
+    return client.post(
+        f"/api/products/{product_id}/bids",
+        json={"user_id": user_id, "amount": amount},
+        headers={"Idempotency-Key": key},
+    )
+
+
+def test_retry_replays_stored_response(client, make_product, session):
+    product = make_product()
+    first = post_bid(client, product.id)
+    retry = post_bid(client, product.id)
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["bid_id"] == first.json()["bid_id"]
+    assert session.query(BidDB).count() == 1
+
+
+def test_key_reused_for_different_request_is_rejected(client, make_product):
+    product = make_product()
+    assert post_bid(client, product.id, amount=20.0).status_code == 200
+    assert post_bid(client, product.id, amount=25.0).status_code == 422
+
+
+def test_key_in_flight_conflicts(client, make_product):
+    product = make_product()
+    IdempotencyService().reserve("alice", "key-1", "another-request")
+    assert post_bid(client, product.id).status_code == 409
+
+
+def test_keys_are_scoped_per_user(client, make_product, session):
+    product = make_product()
+    alice = post_bid(client, product.id, user_id="alice", amount=20.0)
+    bob = post_bid(client, product.id, user_id="bob", amount=30.0)
+
+    assert bob.status_code == 200
+    assert "Idempotent-Replayed" not in bob.headers
+    assert bob.json()["bid_id"] != alice.json()["bid_id"]
+    assert session.query(BidDB).count() == 2
+
+
+def test_rate_limited_keys_never_reach_the_database(client, make_product, monkeypatch):
+    product = make_product()
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILER", True)
+    monkeypatch.setattr(bid_user_limiter, "rate", 0.001)
+    monkeypatch.setattr(bid_user_limiter, "burst", 1.0)
+    assert post_bid(client, product.id, key="key-1").status_code == 200
+
+    flood = post_bid(client, product.id, key="key-2")
+    assert flood.status_code == 429
+    assert flood.headers["X-Query-Count"] == "0"
+
+    # Retries of completed requests are still replayed from memory
+    replay = post_bid(client, product.id, key="key-1")
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+
+def test_reservation_lease_is_short_until_completed(session):
+    service = IdempotencyService()
+    service.reserve("alice", "key-1", "hash")
+    lease = session.query(IdempotencyKeyDB).one().expires_at.replace(tzinfo=timezone.utc)
+    assert lease <= datetime.now(timezone.utc) + timedelta(seconds=idempotency_service.IDEMPOTENCY_LEASE_SECONDS)
+
+    assert service.complete("alice", "key-1", "hash", 200, {"ok": True})
+    session.expire_all()
+    replay_until = session.query(IdempotencyKeyDB).one().expires_at.replace(tzinfo=timezone.utc)
+    assert replay_until > datetime.now(timezone.utc) + timedelta(seconds=idempotency_service.IDEMPOTENCY_LEASE_SECONDS)
+
+
+def test_stuck_reservation_frees_key_after_lease(client, make_product, monkeypatch):
+    product = make_product()
+    # A request that crashed after reserving: its lease has already run out
+    monkeypatch.setattr(idempotency_service, "IDEMPOTENCY_LEASE_SECONDS", -1)
+    IdempotencyService().reserve("alice", "key-1", "crashed-request")
+    monkeypatch.undo()
+
+    response = post_bid(client, product.id)
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_response_commits_with_the_bid(client, make_product, session, monkeypatch):
+    product = make_product()
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("worker died after the bid committed")
+
+    # Nothing after the bid's commit runs, as if the process died there
+    monkeypatch.setattr(api, "cache_response", crash)
+    assert post_bid(client, product.id).status_code == 500
+    monkeypatch.undo()
+
+    retry = post_bid(client, product.id)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["bid_id"] == session.query(BidDB).one().id
+
+
+def test_bid_is_not_placed_without_its_response(client, make_product, session, monkeypatch):
+    product = make_product()
+
+    def lose_reservation(self, user_id, key, status_code, body):
+        raise idempotency_service.ReservationLostError("taken over")
+
+    monkeypatch.setattr(IdempotencyService, "store_response", lose_reservation)
+    assert post_bid(client, product.id).status_code == 409
+    assert session.query(BidDB).count() == 0
+
+
+def test_failed_complete_releases_reservation(session):
+    service = IdempotencyService()
+    service.reserve("alice", "key-1", "hash")
+
+    # Not JSON serializable, so storing the response fails
+    assert service.complete("alice", "key-1", "hash", 200, {"bad": object()}) is False
+    assert session.query(IdempotencyKeyDB).count() == 0
+    assert service.reserve("alice", "key-1", "hash")
+
+
+def test_reserve_takes_over_only_expired_records(session, monkeypatch):
+    service = IdempotencyService()
+    monkeypatch.setattr(idempotency_service, "IDEMPOTENCY_KEY_TTL", -1)
+    assert service.reserve("alice", "key-1", "old-request")
+    assert service.complete("alice", "key-1", "old-request", 200, {"ok": True})
+    monkeypatch.undo()
+    idempotency_service.idempotency_cache.clear()
+
+    # The expired response is replaced by a fresh reservation, which then holds the key
+    assert service.reserve("alice", "key-1", "new-request")
+    assert not service.reserve("alice", "key-1", "another-request")
+    record = session.query(IdempotencyKeyDB).one()
+    assert (record.request_hash, record.status_code, record.response_body) == ("new-request", None, None)
+
+
+def test_bid_on_missing_product_frees_its_key(client, make_product, session):
+    assert post_bid(client, 999999).status_code == 404
+    assert session.query(IdempotencyKeyDB).count() == 0
+
+    product = make_product()
+    assert post_bid(client, product.id).status_code == 200
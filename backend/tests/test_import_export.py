@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.models.db_models import ProductDB
+from app.services.product_import import IMPORT_COLUMNS
+
+
+def export(client, fmt, **params):
+    response = client.get("/api/products/export", params=dict(params, format=fmt))
+    assert response.status_code == 200
+    return response.content
+
+
+def parse(content, fmt):
+    text = content.decode("utf-8")
+    if fmt == "csv":
+        return list(csv.DictReader(io.StringIO(text, newline="")))
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def import_file(client, content, filename):
+    response = client.post("/api/products/import", files={"file": (filename, content)})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def catalog(make_product):
+    return [
+        make_product(title="Vintage camera", brand="Canon", tags=["camera", "film"], suggested_price=120.0),
+        # Quotes, commas, newlines and non-ASCII text have to survive CSV quoting
+        make_product(title='Desk "lamp", brass', description="Line one\nLine two", tags=[], image_url="http://x/1.jpg"),
+        make_product(title="Café chair", category="Home", condition="fair", suggested_price=None, model="C-1"),
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_then_import_round_trips(client, session, catalog, fmt):
+    exported = export(client, fmt)
+    session.query(ProductDB).delete()
+    session.commit()
+
+    report = import_file(client, exported, f"products.{fmt}")
+    assert report["imported"] == len(catalog)
+    assert report["failed"] == 0
+
+    before = [{c: row[c] for c in IMPORT_COLUMNS} for row in parse(exported, fmt)]
+    after = [{c: row[c] for c in IMPORT_COLUMNS} for row in parse(export(client, fmt), fmt)]
+    assert after == before
+    assert [row["title"] for row in before] == [p.title for p in catalog]
+
+
+def test_invalid_rows_are_reported_and_skipped(client, session):
+    content = "\n".join([
+        json.dumps({"title": "Lamp", "description": "d", "condition": "good", "category": "Home"}),
+        "{not json",
+        json.dumps({"title": "Chair", "condition": "good", "category": "Home"}),
+        json.dumps({"title": "Desk", "description": "d", "condition": "good", "category": "Home", "tags": ["a"]}),
+    ]).encode("utf-8")
+
+    report = import_file(client, content, "products.ndjson")
+
+    assert report["imported"] == 2
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+    assert "description" in report["errors"][1]["error"]
+    assert [p.title for p in session.query(ProductDB).order_by(ProductDB.id)] == ["Lamp", "Desk"]
+
+
+def test_csv_tags_accept_pipes_and_json(client, session):
+    content = (
+        "title,description,condition,category,tags\n"
+        "Lamp,d,good,Home,brass|vintage\n"
+        'Chair,d,good,Home,"[""wood""]"\n'
+    ).encode("utf-8")
+
+    assert import_file(client, content, "products.csv")["imported"] == 2
+    assert [p.tags for p in session.query(ProductDB).order_by(ProductDB.id)] == [["brass", "vintage"], ["wood"]]
+
+
+def test_export_resumes_after_id_and_applies_filters(client, catalog):
+    resumed = parse(export(client, "ndjson", after_id=catalog[0].id), "ndjson")
+    assert [row["id"] for row in resumed] == [p.id for p in catalog[1:]]
+
+    home = parse(export(client, "ndjson", category="Home", fields="id,title"), "ndjson")
+    assert home == [{"id": catalog[2].id, "title": "Café chair"}]
@@ -0,0 +1,42 @@
+"""The detail page's highest bid is the one the product's standing points to, not the best of the page."""
+import pytest
+
+from app.enums.enums import BidStatus
+from app.observability import sql_profiler
+from app.services.bid_service import BidService
+from app.services.product_cache import product_cache
+
+
+def place_bid(client, product_id, user_id, amount):
+    response = client.post(f"/api/products/{product_id}/bids", json={"user_id": user_id, "amount": amount})
+    assert response.status_code == 200
+    return response.json()["bid_id"]
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_highest_bid_outside_the_top_bids(client, make_product, monkeypatch, cached):
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILER", True)
+    product = make_product()
+    winner = place_bid(client, product.id, "alice", 10.0)
+    for user_id, amount in (("bob", 50.0), ("carol", 40.0)):
+        # Higher bids that were later closed still lead the page by amount
+        BidService().update_bid_status(place_bid(client, product.id, user_id, amount), BidStatus.LOST)
+    product_cache.clear()
+    if cached:
+        client.get(f"/api/products/{product.id}")
+
+    response = client.get(f"/api/products/{product.id}/detail", params={"bid_limit": 2})
+
+    body = response.json()
+    assert [bid["amount"] for bid in body["bids"]] == [50.0, 40.0]
+    assert body["highest_bid"]["bid_id"] == winner
+    assert body["highest_bid"]["status"] == "winning"
+    assert body["product"]["current_bid"] == 10.0
+    assert int(response.headers["X-Query-Count"]) <= int(response.headers["X-Query-Budget"])
+
+
+def test_no_bids_has_no_highest_bid(client, make_product):
+    product = make_product()
+    body = client.get(f"/api/products/{product.id}/detail").json()
+    assert body["bids"] == []
+    assert body["highest_bid"] is None
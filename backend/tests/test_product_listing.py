@@ -0,0 +1,87 @@
+import pytest
+
+from app.enums.enums import ProductSort
+from app.services.product_service import decode_cursor, encode_cursor
+
+
+def list_all(client, limit=3, **params):
+    """Follow X-Next-Cursor until the last page; returns the pages' product ids"""
+    pages, cursor = [], None
+    while True:
+        query = dict(params, limit=limit)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/products", params=query)
+        assert response.status_code == 200
+        pages.append([product["id"] for product in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+@pytest.fixture
+def catalog(make_product):
+    # Repeated prices, bid counts and titles so ties have to be broken by id
+    specs = [
+        ("Lamp", 30.0, 2, "Home"),
+        ("Camera", 10.0, 0, "Electronics"),
+        ("Lamp", 30.0, 5, "Home"),
+        ("Bike", None, 5, "Sports"),
+        ("Camera", 20.0, 1, "Electronics"),
+        ("Desk", 10.0, 0, "Home"),
+        ("Amp", 45.5, 3, "Electronics"),
+    ]
+    return [
+        make_product(title=title, suggested_price=price, bid_count=bids, category=category)
+        for title, price, bids, category in specs
+    ]
+
+
+@pytest.mark.parametrize("sort, key, reverse", [
+    (ProductSort.NEWEST, lambda p: p.id, True),
+    (ProductSort.OLDEST, lambda p: p.id, False),
+    (ProductSort.PRICE_ASC, lambda p: (p.suggested_price or 0.0, p.id), False),
+    (ProductSort.PRICE_DESC, lambda p: (p.suggested_price or 0.0, p.id), True),
+    (ProductSort.TITLE, lambda p: (p.title, p.id), False),
+])
+def test_pages_cover_every_product_once_in_order(client, catalog, sort, key, reverse):
+    pages = list_all(client, sort=sort.value)
+    ids = [product_id for page in pages for product_id in page]
+
+    assert all(len(page) == 3 for page in pages[:-1])
+    assert ids == [p.id for p in sorted(catalog, key=key, reverse=reverse)]
+
+
+def test_most_bids_pages_break_ties_by_id(client, catalog):
+    ids = [product_id for page in list_all(client, limit=2, sort="most_bids") for product_id in page]
+    assert ids == [p.id for p in sorted(catalog, key=lambda p: (p.bid_count, p.id), reverse=True)]
+
+
+def test_filters_apply_on_every_page(client, catalog):
+    ids = [product_id for page in list_all(client, limit=1, category="Home") for product_id in page]
+    assert ids == sorted((p.id for p in catalog if p.category == "Home"), reverse=True)
+
+
+def test_last_page_has_no_cursor(client, catalog):
+    response = client.get("/api/products", params={"limit": len(catalog)})
+    assert len(response.json()) == len(catalog)
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_invalid_cursor_is_rejected(client, catalog):
+    response = client.get("/api/products", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected(client, catalog):
+    cursor = encode_cursor(ProductSort.TITLE, "Camera", catalog[1].id)
+    response = client.get("/api/products", params={"sort": "newest", "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(ProductSort.PRICE_ASC, 12.5, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, ProductSort.PRICE_ASC) == (12.5, 42)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, ProductSort.PRICE_DESC)
@@ -0,0 +1,121 @@
+"""
+Every @query_budget route stays within its budget on its most expensive path
+(cold caches, Idempotency-Key set), and the metrics count the same statements.
+"""
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.observability import sql_profiler
+from app.observability.metrics import HTTP_REQUEST_DB_QUERIES, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS
+from app.observability.sql_profiler import REDACTED_PARAMS, assert_query_budget, profile_queries
+from app.services.bid_service import user_bid_summary_cache
+from app.services.product_cache import product_cache
+
+
+@pytest.fixture(autouse=True)
+def profiler_headers(monkeypatch):
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILER", True)
+
+
+@pytest.fixture
+def product(client, make_product):
+    product = make_product()
+    for user_id, amount in (("alice", 20.0), ("bob", 25.0)):
+        response = client.post(f"/api/products/{product.id}/bids", json={"user_id": user_id, "amount": amount})
+        assert response.status_code == 200
+    return product
+
+
+def cold_get(client, path, **params):
+    product_cache.clear()
+    user_bid_summary_cache.clear()
+    response = client.get(path, params=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_create_bid_with_idempotency_key(client, product):
+    product_cache.clear()
+    response = client.post(
+        f"/api/products/{product.id}/bids",
+        json={"user_id": "carol", "amount": 30.0, "is_auto_bid": True, "max_auto_bid": 50.0},
+        headers={"Idempotency-Key": "key-1"},
+    )
+    assert response.status_code == 200
+    assert response.json()["bid"]["status"] == "winning"
+    assert assert_query_budget(response) == int(response.headers["X-Query-Budget"])
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/products", {}),
+    ("/api/products", {"category": "Electronics", "sort": "price_asc", "fields": "id,title"}),
+    ("/api/products/batch", {"ids": "1,2,3"}),
+    ("/api/products/facets", {}),
+    ("/api/products/{id}", {}),
+    ("/api/products/{id}/detail", {}),
+    ("/api/products/{id}/bids", {}),
+    ("/api/products/{id}/highest-bid", {}),
+    ("/api/users/alice/bids", {}),
+    ("/api/users/alice/bids", {"active_only": "true"}),
+    ("/api/users/alice/bid-summary", {}),
+])
+def test_reads_stay_within_budget(client, product, path, params):
+    assert_query_budget(cold_get(client, path.format(id=product.id), **params))
+
+
+def test_budget_overrun_fails():
+    response = type("Response", (), {"headers": {"X-Query-Count": "3", "X-Query-Budget": "2"}})()
+    with pytest.raises(AssertionError, match="3 queries exceed the budget of 2"):
+        assert_query_budget(response)
+
+
+def test_metrics_count_the_statements_the_profiler_reports(client, product):
+    histogram = HTTP_REQUEST_DB_QUERIES.labels("GET", "/api/products/{product_id}/bids")
+    before = histogram._sum.get()
+
+    response = cold_get(client, f"/api/products/{product.id}/bids")
+
+    assert histogram._sum.get() - before == int(response.headers["X-Query-Count"]) == 2
+
+
+def test_statements_are_counted_with_the_profiler_headers_off(client, product, monkeypatch):
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILER", False)
+    histogram = HTTP_REQUEST_DB_QUERIES.labels("GET", "/api/products/{product_id}/bids")
+    before = histogram._sum.get()
+
+    response = cold_get(client, f"/api/products/{product.id}/bids")
+
+    assert "X-Query-Count" not in response.headers
+    assert histogram._sum.get() - before == 2
+
+
+
+def test_requests_are_labelled_by_the_route_that_handled_them(client, product):
+    handled = HTTP_REQUESTS.labels("GET", "/api/products/{product_id}", "200")
+    not_allowed = HTTP_REQUESTS.labels("PUT", "/api/products/{product_id}/bids", "405")
+    unmatched = HTTP_REQUESTS.labels("GET", "unmatched", "404")
+    before = [counter._value.get() for counter in (handled, not_allowed, unmatched)]
+
+    assert client.get(f"/api/products/{product.id}").status_code == 200
+    assert client.put(f"/api/products/{product.id}/bids").status_code == 405
+    assert client.get("/no/such/route").status_code == 404
+
+    after = [counter._value.get() for counter in (handled, not_allowed, unmatched)]
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1]
+    assert HTTP_REQUESTS_IN_PROGRESS.labels("GET")._value.get() == 0
+
+
+@pytest.mark.parametrize("log_params", [False, True])
+def test_slow_query_params_are_only_logged_when_asked_for(session, caplog, monkeypatch, log_params):
+    monkeypatch.setattr(sql_profiler, "SQL_SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(sql_profiler, "SQL_LOG_PARAMS", log_params)
+
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"), profile_queries() as profile:
+        session.execute(text("SELECT :email"), {"email": "alice@example.com"})
+
+    assert profile.slow
+    logged = caplog.text
+    assert ("alice@example.com" in logged) is log_params
+    assert (REDACTED_PARAMS in logged) is not log_params
@@ -0,0 +1,84 @@
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter, admit_bid, bid_product_limiter, bid_user_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def test_burst_then_reject_with_retry_after(clock):
+    limiter = RateLimiter("test", rate=1, burst=3)
+    assert [limiter.try_acquire("u")[0] for _ in range(3)] == [True, True, True]
+    assert limiter.try_acquire("u") == (False, 1)
+
+
+def test_tokens_refill_at_rate(clock):
+    limiter = RateLimiter("test", rate=2, burst=2)
+    limiter.try_acquire("u")
+    limiter.try_acquire("u")
+    assert limiter.try_acquire("u")[0] is False
+
+    clock.now += 0.5
+    assert limiter.try_acquire("u")[0] is True
+    assert limiter.try_acquire("u")[0] is False
+
+
+def test_keys_have_separate_buckets(clock):
+    limiter = RateLimiter("test", rate=1, burst=1)
+    assert limiter.try_acquire("a")[0] is True
+    assert limiter.try_acquire("b")[0] is True
+    assert limiter.try_acquire("a")[0] is False
+
+
+def test_zero_rate_disables(clock):
+    limiter = RateLimiter("test", rate=0, burst=1)
+    assert all(limiter.try_acquire("u")[0] for _ in range(100))
+
+
+def test_product_rejection_refunds_user_token(clock, monkeypatch):
+    monkeypatch.setattr(bid_user_limiter, "rate", 1.0)
+    monkeypatch.setattr(bid_user_limiter, "burst", 1.0)
+    monkeypatch.setattr(bid_product_limiter, "rate", 1.0)
+    monkeypatch.setattr(bid_product_limiter, "burst", 1.0)
+
+    assert admit_bid("alice", 1) == (True, 0)
+    # Product 1 is exhausted; bob's token is handed back
+    assert admit_bid("bob", 1)[0] is False
+    assert admit_bid("bob", 2) == (True, 0)
+
+
+def test_bid_route_returns_429(client, make_product, monkeypatch):
+    monkeypatch.setattr(bid_user_limiter, "rate", 0.001)
+    monkeypatch.setattr(bid_user_limiter, "burst", 1.0)
+    product = make_product()
+
+    assert client.post(f"/api/products/{product.id}/bids", json={"user_id": "alice", "amount": 20.0}).status_code == 200
+    response = client.post(f"/api/products/{product.id}/bids", json={"user_id": "alice", "amount": 25.0})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_idempotent_replay_skips_rate_limit(client, make_product, monkeypatch):
+    monkeypatch.setattr(bid_user_limiter, "rate", 0.001)
+    monkeypatch.setattr(bid_user_limiter, "burst", 1.0)
+    product = make_product()
+    request = {"json": {"user_id": "alice", "amount": 20.0}, "headers": {"Idempotency-Key": "k"}}
+
+    first = client.post(f"/api/products/{product.id}/bids", **request)
+    retry = client.post(f"/api/products/{product.id}/bids", **request)
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,102 @@
+"""
+Read routing against a primary and a replica that are separate SQLite files.
+Nothing replicates between them, so whichever database answered a read shows in
+the response.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app import database
+from app.database import AsyncRoutingSession, Base, SyncRoutingSession
+from app.models.db_models import ProductDB
+from app.services.product_cache import product_cache
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    path = tmp_path / "replica.db"
+    sync_replica = create_engine(f"sqlite:///{path}")
+    # Unpooled, so no connection outlives the test client's event loop
+    async_replica = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    Base.metadata.create_all(bind=sync_replica)
+
+    monkeypatch.setattr(SyncRoutingSession, "replicas", {"replica": sync_replica})
+    monkeypatch.setattr(AsyncRoutingSession, "replicas", {"replica": async_replica.sync_engine})
+    monkeypatch.setattr(database, "replica_lag", {"replica": 0.0})
+    monkeypatch.setattr(database, "_recent_writers", {})
+    yield sync_replica
+    sync_replica.dispose()
+
+
+@pytest.fixture
+def replicated_product(make_product, replica):
+    """A product that has reached the replica"""
+    product = make_product(title="Camera")
+    with Session(replica) as session:
+        session.add(ProductDB(id=product.id, title=product.title, description=product.description,
+                              condition=product.condition, category=product.category, tags=[]))
+        session.commit()
+    return product
+
+
+def post_bid(client, product_id, user_id):
+    response = client.post(f"/api/products/{product_id}/bids", json={"user_id": user_id, "amount": 20.0})
+    assert response.status_code == 200
+    return response
+
+
+def test_reads_go_to_the_replica(client, make_product, replica):
+    product = make_product()
+
+    assert client.get("/api/products").json() == []
+    assert client.get(f"/api/products/{product.id}").status_code == 404
+
+
+def test_lagging_replica_is_skipped(client, make_product, replica):
+    product = make_product()
+    database.replica_lag["replica"] = database.DB_REPLICA_MAX_LAG_SECONDS + 1
+
+    assert [p["id"] for p in client.get("/api/products").json()] == [product.id]
+
+
+def test_writer_reads_own_writes_from_the_primary(client, replicated_product):
+    post_bid(client, replicated_product.id, "alice")
+
+    # The bid touched alice and the product, so reads of either stay on the primary
+    assert client.get("/api/users/alice/bids").json()["bid_count"] == 1
+    assert [bid["user_id"] for bid in client.get(f"/api/products/{replicated_product.id}/bids").json()["bids"]] == ["alice"]
+    product = client.get(f"/api/products/{replicated_product.id}").json()["product"]
+    assert (product["bid_count"], product["current_bid"]) == (1, 20.0)
+    assert client.get(f"/api/products/{replicated_product.id}/highest-bid").json()["highest_bid"]["user_id"] == "alice"
+
+
+def test_reads_of_untouched_resources_use_the_replica(client, make_product, replica):
+    written, untouched = make_product(), make_product()
+    post_bid(client, written.id, "alice")
+
+    # Neither has reached the replica
+    assert client.get("/api/users/bob/bids").json()["bid_count"] == 0
+    assert client.get(f"/api/products/{untouched.id}").status_code == 404
+
+
+def test_replica_rows_never_fill_shared_caches(client, replicated_product, replica):
+    with Session(replica) as session:
+        session.get(ProductDB, replicated_product.id).title = "Stale camera"
+        session.commit()
+
+    # The product cache only holds rows read from the primary
+    for _ in range(2):
+        assert client.get(f"/api/products/{replicated_product.id}").json()["product"]["title"] == "Camera"
+        body = client.get("/api/products/batch", params={"ids": str(replicated_product.id)}).json()
+        assert [product["title"] for product in body["products"]] == ["Camera"]
+    assert product_cache.get(replicated_product.id).title == "Camera"
+
+
+def test_stickiness_expires(client, replicated_product, monkeypatch):
+    monkeypatch.setattr(database, "DB_REPLICA_STICKY_SECONDS", 0.0)
+    post_bid(client, replicated_product.id, "alice")
+
+    assert client.get("/api/users/alice/bids").json()["bid_count"] == 0
@@ -0,0 +1,77 @@
+import html
+
+from sqlalchemy import literal, select
+
+from app.services.product_service import ProductService, sql_html_escape
+
+
+def search(client, q, **params):
+    response = client.get("/api/products/search", params=dict(params, q=q))
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_title_matches_outrank_description_matches(client, make_product):
+    in_description = make_product(title="Desk lamp", description="Pairs well with a camera bag")
+    in_title = make_product(title="Vintage camera", description="35mm film body")
+    make_product(title="Bike", description="Road bike")
+
+    body = search(client, "camera")
+
+    assert body["match"] == "keyword"
+    assert [r["product"]["id"] for r in body["results"]] == [in_title.id, in_description.id]
+    assert body["results"][0]["highlights"]["title"] == "Vintage <b>camera</b>"
+
+
+def test_every_term_must_match(client, make_product):
+    both = make_product(title="Canon camera", brand="Canon")
+    make_product(title="Nikon camera", brand="Nikon")
+
+    body = search(client, "canon camera")
+    assert [r["product"]["id"] for r in body["results"]] == [both.id]
+
+
+def test_prefix_and_tag_matches(client, make_product):
+    tagged = make_product(title="Film body", tags=["cameras", "analog"])
+
+    body = search(client, "camera")
+    assert [r["product"]["id"] for r in body["results"]] == [tagged.id]
+
+
+def test_typos_fall_back_to_fuzzy_matching(client, make_product):
+    product = make_product(title="Mechanical keyboard")
+    make_product(title="Garden hose")
+
+    body = search(client, "keybaord")
+    assert body["match"] == "fuzzy"
+    assert [r["product"]["id"] for r in body["results"]] == [product.id]
+
+
+def test_no_match_returns_empty(client, make_product):
+    make_product(title="Garden hose")
+    body = search(client, "xylophone")
+    assert body["results"] == []
+    assert body["total_found"] == 0
+
+
+def test_limit_keeps_the_best_ranked(session, make_product):
+    products = [make_product(title=f"Lamp {i}") for i in range(5)]
+
+    results, match = ProductService(session).search_products("lamp", limit=2)
+
+    assert match == "keyword"
+    assert [product.id for product, _, _ in results] == [products[0].id, products[1].id]
+
+
+def test_highlights_escape_product_text(client, make_product):
+    make_product(title="<script>alert('x')</script> camera", description='Says "camera" & <b>more</b>')
+
+    highlights = search(client, "camera")["results"][0]["highlights"]
+
+    assert highlights["title"] == "&lt;script&gt;alert(&#x27;x&#x27;)&lt;/script&gt; <b>camera</b>"
+    assert highlights["description"] == "Says <b>&quot;camera&quot;</b> &amp; &lt;b&gt;more&lt;/b&gt;"
+
+
+def test_sql_escape_matches_html_escape(session):
+    text = """<a href="x" title='y'>Tom & Jerry</a>"""
+    assert session.execute(select(sql_html_escape(literal(text)))).scalar() == html.escape(text)
@@ -0,0 +1,85 @@
+"""Agent spans nest under their request and report the cache outcome of the work beneath them."""
+import io
+
+import google.generativeai as genai
+import pytest
+from PIL import Image
+
+from app.observability.tracing import add_exporter, memory_exporter, remove_exporter, start_span
+from app.services.product_cache import cache_product, get_cached_product, product_cache
+from benchmarks import fake_gemini
+
+
+@pytest.fixture
+def spans():
+    memory_exporter.clear()
+    add_exporter(memory_exporter)
+    yield memory_exporter
+    remove_exporter(memory_exporter)
+    memory_exporter.clear()
+
+
+@pytest.fixture
+def fake_model(monkeypatch, tmp_path):
+    # Uploads are saved relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(genai, "GenerativeModel", fake_gemini.FakeGenerativeModel)
+    monkeypatch.setattr(fake_gemini, "_installed", fake_gemini.FakeGemini())
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_listing_spans_nest_under_the_request(client, spans, fake_model):
+    response = client.post(
+        "/api/agent/create-listing",
+        files={"image": ("camera.png", png_bytes(), "image/png")},
+    )
+    assert response.status_code == 200, response.text
+
+    finished = spans.get_finished_spans()
+    by_id = {span.span_id: span for span in finished}
+    roots = [span for span in finished if span.name == "agent.create_listing"]
+    assert len(roots) == 1
+    root = roots[0]
+    assert root.parent_span_id is None
+
+    gemini_spans = [span for span in finished if span.name == "gemini.generate_content"]
+    assert gemini_spans
+    for span in gemini_spans:
+        parent = by_id[span.parent_span_id]
+        assert parent.name.startswith("listing.")
+        assert span.attributes["gen_ai.usage.input_tokens"] > 0
+        # Every ancestor was exported and the chain ends at the request span
+        while parent.parent_span_id is not None:
+            assert parent.trace_id == root.trace_id
+            parent = by_id[parent.parent_span_id]
+        assert parent is root
+
+    stages = [span for span in finished if span.name.startswith(("listing.", "agent."))]
+    traced_stages = [span for span in stages if "cache.hits" in span.attributes]
+    assert {span.name for span in traced_stages} >= {"agent.create_listing", "listing.create_complete_listing"}
+    for span in traced_stages:
+        assert (span.attributes["cache.hits"], span.attributes["cache.misses"]) == (0, 0)
+
+
+def test_cache_lookups_roll_up_to_enclosing_spans(make_product, spans):
+    product = make_product()
+    product_cache.clear()
+
+    with start_span("outer") as outer:
+        with start_span("inner") as inner:
+            assert get_cached_product(product.id) is None
+            cache_product(product, product_cache.generation())
+            assert get_cached_product(product.id).id == product.id
+
+    for span in (outer, inner):
+        assert (span.attributes["cache.hits"], span.attributes["cache.misses"]) == (1, 1)
+    assert [event["attributes"] for event in inner.events] == [
+        {"cache": "product", "hit": False},
+        {"cache": "product", "hit": True},
+    ]
+    assert outer.events == []